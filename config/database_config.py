@@ -1,62 +1,131 @@
 """
 Database configuration and connection management for migration testing
 """
-import os
-import mysql.connector
-import psycopg2
-from contextlib import contextmanager
-from typing import Dict, Any, Generator
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, asynccontextmanager
+from typing import TYPE_CHECKING, Dict, Any, Generator, AsyncGenerator, Iterable, List
+from config.migration_config import MigrationConfig
+from config.query_metrics import QueryMetrics, InstrumentedConnection, query_metrics
+from config.test_settings import TEST_SETTINGS
+
+# Database drivers are imported on first connection, so suites that never
+# touch a database do not pay for loading them
+if TYPE_CHECKING:
+    import mysql.connector
+    import psycopg2.extensions
+
+class AsyncConnection:
+    """Awaitable facade over a blocking DB-API connection"""
+    
+    def __init__(self, connection, run_blocking):
+        self.connection = connection
+        self._run_blocking = run_blocking
+    
+    def _fetch(self, method: str, query: str, params, cursor_kwargs):
+        cursor = self.connection.cursor(**cursor_kwargs)
+        try:
+            if params is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query, params)
+            return getattr(cursor, method)() if method else cursor.rowcount
+        finally:
+            cursor.close()
+    
+    async def execute(self, query: str, params=None, **cursor_kwargs) -> int:
+        """Execute a statement and return the affected row count"""
+        return await self._run_blocking(self._fetch, None, query, params, cursor_kwargs)
+    
+    async def fetchone(self, query: str, params=None, **cursor_kwargs):
+        """Execute a query and return its first row"""
+        return await self._run_blocking(self._fetch, 'fetchone', query, params, cursor_kwargs)
+    
+    async def fetchall(self, query: str, params=None, **cursor_kwargs) -> List[Any]:
+        """Execute a query and return all rows"""
+        return await self._run_blocking(self._fetch, 'fetchall', query, params, cursor_kwargs)
+    
+    async def run(self, func, *args, **kwargs):
+        """Run arbitrary blocking work against the raw connection in the executor"""
+        return await self._run_blocking(func, self.connection, *args, **kwargs)
 
 class DatabaseConfig:
     """Database configuration and connection manager"""
     
-    def __init__(self):
+    def __init__(self, instrument_queries: bool = True, metrics: QueryMetrics = None,
+                 max_async_workers: int = None):
+        self.instrument_queries = instrument_queries
+        self.query_metrics = metrics or query_metrics
+        self.max_async_workers = max_async_workers or TEST_SETTINGS['DATABASE']['MAX_CONNECTIONS']
+        self._executor = None
+        
+        laravel_db = MigrationConfig.LARAVEL_DB
         self.laravel_config = {
-            'host': os.getenv('LARAVEL_DB_HOST', 'localhost'),
-            'port': int(os.getenv('LARAVEL_DB_PORT', 3306)),
-            'database': os.getenv('LARAVEL_DB_NAME', 'krayin_laravel'),
-            'user': os.getenv('LARAVEL_DB_USER', 'root'),
-            'password': os.getenv('LARAVEL_DB_PASSWORD', 'password'),
-            'charset': 'utf8mb4',
+            'host': laravel_db['host'],
+            'port': laravel_db['port'],
+            'database': laravel_db['name'],
+            'user': laravel_db['user'],
+            'password': laravel_db['password'],
+            'charset': laravel_db['charset'],
             'autocommit': True
         }
         
+        django_db = MigrationConfig.DJANGO_DB
         self.django_config = {
-            'host': os.getenv('DJANGO_DB_HOST', 'localhost'),
-            'port': int(os.getenv('DJANGO_DB_PORT', 5432)),
-            'database': os.getenv('DJANGO_DB_NAME', 'krayin_django'),
-            'user': os.getenv('DJANGO_DB_USER', 'postgres'),
-            'password': os.getenv('DJANGO_DB_PASSWORD', 'password')
+            'host': django_db['host'],
+            'port': django_db['port'],
+            'database': django_db['name'],
+            'user': django_db['user'],
+            'password': django_db['password']
         }
     
     @contextmanager
-    def laravel_connection(self) -> Generator[mysql.connector.MySQLConnection, None, None]:
+    def laravel_connection(self) -> Generator['mysql.connector.MySQLConnection', None, None]:
         """Context manager for Laravel MySQL connection"""
+        import mysql.connector
+        
         connection = None
+        instrumented = None
         try:
             connection = mysql.connector.connect(**self.laravel_config)
-            yield connection
+            instrumented = self._instrument(connection, 'laravel')
+            yield instrumented
         except mysql.connector.Error as e:
             print(f"Laravel database connection error: {e}")
             raise
         finally:
+            if isinstance(instrumented, InstrumentedConnection):
+                instrumented.flush()
             if connection and connection.is_connected():
                 connection.close()
     
     @contextmanager
-    def django_connection(self) -> Generator[psycopg2.extensions.connection, None, None]:
+    def django_connection(self) -> Generator['psycopg2.extensions.connection', None, None]:
         """Context manager for Django PostgreSQL connection"""
+        import psycopg2
+        
         connection = None
+        instrumented = None
         try:
             connection = psycopg2.connect(**self.django_config)
-            yield connection
+            instrumented = self._instrument(connection, 'django')
+            yield instrumented
         except psycopg2.Error as e:
             print(f"Django database connection error: {e}")
             raise
         finally:
+            if isinstance(instrumented, InstrumentedConnection):
+                instrumented.flush()
             if connection:
                 connection.close()
     
+    def _instrument(self, connection, side: str):
+        """Wrap a raw connection so its cursors report query latencies"""
+        if not self.instrument_queries:
+            return connection
+        return InstrumentedConnection(connection, side, self.query_metrics)
+    
     def test_laravel_connection(self) -> bool:
         """Test Laravel database connectivity"""
         try:
@@ -112,23 +181,138 @@ class DatabaseConfig:
         try:
             laravel_info = self.get_laravel_table_info(table_name)
             django_info = self.get_django_table_info(table_name)
-            
-            return {
-                'laravel': laravel_info,
-                'django': django_info,
-                'comparison': {
-                    'column_count_match': len(laravel_info) == len(django_info),
-                    'laravel_columns': len(laravel_info),
-                    'django_columns': len(django_info)
-                }
-            }
+            return self._build_structure_comparison(laravel_info, django_info)
         except Exception as e:
-            return {
-                'error': str(e),
-                'laravel': None,
-                'django': None,
-                'comparison': None
+            return self._structure_comparison_error(e)
+    
+    def _build_structure_comparison(self, laravel_info, django_info) -> Dict[str, Any]:
+        """Build the structure comparison result for both sides"""
+        return {
+            'laravel': laravel_info,
+            'django': django_info,
+            'comparison': {
+                'column_count_match': len(laravel_info) == len(django_info),
+                'laravel_columns': len(laravel_info),
+                'django_columns': len(django_info)
             }
+        }
+    
+    def _structure_comparison_error(self, error: Exception) -> Dict[str, Any]:
+        """Build the structure comparison result for a failed comparison"""
+        return {
+            'error': str(error),
+            'laravel': None,
+            'django': None,
+            'comparison': None
+        }
+    
+    # Async interface - blocking drivers run in a bounded thread pool so the
+    # Laravel and Django sides of a check proceed concurrently
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool used to run blocking driver calls"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_async_workers,
+                thread_name_prefix='db-async'
+            )
+        return self._executor
+    
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking callable in the database executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+    
+    @asynccontextmanager
+    async def _async_connection(self, connection_manager) -> AsyncGenerator[AsyncConnection, None]:
+        """Enter a blocking connection context manager from async code"""
+        manager = connection_manager()
+        connection = await self.run_blocking(manager.__enter__)
+        try:
+            yield AsyncConnection(connection, self.run_blocking)
+        except BaseException as e:
+            if not await self.run_blocking(manager.__exit__, type(e), e, e.__traceback__):
+                raise
+        else:
+            await self.run_blocking(manager.__exit__, None, None, None)
+    
+    @asynccontextmanager
+    async def alaravel_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """Async context manager for Laravel MySQL connection"""
+        async with self._async_connection(self.laravel_connection) as connection:
+            yield connection
+    
+    @asynccontextmanager
+    async def adjango_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """Async context manager for Django PostgreSQL connection"""
+        async with self._async_connection(self.django_connection) as connection:
+            yield connection
+    
+    async def get_laravel_table_info_async(self, table_name: str) -> Dict[str, Any]:
+        """Get table information from Laravel database without blocking the event loop"""
+        return await self.run_blocking(self.get_laravel_table_info, table_name)
+    
+    async def get_django_table_info_async(self, table_name: str) -> Dict[str, Any]:
+        """Get table information from Django database without blocking the event loop"""
+        return await self.run_blocking(self.get_django_table_info, table_name)
+    
+    async def compare_table_structures_async(self, table_name: str) -> Dict[str, Any]:
+        """Compare table structures, querying both databases concurrently"""
+        try:
+            laravel_info, django_info = await asyncio.gather(
+                self.get_laravel_table_info_async(table_name),
+                self.get_django_table_info_async(table_name)
+            )
+            return self._build_structure_comparison(laravel_info, django_info)
+        except Exception as e:
+            return self._structure_comparison_error(e)
+    
+    async def gather_paired(self, checks: Dict[str, Any], concurrency: int = None) -> Dict[str, Any]:
+        """Await many named coroutines with bounded concurrency, keyed like the input"""
+        # Each paired check holds one connection per side
+        semaphore = asyncio.Semaphore(concurrency or max(1, self.max_async_workers // 2))
+        
+        async def bounded(check):
+            async with semaphore:
+                return await check
+        
+        names = list(checks)
+        results = await asyncio.gather(*(bounded(checks[name]) for name in names))
+        return dict(zip(names, results))
+    
+    async def compare_tables_async(self, table_names: Iterable[str],
+                                   concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+        """Compare the structures of many tables at once"""
+        return await self.gather_paired(
+            {name: self.compare_table_structures_async(name) for name in table_names},
+            concurrency
+        )
+    
+    def compare_tables(self, table_names: Iterable[str],
+                       concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+        """Synchronous entry point for comparing many tables concurrently"""
+        return asyncio.run(self.compare_tables_async(table_names, concurrency))
+    
+    def close(self):
+        """Release the async executor"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+# Global database instance, created on first use
+_db_config = None
+
+def get_db_config() -> DatabaseConfig:
+    """Return the shared DatabaseConfig, creating it on first use"""
+    global _db_config
+    if _db_config is None:
+        _db_config = DatabaseConfig()
+    return _db_config
 
-# Global database instance
-db_config = DatabaseConfig()
+def __getattr__(name):
+    # Keeps `from config.database_config import db_config` working without
+    # building the instance when the module is imported
+    if name == 'db_config':
+        return get_db_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
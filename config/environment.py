@@ -0,0 +1,124 @@
+"""
+Cached loader for config/environments/*.yml and lazily resolved configuration settings
+"""
+import copy
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ENVIRONMENTS_DIR = Path(__file__).resolve().parent / 'environments'
+
+# ${VAR} or ${VAR:-default}
+_VAR_RE = re.compile(r'\$\{(\w+)(?::-([^}]*))?\}')
+
+_UNSET = object()
+
+
+# Environment name when TEST_ENVIRONMENT is unset, shared with test_settings.ENVIRONMENT
+DEFAULT_ENVIRONMENT = 'local'
+
+
+def current_environment() -> str:
+    """Environment selected with TEST_ENVIRONMENT, DEFAULT_ENVIRONMENT when unset"""
+    return os.getenv('TEST_ENVIRONMENT') or DEFAULT_ENVIRONMENT
+
+
+def _selected_file() -> str:
+    """Environment file read by default; none unless TEST_ENVIRONMENT is set
+
+    Without an explicit selection no yml file is consulted, so plain runs keep
+    using environment variables and the built-in defaults (docker-compose).
+    """
+    return os.getenv('TEST_ENVIRONMENT', '')
+
+
+def expand_vars(value: Any) -> Any:
+    """Substitute ${VAR} and ${VAR:-default} placeholders from the process environment
+
+    Unset variables without a default expand to an empty string, so a missing
+    secret shows up as an empty password rather than the literal placeholder.
+    """
+    if isinstance(value, str):
+        return _VAR_RE.sub(lambda match: os.getenv(match.group(1), match.group(2) or ''), value)
+    if isinstance(value, dict):
+        return {key: expand_vars(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [expand_vars(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=None)
+def _load(name: str) -> Dict[str, Any]:
+    path = ENVIRONMENTS_DIR / f"{name}.yml"
+    if not name or not path.exists():
+        return {}
+    # PyYAML is only needed when an environment file is actually read
+    import yaml
+
+    with open(path, 'r') as f:
+        return expand_vars(yaml.safe_load(f) or {})
+
+
+def load_environment(name: str = None) -> Dict[str, Any]:
+    """Return the expanded settings of an environment file, parsed once per process
+
+    Environments without a yml file (e.g. 'ci') yield an empty mapping.
+    """
+    return copy.deepcopy(_load(name or _selected_file()))
+
+
+def environment_value(path: str, default: Any = None, name: str = None) -> Any:
+    """Look up a dotted path such as 'applications.laravel.url' in the environment file"""
+    value = _load(name or _selected_file())
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return copy.deepcopy(value)
+
+
+def resolve_setting(env_var: str = None, yml_path: str = None, default: Any = None,
+                    cast: Callable[[Any], Any] = None) -> Any:
+    """Resolve a setting from an environment variable, then the environment file, then a default"""
+    value = os.getenv(env_var) if env_var else None
+    if value is None and yml_path:
+        value = environment_value(yml_path)
+    if value is None:
+        value = default
+    return cast(value) if cast is not None and value is not None else value
+
+
+class lazy_setting:
+    """Class attribute computed on first access and cached for the process
+
+    Wraps a zero-argument function so configuration classes only read the
+    environment (and parse yml files) for the settings a run actually uses.
+    """
+
+    def __init__(self, resolver: Callable[[], Any]):
+        self.resolver = resolver
+        self.value = _UNSET
+        self.__doc__ = resolver.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner) -> Any:
+        if self.value is _UNSET:
+            self.value = self.resolver()
+        return self.value
+
+    def reset(self):
+        """Forget the cached value, e.g. after changing environment variables in a test"""
+        self.value = _UNSET
+
+
+def reset_settings(owner: type = None):
+    """Clear cached environment files and, if given, every lazy setting of a class"""
+    _load.cache_clear()
+    if owner is not None:
+        for attribute in vars(owner).values():
+            if isinstance(attribute, lazy_setting):
+                attribute.reset()
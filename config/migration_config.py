@@ -4,30 +4,40 @@ Migration configuration settings for Krayin CRM Laravel to Django migration
 import os
 from typing import Dict, Any
 
+from config.environment import lazy_setting, resolve_setting
+
 class MigrationConfig:
     """Configuration class for migration settings"""
     
     # Database configurations
-    LARAVEL_DB = {
-        'host': os.getenv('LARAVEL_DB_HOST', 'localhost'),
-        'port': int(os.getenv('LARAVEL_DB_PORT', 3306)),
-        'name': os.getenv('LARAVEL_DB_NAME', 'krayin_laravel'),
-        'user': os.getenv('LARAVEL_DB_USER', 'root'),
-        'password': os.getenv('LARAVEL_DB_PASSWORD', 'password'),
-        'charset': 'utf8mb4'
-    }
+    @lazy_setting
+    def LARAVEL_DB():
+        return {
+            'host': resolve_setting('LARAVEL_DB_HOST', 'applications.laravel.database.host', 'localhost'),
+            'port': resolve_setting('LARAVEL_DB_PORT', 'applications.laravel.database.port', 3306, int),
+            'name': resolve_setting('LARAVEL_DB_NAME', 'applications.laravel.database.name', 'krayin_laravel'),
+            'user': resolve_setting('LARAVEL_DB_USER', 'applications.laravel.database.user', 'root'),
+            'password': resolve_setting('LARAVEL_DB_PASSWORD', 'applications.laravel.database.password', 'password'),
+            'charset': 'utf8mb4'
+        }
     
-    DJANGO_DB = {
-        'host': os.getenv('DJANGO_DB_HOST', 'localhost'),
-        'port': int(os.getenv('DJANGO_DB_PORT', 5432)),
-        'name': os.getenv('DJANGO_DB_NAME', 'krayin_django'),
-        'user': os.getenv('DJANGO_DB_USER', 'postgres'),
-        'password': os.getenv('DJANGO_DB_PASSWORD', 'password')
-    }
+    @lazy_setting
+    def DJANGO_DB():
+        return {
+            'host': resolve_setting('DJANGO_DB_HOST', 'applications.django.database.host', 'localhost'),
+            'port': resolve_setting('DJANGO_DB_PORT', 'applications.django.database.port', 5432, int),
+            'name': resolve_setting('DJANGO_DB_NAME', 'applications.django.database.name', 'krayin_django'),
+            'user': resolve_setting('DJANGO_DB_USER', 'applications.django.database.user', 'postgres'),
+            'password': resolve_setting('DJANGO_DB_PASSWORD', 'applications.django.database.password', 'password')
+        }
     
     # Application URLs
-    LARAVEL_APP_URL = os.getenv('LARAVEL_APP_URL', 'http://localhost:8000')
-    DJANGO_APP_URL = os.getenv('DJANGO_APP_URL', 'http://localhost:8001')
+    LARAVEL_APP_URL = lazy_setting(
+        lambda: resolve_setting('LARAVEL_APP_URL', 'applications.laravel.url', 'http://localhost:8000')
+    )
+    DJANGO_APP_URL = lazy_setting(
+        lambda: resolve_setting('DJANGO_APP_URL', 'applications.django.url', 'http://localhost:8001')
+    )
     
     # Migration phases
     MIGRATION_PHASES = [
@@ -79,22 +89,26 @@ class MigrationConfig:
     }
     
     # Test configuration
-    TEST_CONFIG = {
-        'selenium_grid_url': os.getenv('SELENIUM_GRID_URL', 'http://localhost:4444/wd/hub'),
-        'implicit_wait': int(os.getenv('SELENIUM_IMPLICIT_WAIT', 10)),
-        'explicit_wait': int(os.getenv('SELENIUM_EXPLICIT_WAIT', 30)),
-        'screenshot_path': 'reports/screenshots',
-        'test_data_path': 'config/test-data'
-    }
+    @lazy_setting
+    def TEST_CONFIG():
+        return {
+            'selenium_grid_url': resolve_setting('SELENIUM_GRID_URL', 'selenium.grid_url', 'http://localhost:4444/wd/hub'),
+            'implicit_wait': resolve_setting('SELENIUM_IMPLICIT_WAIT', 'selenium.implicit_wait', 10, int),
+            'explicit_wait': resolve_setting('SELENIUM_EXPLICIT_WAIT', 'selenium.explicit_wait', 30, int),
+            'screenshot_path': 'reports/screenshots',
+            'test_data_path': 'config/test-data'
+        }
     
     # Notification settings
-    NOTIFICATIONS = {
-        'slack_webhook': os.getenv('SLACK_WEBHOOK_URL'),
-        'discord_webhook': os.getenv('DISCORD_WEBHOOK_URL'),
-        'email_config': {
-            'smtp_host': os.getenv('SMTP_HOST', 'smtp.gmail.com'),
-            'smtp_port': int(os.getenv('SMTP_PORT', 587)),
-            'username': os.getenv('SMTP_USER'),
-            'password': os.getenv('SMTP_PASSWORD')
+    @lazy_setting
+    def NOTIFICATIONS():
+        return {
+            'slack_webhook': resolve_setting('SLACK_WEBHOOK_URL', 'notifications.slack_webhook') or None,
+            'discord_webhook': resolve_setting('DISCORD_WEBHOOK_URL', 'notifications.discord_webhook') or None,
+            'email_config': {
+                'smtp_host': os.getenv('SMTP_HOST', 'smtp.gmail.com'),
+                'smtp_port': int(os.getenv('SMTP_PORT', 587)),
+                'username': os.getenv('SMTP_USER'),
+                'password': os.getenv('SMTP_PASSWORD')
+            }
         }
-    }
@@ -0,0 +1,327 @@
+"""
+Query latency instrumentation for Laravel and Django database connections
+"""
+import bisect
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+# Histogram bucket upper bounds in seconds; the last bucket collects everything slower
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKET_LABELS = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+
+# Number of raw durations kept per fingerprint for percentile estimates
+RESERVOIR_SIZE = 1024
+
+_COMMENT_RE = re.compile(r'(--[^\n]*|/\*.*?\*/)', re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%\(\w+\)s|%s')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_VALUES_RE = re.compile(r'(values\s*\(\?\))(\s*,\s*\(\?\))+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so queries differing only in literals group together"""
+    if isinstance(statement, (bytes, bytearray)):
+        statement = statement.decode('utf-8', errors='replace')
+    normalized = _COMMENT_RE.sub(' ', statement)
+    normalized = _STRING_RE.sub('?', normalized)
+    normalized = _PLACEHOLDER_RE.sub('?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip().lower()
+    normalized = _IN_LIST_RE.sub('(?+)', normalized)
+    normalized = _VALUES_RE.sub(r'\1, ...', normalized)
+    return normalized
+
+
+class QueryStats:
+    """Aggregated latency statistics for one statement fingerprint on one side"""
+
+    def __init__(self, side: str, statement_fingerprint: str):
+        self.side = side
+        self.fingerprint = statement_fingerprint
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = []
+
+    def add(self, duration: float, rows: int):
+        """Record a single execution"""
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.rows += rows
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+        # Reservoir sampling keeps percentiles representative with bounded memory
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < RESERVOIR_SIZE:
+                self.samples[index] = duration
+
+    def percentile(self, percent: float) -> float:
+        """Estimate a latency percentile from the sample reservoir"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize statistics for reporting"""
+        return {
+            'side': self.side,
+            'fingerprint': self.fingerprint,
+            'count': self.count,
+            'rows': self.rows,
+            'total_time': round(self.total_time, 6),
+            'mean_time': round(self.total_time / self.count, 6) if self.count else 0.0,
+            'p50_time': round(self.percentile(50), 6),
+            'p95_time': round(self.percentile(95), 6),
+            'max_time': round(self.max_time, 6),
+            'histogram': dict(zip(BUCKET_LABELS, self.histogram))
+        }
+
+
+class QueryMetrics:
+    """Thread-safe collector of per-fingerprint query latencies for both databases"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._scopes = []
+
+    def record(self, side: str, statement: str, duration: float, rows: int = 0):
+        """Record one statement execution"""
+        key = (side, fingerprint(statement))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(*key)
+            stats.add(duration, rows)
+            scopes = list(self._scopes)
+
+        for scope in scopes:
+            scope.record(side, statement, duration, rows)
+
+    @contextmanager
+    def scoped(self):
+        """Collect the queries executed inside the block into a separate recorder"""
+        scope = QueryMetrics()
+        with self._lock:
+            self._scopes.append(scope)
+        try:
+            yield scope
+        finally:
+            with self._lock:
+                self._scopes.remove(scope)
+
+    def reset(self):
+        """Discard all collected statistics"""
+        with self._lock:
+            self._stats.clear()
+
+    def has_samples(self) -> bool:
+        """Return True if any query has been recorded"""
+        return bool(self._stats)
+
+    def stats(self, side: str = None) -> List[QueryStats]:
+        """Return per-fingerprint statistics, optionally for one side"""
+        with self._lock:
+            return [
+                stats for stats in self._stats.values()
+                if side is None or stats.side == side
+            ]
+
+    def slow_queries(self, max_time: float, side: str = None) -> List[Dict[str, Any]]:
+        """Return fingerprints whose slowest execution exceeded max_time"""
+        slow = [stats.to_dict() for stats in self.stats(side) if stats.max_time > max_time]
+        return sorted(slow, key=lambda entry: entry['max_time'], reverse=True)
+
+    def summary(self, max_time: float = None) -> Dict[str, Any]:
+        """Summarize collected latencies per side and fingerprint"""
+        sides = {}
+        for stats in self.stats():
+            side = sides.setdefault(stats.side, {
+                'queries': 0,
+                'rows': 0,
+                'total_time': 0.0,
+                'histogram': [0] * (len(LATENCY_BUCKETS) + 1),
+                'fingerprints': []
+            })
+            side['queries'] += stats.count
+            side['rows'] += stats.rows
+            side['total_time'] += stats.total_time
+            side['histogram'] = [a + b for a, b in zip(side['histogram'], stats.histogram)]
+            side['fingerprints'].append(stats.to_dict())
+
+        for side in sides.values():
+            side['total_time'] = round(side['total_time'], 6)
+            side['histogram'] = dict(zip(BUCKET_LABELS, side['histogram']))
+            side['fingerprints'].sort(key=lambda entry: entry['total_time'], reverse=True)
+
+        summary = {'sides': sides}
+        if max_time is not None:
+            summary['max_query_time'] = max_time
+            summary['slow_queries'] = self.slow_queries(max_time)
+        return summary
+
+    def export_report(self, output_path: str = "reports/performance-comparison/query_latency.json",
+                      max_time: float = None):
+        """Write the latency summary to a report file"""
+        report_data = {
+            'generated_at': datetime.now().isoformat(),
+            **self.summary(max_time)
+        }
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_file, 'w') as f:
+            json.dump(report_data, f, indent=2)
+
+        print(f"Query latency report exported to: {output_file}")
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times statements and counts fetched rows"""
+
+    def __init__(self, cursor, side: str, metrics: QueryMetrics):
+        self._cursor = cursor
+        self._side = side
+        self._metrics = metrics
+        self._pending = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    @property
+    def __class__(self):
+        return type(self._cursor)
+
+    def __iter__(self):
+        for row in self._cursor:
+            if self._pending is not None:
+                self._pending['rows'] += 1
+            yield row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start(self, statement: str, started: float):
+        """Begin tracking a statement; fetch time and rows are added until the next one"""
+        # Timed before recording the previous statement, which would otherwise count here
+        duration = time.perf_counter() - started
+        rowcount = getattr(self._cursor, 'rowcount', -1)
+        self.flush()
+        self._pending = {
+            'statement': statement,
+            'duration': duration,
+            'rows': 0,
+            'rowcount': rowcount if isinstance(rowcount, int) and rowcount > 0 else 0
+        }
+
+    def _fetched(self, started: float, rows: int):
+        """Account for time and rows spent fetching the current result set"""
+        if self._pending is not None:
+            self._pending['duration'] += time.perf_counter() - started
+            self._pending['rows'] += rows
+
+    def flush(self):
+        """Record the statement currently being tracked"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            rows = pending['rows'] or pending['rowcount']
+            self._metrics.record(self._side, pending['statement'], pending['duration'], rows)
+
+    def execute(self, statement, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._cursor.execute(statement, *args, **kwargs)
+        self._start(statement, started)
+        return result
+
+    def executemany(self, statement, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._cursor.executemany(statement, *args, **kwargs)
+        self._start(statement, started)
+        return result
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(started, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._fetched(started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(started, len(rows))
+        return rows
+
+    def close(self):
+        self.flush()
+        return self._cursor.close()
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors report to a QueryMetrics collector"""
+
+    def __init__(self, connection, side: str, metrics: QueryMetrics):
+        self._connection = connection
+        self._side = side
+        self._metrics = metrics
+        self._cursors = []
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    @property
+    def __class__(self):
+        # isinstance() checks against the driver's connection class keep working
+        return type(self._connection)
+
+    def __enter__(self):
+        # psycopg2 connections use `with conn:` as a transaction block
+        self._connection.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._connection.__exit__(exc_type, exc_value, traceback)
+
+    def cursor(self, *args, **kwargs):
+        cursor = InstrumentedCursor(
+            self._connection.cursor(*args, **kwargs), self._side, self._metrics
+        )
+        self._cursors.append(cursor)
+        return cursor
+
+    def flush(self):
+        """Record statements still pending on any cursor of this connection"""
+        for cursor in self._cursors:
+            cursor.flush()
+        self._cursors.clear()
+
+
+# Global collector shared by all DatabaseConfig instances
+query_metrics = QueryMetrics()
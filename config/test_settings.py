@@ -4,6 +4,8 @@ Test settings and configuration for the migration QA framework
 import os
 from pathlib import Path
 
+from config.environment import current_environment
+
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -11,12 +13,29 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 TEST_SETTINGS = {
     'SELENIUM': {
         'GRID_URL': os.getenv('SELENIUM_GRID_URL', 'http://localhost:4444/wd/hub'),
-        'IMPLICIT_WAIT': int(os.getenv('SELENIUM_IMPLICIT_WAIT', 10)),
+        'IMPLICIT_WAIT': int(os.getenv('SELENIUM_IMPLICIT_WAIT', 10)),  # only used with ADAPTIVE_WAIT disabled
         'EXPLICIT_WAIT': int(os.getenv('SELENIUM_EXPLICIT_WAIT', 30)),
         'BROWSER': os.getenv('TEST_BROWSER', 'chrome'),
         'HEADLESS': os.getenv('HEADLESS_MODE', 'false').lower() == 'true',
         'WINDOW_SIZE': (1920, 1080),
-        'PAGE_LOAD_TIMEOUT': 30
+        'PAGE_LOAD_TIMEOUT': 30,
+        'DRIVER_POOL': {
+            'ENABLED': os.getenv('DRIVER_POOL_ENABLED', 'true').lower() == 'true',
+            'MAX_USES': int(os.getenv('DRIVER_POOL_MAX_USES', 50))
+        },
+        'SESSION_CACHE': {
+            'ENABLED': os.getenv('SESSION_CACHE_ENABLED', 'true').lower() == 'true',
+            'TTL': int(os.getenv('SESSION_CACHE_TTL', 1800))  # seconds
+        },
+        'ADAPTIVE_WAIT': {
+            'ENABLED': os.getenv('ADAPTIVE_WAIT_ENABLED', 'true').lower() == 'true',
+            'QUIET_PERIOD_MS': int(os.getenv('ADAPTIVE_WAIT_QUIET_MS', 100)),  # no DOM mutations or requests
+            'POLL_INTERVAL_MS': 25,  # in-page, costs no WebDriver round trips
+            'MIN_TIMEOUT': 2,  # seconds
+            'TIMEOUT_FACTOR': 3.0,  # learned route timeout = factor x p95 settle time
+            'HISTORY': 20,  # settle times kept per route
+            'TIMEOUTS_FILE': BASE_DIR / 'reports' / 'test-results' / 'wait_timeouts.json'
+        }
     },
     
     'PERFORMANCE': {
@@ -49,13 +68,24 @@ TEST_SETTINGS = {
         'HEADERS': {
             'Content-Type': 'application/json',
             'Accept': 'application/json'
+        },
+        'DIFF': {
+            # Values that legitimately differ between the two apps, including
+            # pagination URLs that embed each app's own host
+            'IGNORE_PATHS': [
+                '*.created_at', '*.updated_at', '*.id',
+                '$.links.*', '$.meta.links[*].url', '$.meta.path', '$.path', '$.*_page_url',
+                '$.next', '$.prev', '$.previous'
+            ],
+            'NUMERIC_TOLERANCE': 1e-6
         }
     },
     
     'DATABASE': {
         'CONNECTION_TIMEOUT': 10,
         'QUERY_TIMEOUT': 30,
-        'MAX_CONNECTIONS': 10
+        'MAX_CONNECTIONS': 10,
+        'SNAPSHOT_PATH': Path(os.getenv('SNAPSHOT_PATH', BASE_DIR / 'data' / 'snapshots'))
     },
     
     'REPORTING': {
@@ -63,7 +93,17 @@ TEST_SETTINGS = {
         'VIDEO_RECORDING': False,
         'LOG_LEVEL': 'INFO',
         'REPORT_FORMAT': 'html',
-        'REPORT_PATH': BASE_DIR / 'reports' / 'test-results'
+        'REPORT_PATH': BASE_DIR / 'reports' / 'test-results',
+        'TRACKER_URL': os.getenv('TRACKER_URL', '')  # phase profiles are published here when set
+    },
+    
+    'VISUAL_DIFF': {
+        'BLOCK_SIZE': 16,  # pixels per block side
+        'BLOCK_THRESHOLD': 0.1,  # 1 - SSIM above which a block counts as changed
+        'MAX_DIFF_RATIO': float(os.getenv('VISUAL_MAX_DIFF_RATIO', 0.01)),  # changed blocks / compared blocks
+        'MAX_WORKERS': int(os.getenv('VISUAL_DIFF_WORKERS', 2)),
+        'IGNORE_SELECTORS': [],  # dynamic regions such as timestamps, e.g. '.time-ago'
+        'REPORT_PATH': BASE_DIR / 'reports' / 'test-results' / 'visual-diff'
     },
     
     'PARALLEL_EXECUTION': {
@@ -114,7 +154,7 @@ TEST_DATA = {
 }
 
 # Environment-specific overrides
-ENVIRONMENT = os.getenv('TEST_ENVIRONMENT', 'local')
+ENVIRONMENT = current_environment()
 
 if ENVIRONMENT == 'ci':
     TEST_SETTINGS['SELENIUM']['HEADLESS'] = True
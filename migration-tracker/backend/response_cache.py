@@ -0,0 +1,82 @@
+"""
+Versioned JSON response cache and ETag matching for the migration tracker API
+"""
+import gzip
+import json
+from collections import OrderedDict
+
+# Cached bodies at least this large also keep a gzip variant
+GZIP_MIN_SIZE = 1024
+
+# Least recently used bodies are dropped beyond this many routes
+MAX_ENTRIES = 256
+
+
+class ResponseCache:
+    """Serialized JSON bodies keyed by route, valid while their version token is unchanged"""
+
+    def __init__(self, gzip_min_size=GZIP_MIN_SIZE, max_entries=MAX_ENTRIES):
+        self.gzip_min_size = gzip_min_size
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None or entry['version'] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, version, payload, status=200):
+        body = json.dumps(payload).encode()
+        entry = {
+            'version': version,
+            'etag': f'"{version}"',
+            'status': status,
+            'body': body,
+            # Compressed once here instead of on every poll
+            'gzip': gzip.compress(body, compresslevel=6) if len(body) >= self.gzip_min_size else None
+        }
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return entry
+
+
+def etag_matches(header, etag):
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or any(
+        candidate[2:] == etag if candidate.startswith('W/') else candidate == etag
+        for candidate in candidates
+    )
+
+
+def accepts_gzip(header):
+    """Accept-Encoding allows gzip unless it is missing or refused with q=0; '*' covers it"""
+    qualities = {}
+    for part in (header or '').split(','):
+        coding, _, parameters = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(';'):
+            name, _, value = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ('gzip', 'x-gzip', '*'):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
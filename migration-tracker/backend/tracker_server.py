@@ -4,6 +4,7 @@ Migration tracker server - provides real-time tracking interface
 import asyncio
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from aiohttp import web, WSMsgType
@@ -11,6 +12,15 @@ import aiohttp_cors
 import websockets
 from websocket_handler import WebSocketHandler
 from migration_log import MigrationLogger
+from response_cache import ResponseCache, accepts_gzip, etag_matches
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.performance.baseline_store import PerformanceBaselineStore
+
+TEST_PROFILE_HISTORY = PROJECT_ROOT / 'reports' / 'test-results' / 'phase_profile_history.jsonl'
+
 
 class TrackerServer:
     """Migration tracking server with WebSocket support"""
@@ -22,6 +32,13 @@ class TrackerServer:
         self.app = web.Application()
         self.ws_handler = WebSocketHandler()
         self.logger = MigrationLogger()
+        self.config_path = Path('../../config/component_mapping.json')
+        # Bumped by update_component and by edits to the mapping file made outside the server
+        self.state_version = 0
+        # Versions restart with the process; the epoch keeps old ETags from matching new state
+        self._epoch = os.urandom(4).hex()
+        self._config_stamp = None
+        self.response_cache = ResponseCache()
         self.setup_routes()
         self.setup_cors()
         
@@ -34,6 +51,11 @@ class TrackerServer:
         self.app.router.add_post('/api/component/{name}/update', self.update_component)
         self.app.router.add_get('/api/logs', self.get_logs)
         self.app.router.add_get('/api/reports', self.get_reports)
+        self.app.router.add_get('/api/performance/trends', self.get_performance_trends)
+        self.app.router.add_get('/api/performance/trends/{component}', self.get_performance_trends)
+        self.app.router.add_post('/api/test-profile', self.publish_test_profile)
+        self.app.router.add_get('/api/test-profile', self.get_test_profile)
+        self.app.router.add_get('/api/test-profile/{component}', self.get_test_profile)
         
         # Static files
         self.app.router.add_static('/', path='../static', name='static')
@@ -64,86 +86,135 @@ class TrackerServer:
         else:
             return web.Response(text="Dashboard not found", status=404)
     
+    def _sync_state_version(self):
+        """Return the current version token, bumping it when the mapping file changed on disk"""
+        try:
+            stat = self.config_path.stat()
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp != self._config_stamp:
+            if self._config_stamp is not None:
+                self.state_version += 1
+            self._config_stamp = stamp
+        return f"{self._epoch}.{self.state_version}"
+    
+    def _load_config(self):
+        with open(self.config_path, 'r') as f:
+            return json.load(f)
+    
+    def _cached_json_response(self, request, key, version, build, cached_statuses=(200, 404)):
+        """Serve a cached body for this version, 304 when the client already has it
+        
+        build() returns (payload, status); only responses with cached_statuses are cached.
+        """
+        entry = self.response_cache.get(key, version)
+        if entry is None:
+            try:
+                payload, status = build()
+            except Exception as e:
+                return web.json_response({'error': str(e)}, status=500)
+            if status not in cached_statuses:
+                return web.json_response(payload, status=status)
+            entry = self.response_cache.put(key, version, payload, status)
+        
+        compressed = entry['gzip'] is not None and accepts_gzip(request.headers.get('Accept-Encoding'))
+        # Strong ETags differ per representation, so the gzip variant gets its own
+        etag = f'"{entry["version"]}-gzip"' if compressed else entry['etag']
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if entry['status'] == 200 and etag_matches(request.headers.get('If-None-Match'), etag):
+            return web.Response(status=304, headers=headers)
+        
+        if compressed:
+            headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=entry['gzip'] if compressed else entry['body'], status=entry['status'],
+                            headers=headers, content_type='application/json')
+    
+    def _build_migration_status(self):
+        components = self._load_config()
+        
+        # Calculate overall progress
+        total_components = len(components.get('components', {}))
+        completed_count = sum(
+            1 for comp in components.get('components', {}).values()
+            if comp.get('status') == 'completed'
+        )
+        in_progress_count = sum(
+            1 for comp in components.get('components', {}).values()
+            if comp.get('status') == 'in_progress'
+        )
+        
+        overall_progress = (completed_count / total_components * 100) if total_components > 0 else 0
+        
+        status = {
+            'overall_progress': round(overall_progress, 2),
+            'total_components': total_components,
+            'completed_components': completed_count,
+            'in_progress_components': in_progress_count,
+            'pending_components': total_components - completed_count - in_progress_count,
+            # Time this state was computed; unchanged while the version is
+            'last_updated': datetime.now().isoformat()
+        }
+        return status, 200
+    
     async def get_migration_status(self, request):
         """Get overall migration status"""
-        try:
-            # Load component mapping
-            config_path = Path('../../config/component_mapping.json')
-            with open(config_path, 'r') as f:
-                components = json.load(f)
-            
-            # Calculate overall progress
-            total_components = len(components.get('components', {}))
-            completed_count = sum(
-                1 for comp in components.get('components', {}).values()
-                if comp.get('status') == 'completed'
-            )
-            in_progress_count = sum(
-                1 for comp in components.get('components', {}).values()
-                if comp.get('status') == 'in_progress'
-            )
-            
-            overall_progress = (completed_count / total_components * 100) if total_components > 0 else 0
-            
-            status = {
-                'overall_progress': round(overall_progress, 2),
-                'total_components': total_components,
-                'completed_components': completed_count,
-                'in_progress_components': in_progress_count,
-                'pending_components': total_components - completed_count - in_progress_count,
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            return web.json_response(status)
-            
-        except Exception as e:
-            return web.json_response({'error': str(e)}, status=500)
+        version = self._sync_state_version()
+        return self._cached_json_response(request, 'status', version, self._build_migration_status)
+    
+    def _build_components(self):
+        data = self._load_config()
+        
+        components_list = []
+        for name, details in data.get('components', {}).items():
+            components_list.append({
+                'name': name,
+                'status': details.get('status', 'pending'),
+                'priority': details.get('priority', 'medium'),
+                'estimated_effort': details.get('estimated_effort', 'Unknown')
+            })
+        
+        return {'components': components_list}, 200
     
     async def get_components(self, request):
         """Get list of all components"""
-        try:
-            config_path = Path('../../config/component_mapping.json')
-            with open(config_path, 'r') as f:
-                data = json.load(f)
-            
-            components_list = []
-            for name, details in data.get('components', {}).items():
-                components_list.append({
-                    'name': name,
-                    'status': details.get('status', 'pending'),
-                    'priority': details.get('priority', 'medium'),
-                    'estimated_effort': details.get('estimated_effort', 'Unknown')
-                })
-            
-            return web.json_response({'components': components_list})
-            
-        except Exception as e:
-            return web.json_response({'error': str(e)}, status=500)
+        version = self._sync_state_version()
+        return self._cached_json_response(request, 'components', version, self._build_components)
+    
+    def _build_component_detail(self, component_name, tracking_file):
+        data = self._load_config()
+        
+        component = data.get('components', {}).get(component_name)
+        if not component:
+            return {'error': 'Component not found'}, 404
+        
+        # Add tracking data if available
+        if tracking_file.exists():
+            with open(tracking_file, 'r') as f:
+                tracking_data = json.load(f)
+            component['tracking'] = tracking_data
+        
+        return component, 200
     
     async def get_component_detail(self, request):
         """Get detailed information about a specific component"""
         component_name = request.match_info['name']
+        version = self._sync_state_version()
         
+        # Tracking files are written by other tools, so their stamp is part of the version
+        tracking_file = Path(f'../../reports/migration-progress/{component_name}.json')
         try:
-            config_path = Path('../../config/component_mapping.json')
-            with open(config_path, 'r') as f:
-                data = json.load(f)
-            
-            component = data.get('components', {}).get(component_name)
-            if not component:
-                return web.json_response({'error': 'Component not found'}, status=404)
-            
-            # Add tracking data if available
-            tracking_file = Path(f'../../reports/migration-progress/{component_name}.json')
-            if tracking_file.exists():
-                with open(tracking_file, 'r') as f:
-                    tracking_data = json.load(f)
-                component['tracking'] = tracking_data
-            
-            return web.json_response(component)
-            
-        except Exception as e:
-            return web.json_response({'error': str(e)}, status=500)
+            stat = tracking_file.stat()
+            version = f"{version}-{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        except OSError:
+            pass
+        
+        # Unknown names are not cached, so arbitrary requests cannot grow the cache
+        return self._cached_json_response(
+            request, f'component:{component_name}', version,
+            lambda: self._build_component_detail(component_name, tracking_file),
+            cached_statuses=(200,)
+        )
     
     async def update_component(self, request):
         """Update component status"""
@@ -161,15 +232,17 @@ class TrackerServer:
             )
             
             # Update component mapping file
-            config_path = Path('../../config/component_mapping.json')
-            with open(config_path, 'r') as f:
-                config_data = json.load(f)
+            config_data = self._load_config()
             
             if component_name in config_data.get('components', {}):
                 config_data['components'][component_name].update(data)
                 
-                with open(config_path, 'w') as f:
+                with open(self.config_path, 'w') as f:
                     json.dump(config_data, f, indent=2)
+                # Invalidates every cached response; the new file stamp is not a second change
+                self.state_version += 1
+                self._config_stamp = None
+                self._sync_state_version()
                 
                 # Notify WebSocket clients
                 await self.ws_handler.broadcast_update({
@@ -199,7 +272,7 @@ class TrackerServer:
             reports_dir = Path('../../reports')
             reports = []
             
-            for report_type in ['test-results', 'migration-progress', 'performance-comparison', 'security-analysis']:
+            for report_type in ['summary', 'test-results', 'migration-progress', 'performance-comparison', 'security-analysis']:
                 report_path = reports_dir / report_type
                 if report_path.exists():
                     for file in report_path.glob('*.json'):
@@ -215,6 +288,119 @@ class TrackerServer:
         except Exception as e:
             return web.json_response({'error': str(e)}, status=500)
     
+    async def get_performance_trends(self, request):
+        """Get performance trends and regression status, optionally for one component"""
+        component = request.match_info.get('component')
+        try:
+            points = int(request.query.get('points', 30))
+            store = PerformanceBaselineStore(
+                root=PROJECT_ROOT / 'reports' / 'performance-comparison' / 'baselines'
+            )
+            # History files can be large; read them off the event loop
+            trends = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: store.trends(component, points)
+            )
+            
+            environment = request.query.get('environment')
+            if environment:
+                trends = {
+                    name: [series for series in entries if series['environment'] == environment]
+                    for name, entries in trends.items()
+                }
+            
+            return web.json_response({
+                'component': component,
+                'trends': trends,
+                'regressions': sum(
+                    1 for entries in trends.values() for series in entries
+                    if series['status'] == 'regression'
+                ),
+                'last_updated': datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            return web.json_response({'error': str(e)}, status=500)
+    
+    def _load_test_profiles(self, limit):
+        """Most recent published phase profiles, oldest first"""
+        if not TEST_PROFILE_HISTORY.exists():
+            return []
+        with open(TEST_PROFILE_HISTORY, 'r') as f:
+            lines = [line for line in f if line.strip()]
+        return [json.loads(line) for line in lines[-limit:]]
+    
+    async def publish_test_profile(self, request):
+        """Store a phase profile published at the end of a test run"""
+        try:
+            profile = await request.json()
+            TEST_PROFILE_HISTORY.parent.mkdir(parents=True, exist_ok=True)
+            with open(TEST_PROFILE_HISTORY, 'a') as f:
+                f.write(json.dumps(profile) + '\n')
+            
+            # Dashboard clients only need the headline numbers
+            await self.ws_handler.broadcast_update({
+                'type': 'test_profile',
+                'data': {
+                    'generated_at': profile.get('generated_at'),
+                    'tests': profile.get('tests'),
+                    'overall': profile.get('overall'),
+                    'slowest_phases': {
+                        name: component.get('slowest_phase')
+                        for name, component in profile.get('components', {}).items()
+                    }
+                }
+            })
+            
+            return web.json_response({'success': True})
+            
+        except Exception as e:
+            return web.json_response({'error': str(e)}, status=500)
+    
+    async def get_test_profile(self, request):
+        """Get the latest test phase profile and per-run phase totals, optionally for one component"""
+        component = request.match_info.get('component')
+        try:
+            runs = int(request.query.get('runs', 30))
+            profiles = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self._load_test_profiles(runs)
+            )
+            if not profiles:
+                return web.json_response({'error': 'No test profile published yet'}, status=404)
+            
+            def select(profile):
+                if component is None:
+                    return profile.get('overall')
+                return profile.get('components', {}).get(component)
+            
+            latest = profiles[-1]
+            current = select(latest)
+            if current is None:
+                return web.json_response({'error': 'Component not found'}, status=404)
+            
+            response = {
+                'component': component,
+                'generated_at': latest.get('generated_at'),
+                'profile': current,
+                'history': [
+                    {'generated_at': profile.get('generated_at'), **select(profile)}
+                    for profile in profiles if select(profile) is not None
+                ],
+                'last_updated': datetime.now().isoformat()
+            }
+            if component is None:
+                response['components'] = latest.get('components', {})
+                response['slowest_tests'] = latest.get('slowest_tests', [])
+            else:
+                response['slowest_tests'] = [
+                    test for test in latest.get('slowest_tests', [])
+                    if component in test.get('components', [])
+                ]
+            
+            return web.json_response(response)
+            
+        except Exception as e:
+            return web.json_response({'error': str(e)}, status=500)
+    
     async def start_websocket_server(self):
         """Start WebSocket server for real-time updates"""
         await self.ws_handler.start_server(self.host, self.ws_port)
@@ -0,0 +1,615 @@
+"""
+Bulk copy of Laravel MySQL tables into the Django PostgreSQL schema for migration rehearsals
+"""
+import argparse
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, datetime, time as datetime_time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Set
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.database_config import DatabaseConfig
+
+# PostgreSQL data types that take the COPY text form of a boolean or bytea
+BOOLEAN_TYPES = {'boolean'}
+BYTEA_TYPES = {'bytea'}
+
+# Batches read ahead of the PostgreSQL writer; bounds memory per table
+PIPELINE_DEPTH = 2
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t', '\x00': ''})
+
+_END = object()
+
+
+def _copy_text(value: Any) -> str:
+    """Render a value in PostgreSQL COPY text format"""
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value).decode('utf-8', errors='replace')
+    elif isinstance(value, datetime):
+        value = value.isoformat(sep=' ')
+    elif isinstance(value, (date, datetime_time)):
+        value = value.isoformat()
+    elif isinstance(value, timedelta):
+        # MySQL TIME columns arrive as timedelta; HH:MM:SS suits both time and interval
+        sign = '-' if value < timedelta(0) else ''
+        microseconds = abs(value) // timedelta(microseconds=1)
+        seconds, microseconds = divmod(microseconds, 1000000)
+        value = f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}.{microseconds:06d}"
+    elif isinstance(value, Decimal):
+        value = format(value, 'f')
+    elif isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    else:
+        value = str(value)
+    return value.translate(_COPY_ESCAPES)
+
+
+def _copy_boolean(value: Any) -> str:
+    # tinyint(1) flags arrive as 0/1
+    return 't' if int(value) else 'f'
+
+
+def _copy_bytea(value: Any) -> str:
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return '\\\\x' + bytes(value).hex()
+
+
+def column_encoders(django_types: List[str]) -> List[Callable[[Any], str]]:
+    """One COPY text encoder per target column, chosen by its PostgreSQL data type"""
+    encoders = []
+    for data_type in django_types:
+        if data_type in BOOLEAN_TYPES:
+            encoders.append(_copy_boolean)
+        elif data_type in BYTEA_TYPES:
+            encoders.append(_copy_bytea)
+        else:
+            encoders.append(_copy_text)
+    return encoders
+
+
+def encode_rows(rows: List[tuple], encoders: List[Callable[[Any], str]]) -> bytes:
+    """Encode a batch of rows as a COPY FROM STDIN text payload"""
+    lines = []
+    for row in rows:
+        lines.append('\t'.join(
+            '\\N' if value is None else encode(value) for value, encode in zip(row, encoders)
+        ))
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
+
+def _strongly_connected(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan's strongly connected components, parents before the tables referencing them"""
+    index, low, stack, on_stack, components = {}, {}, [], set(), []
+
+    def visit(table):
+        index[table] = low[table] = len(index)
+        stack.append(table)
+        on_stack.add(table)
+        for parent in graph[table]:
+            if parent not in index:
+                visit(parent)
+                low[table] = min(low[table], low[parent])
+            elif parent in on_stack:
+                low[table] = min(low[table], index[parent])
+        if low[table] == index[table]:
+            component = []
+            while True:
+                member = stack.pop()
+                on_stack.discard(member)
+                component.append(member)
+                if member == table:
+                    break
+            components.append(sorted(component))
+
+    for table in sorted(graph):
+        if table not in index:
+            visit(table)
+    return components
+
+
+def _reference_graph(tables: List[str], dependencies: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+    return {table: sorted(dependencies.get(table, set()) & set(tables) - {table}) for table in tables}
+
+
+def reference_cycles(tables: List[str], dependencies: Dict[str, Set[str]]) -> List[List[str]]:
+    """Groups of tables that reference each other, directly or through other tables in the group"""
+    return [component for component in _strongly_connected(_reference_graph(tables, dependencies))
+            if len(component) > 1]
+
+
+def copy_order(tables: List[str], dependencies: Dict[str, Set[str]]) -> List[List[str]]:
+    """Group tables into foreign-key levels; each level only references earlier levels
+
+    Tables in a reference cycle share a level, placed after the parents of
+    every member; tables that merely reference a cycle come after it.
+    """
+    graph = _reference_graph(tables, dependencies)
+    components = _strongly_connected(graph)
+    component_of = {table: number for number, component in enumerate(components) for table in component}
+    remaining = {
+        number: {component_of[parent] for table in component for parent in graph[table]} - {number}
+        for number, component in enumerate(components)
+    }
+    levels = []
+    while remaining:
+        ready = [number for number, parents in remaining.items() if not parents]
+        levels.append(sorted(table for number in ready for table in components[number]))
+        for number in ready:
+            del remaining[number]
+        for parents in remaining.values():
+            parents.difference_update(ready)
+    return levels
+
+
+def _starts_over(state: Dict[str, Any], resume: bool) -> bool:
+    """Whether a table's copy begins from scratch rather than being skipped or resumed"""
+    if not resume:
+        return True
+    if state.get('status') == 'completed':
+        return False
+    return not (state.get('status') == 'in_progress' and state.get('key') is not None)
+
+
+class CopyCheckpointStore:
+    """Persists per-table copy progress so an interrupted rehearsal resumes where it stopped"""
+
+    def __init__(self, path: str = "reports/migration-progress/copy_checkpoints.json"):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, table_name: str) -> Dict[str, Any]:
+        """Return the stored progress for a table"""
+        with self._lock:
+            return dict(self.data.get(table_name, {}))
+
+    def update(self, table_name: str, state: Dict[str, Any]):
+        """Merge progress for a table and persist it"""
+        with self._lock:
+            self.data.setdefault(table_name, {}).update(state)
+            self._save()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(self.data, f, indent=2, default=str)
+        temporary.replace(self.path)
+
+
+class BulkCopyEngine:
+    """Streams Laravel tables into their Django counterparts with COPY FROM STDIN
+
+    Each table is read with one unbuffered (server-side) MySQL cursor ordered
+    by primary key. A reader thread encodes the next batches while the writer
+    COPYs the previous one, and every batch is committed together with a
+    checkpoint of the last key. Independent tables are copied in parallel,
+    parents before the tables referencing them.
+    """
+
+    def __init__(self, database: DatabaseConfig = None, checkpoints: CopyCheckpointStore = None,
+                 batch_rows: int = 20000, workers: int = 4, truncate: bool = False,
+                 disable_triggers: bool = False, config_path: str = "config/component_mapping.json"):
+        # Per-statement instrumentation would time one long streaming SELECT as a single query
+        self.db = database or DatabaseConfig(instrument_queries=False)
+        self.checkpoints = checkpoints or CopyCheckpointStore()
+        self.batch_rows = batch_rows
+        self.workers = workers
+        self.truncate = truncate
+        self.disable_triggers = disable_triggers
+        self.table_mapping, self.field_mappings = self._load_mappings(Path(config_path))
+        self.results = {}
+
+    def _load_mappings(self, config_path: Path):
+        """Load table and column mappings from the component configuration"""
+        try:
+            with open(config_path, 'r') as f:
+                data = json.load(f)
+            return data.get('database_mapping', {}), data.get('field_mappings', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}, {}
+
+    def foreign_key_dependencies(self, table_names: List[str]) -> Dict[str, Set[str]]:
+        """Laravel tables each table references through foreign keys"""
+        with self.db.laravel_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TABLE_NAME, REFERENCED_TABLE_NAME
+                FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL
+            """)
+            rows = cursor.fetchall()
+        dependencies = {table: set() for table in table_names}
+        for table, referenced in rows:
+            if table in dependencies:
+                dependencies[table].add(referenced)
+        return dependencies
+
+    def _primary_key(self, table_name: str) -> Optional[str]:
+        """The single-column primary key of a Laravel table, None if it has none or a composite one"""
+        with self.db.laravel_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+            """, (table_name,))
+            columns = [row[0] for row in cursor.fetchall()]
+        return columns[0] if len(columns) == 1 else None
+
+    def plan_table(self, table_name: str) -> Dict[str, Any]:
+        """Resolve the target table, the copied columns and their PostgreSQL types"""
+        django_table = self.table_mapping.get(table_name, table_name)
+        laravel_columns = [column['Field'] for column in self.db.get_laravel_table_info(table_name)]
+        django_types = {
+            column['column_name']: column['data_type'] for column in self.db.get_django_table_info(django_table)
+        }
+        if not django_types:
+            raise ValueError(f"Django table '{django_table}' does not exist")
+
+        mapping = self.field_mappings.get(table_name) or {column: column for column in laravel_columns}
+        columns = {
+            laravel: django for laravel, django in mapping.items()
+            if laravel in laravel_columns and django in django_types
+        }
+        skipped = sorted(set(mapping) - set(columns))
+        if skipped:
+            print(f"{table_name}: not copying columns without a counterpart: {', '.join(skipped)}")
+
+        key = self._primary_key(table_name)
+        return {
+            'laravel_table': table_name,
+            'django_table': django_table,
+            'columns': columns,
+            'django_types': [django_types[django] for django in columns.values()],
+            'key': key if key in columns else None
+        }
+
+    def _read_batches(self, plan: Dict[str, Any], last_key: Any, batches: queue.Queue,
+                      stop: threading.Event, timings: Dict[str, float]):
+        """Stream rows from MySQL and queue encoded batches; runs in a reader thread"""
+        encoders = column_encoders(plan['django_types'])
+        select = ', '.join(f"`{column}`" for column in plan['columns'])
+        query = f"SELECT {select} FROM `{plan['laravel_table']}`"
+        params = ()
+        if plan['key'] is not None:
+            if last_key is not None:
+                query += f" WHERE `{plan['key']}` > %s"
+                params = (last_key,)
+            query += f" ORDER BY `{plan['key']}`"
+        key_index = list(plan['columns']).index(plan['key']) if plan['key'] is not None else None
+
+        try:
+            with self.db.laravel_connection() as conn:
+                cursor = conn.cursor(buffered=False)
+                # The writer may hold the stream back for a while; keep the server from timing it out
+                cursor.execute("SET SESSION net_write_timeout = 3600")
+                cursor.execute(query, params)
+                while True:
+                    if stop.is_set():
+                        # The connection is dropped with the rest of the result unread
+                        return
+                    started = time.perf_counter()
+                    rows = cursor.fetchmany(self.batch_rows)
+                    if not rows:
+                        break
+                    payload = encode_rows(rows, encoders)
+                    timings['read'] += time.perf_counter() - started
+                    last = rows[-1][key_index] if key_index is not None else None
+                    batches.put((payload, len(rows), last))
+                cursor.close()
+            batches.put(_END)
+        except Exception as e:
+            if not stop.is_set():
+                batches.put(e)
+
+    def copy_table(self, table_name: str, resume: bool = True, clear: bool = True) -> Dict[str, Any]:
+        """Copy one table, resuming after the last checkpointed key when possible
+
+        With clear=False a fresh copy assumes the caller already emptied the
+        target, as copy_tables() does for all tables before copying any.
+        """
+        plan = self.plan_table(table_name)
+        django_table = plan['django_table']
+        state = self.checkpoints.get(table_name)
+        if resume and state.get('status') == 'completed':
+            return {**state, 'skipped': True}
+
+        resuming = resume and state.get('status') == 'in_progress' and plan['key'] is not None
+        last_key = state.get('last_key') if resuming else None
+        rows_copied = state.get('rows_copied', 0) if resuming else 0
+        bytes_copied = state.get('bytes_copied', 0) if resuming else 0
+        target_columns = ', '.join(f'"{column}"' for column in plan['columns'].values())
+        copy_sql = f'COPY "{django_table}" ({target_columns}) FROM STDIN'
+
+        batches = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+        timings = {'read': 0.0, 'write': 0.0}
+        started = time.perf_counter()
+        fresh = {} if resuming else {'resumed': False, 'completed_at': None, 'duration_seconds': None}
+        self.checkpoints.update(table_name, {
+            **fresh,
+            'status': 'in_progress',
+            'django_table': django_table,
+            'key': plan['key'],
+            'last_key': last_key,
+            'rows_copied': rows_copied,
+            'bytes_copied': bytes_copied,
+            'started_at': state.get('started_at') if resuming else datetime.now().isoformat()
+        })
+
+        with self.db.django_connection() as conn:
+            cursor = conn.cursor()
+            if self.disable_triggers:
+                # Skips foreign key checks for reference cycles; needs superuser rights
+                cursor.execute("SET session_replication_role = replica")
+            if resuming:
+                # Rows past the checkpoint belong to a batch whose checkpoint was never written
+                if last_key is None:
+                    cursor.execute(f'DELETE FROM "{django_table}"')
+                else:
+                    cursor.execute(f'DELETE FROM "{django_table}" WHERE "{plan["columns"][plan["key"]]}" > %s',
+                                   (last_key,))
+            elif clear and (self.truncate or state):
+                # A fresh copy over rows from an earlier attempt would collide on keys
+                cursor.execute(f'TRUNCATE "{django_table}" CASCADE' if self.truncate
+                               else f'DELETE FROM "{django_table}"')
+            conn.commit()
+
+            reader = threading.Thread(
+                target=self._read_batches, args=(plan, last_key, batches, stop, timings),
+                name=f"copy-read-{table_name}", daemon=True
+            )
+            reader.start()
+            try:
+                while True:
+                    batch = batches.get()
+                    if batch is _END:
+                        break
+                    if isinstance(batch, Exception):
+                        raise batch
+                    payload, count, batch_last_key = batch
+
+                    write_started = time.perf_counter()
+                    cursor.copy_expert(copy_sql, io.BytesIO(payload), size=1 << 20)
+                    conn.commit()
+                    timings['write'] += time.perf_counter() - write_started
+
+                    rows_copied += count
+                    bytes_copied += len(payload)
+                    if plan['key'] is not None:
+                        last_key = batch_last_key
+                        self.checkpoints.update(table_name, {
+                            'last_key': last_key, 'rows_copied': rows_copied, 'bytes_copied': bytes_copied
+                        })
+            except BaseException:
+                conn.rollback()
+                stop.set()
+                # Unblock a reader waiting on a full queue so it can see the stop flag
+                while reader.is_alive():
+                    try:
+                        batches.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                raise
+            reader.join()
+
+            if plan['key'] is not None:
+                # Serial/identity sequences must continue after the copied ids
+                django_key = plan['columns'][plan['key']]
+                cursor.execute(
+                    f"SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX(\"{django_key}\"), 1), "
+                    f"MAX(\"{django_key}\") IS NOT NULL) FROM \"{django_table}\"",
+                    (django_table, django_key)
+                )
+                conn.commit()
+
+        elapsed = time.perf_counter() - started
+        result = {
+            'status': 'completed',
+            'django_table': django_table,
+            'resumed': resuming,
+            'rows_copied': rows_copied,
+            'bytes_copied': bytes_copied,
+            'duration_seconds': round(elapsed, 3),
+            'read_seconds': round(timings['read'], 3),
+            'write_seconds': round(timings['write'], 3),
+            'rows_per_second': round(rows_copied / elapsed, 1) if elapsed > 0 else None,
+            'mb_per_second': round(bytes_copied / elapsed / 1e6, 2) if elapsed > 0 else None,
+            'completed_at': datetime.now().isoformat()
+        }
+        self.checkpoints.update(table_name, result)
+        return result
+
+    def copy_tables(self, table_names: List[str] = None, resume: bool = True) -> Dict[str, Any]:
+        """Copy tables in parallel, starting each one once the tables it references are done"""
+        table_names = list(table_names or self.table_mapping)
+        dependencies = self.foreign_key_dependencies(table_names)
+        levels = copy_order(table_names, dependencies)
+
+        # Members of a cycle wait for each other's outside parents only and run one at a time
+        cycle_of = {}
+        for cycle in reference_cycles(table_names, dependencies):
+            cycle_of.update(dict.fromkeys(cycle, frozenset(cycle)))
+            if not self.disable_triggers:
+                print(f"Foreign key cycle among {', '.join(cycle)}; copying them one at a time "
+                      f"(use --disable-triggers if inserts fail)")
+
+        # Targets are emptied children first before anything is copied, so no
+        # parent is cleared while rows of a child still reference it
+        restarted = self._tables_to_clear(table_names, dependencies, resume)
+        self.clear_tables([table for level in reversed(levels) for table in level if table in restarted])
+
+        pending = {
+            table: dependencies[table] & set(table_names) - {table} - cycle_of.get(table, frozenset())
+            for table in table_names
+        }
+        done = set()
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bulk-copy') as executor:
+            running = {}
+            while pending or running:
+                for table in sorted(pending):
+                    if not pending[table] <= done:
+                        continue
+                    if table in cycle_of and any(other in cycle_of[table] for other in running.values()):
+                        continue
+                    del pending[table]
+                    running[executor.submit(
+                        self.copy_table, table, resume and table not in restarted, False
+                    )] = table
+
+                if not running:
+                    # Everything left references a table that failed
+                    for table in pending:
+                        self.results[table] = {'status': 'skipped', 'error': 'a referenced table failed to copy'}
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    table = running.pop(future)
+                    try:
+                        self.results[table] = future.result()
+                        done.add(table)
+                        self._print_result(table, self.results[table])
+                    except Exception as e:
+                        self.results[table] = {'status': 'failed', 'error': str(e)}
+                        print(f"{table}: copy failed: {e}")
+
+        return self.summary(time.perf_counter() - started, levels)
+
+    def _tables_to_clear(self, table_names: List[str], dependencies: Dict[str, Set[str]],
+                         resume: bool) -> Set[str]:
+        """Tables whose targets must be emptied before a fresh copy
+
+        Tables referencing a cleared table are cleared and copied again too;
+        their rows would otherwise block the DELETE, or be lost silently with
+        TRUNCATE ... CASCADE while their checkpoint still says completed.
+        """
+        cleared = set()
+        for table in table_names:
+            state = self.checkpoints.get(table)
+            if _starts_over(state, resume) and (self.truncate or state):
+                cleared.add(table)
+
+        frontier = list(cleared)
+        while frontier:
+            parent = frontier.pop()
+            for table in table_names:
+                if table not in cleared and parent in dependencies.get(table, set()):
+                    cleared.add(table)
+                    frontier.append(table)
+        return cleared
+
+    def clear_tables(self, table_names: List[str]):
+        """Empty the Django targets of Laravel tables, given children before parents"""
+        if not table_names:
+            return
+        django_tables = [self.table_mapping.get(table, table) for table in table_names]
+        with self.db.django_connection() as conn:
+            cursor = conn.cursor()
+            if self.disable_triggers:
+                cursor.execute("SET session_replication_role = replica")
+            if self.truncate:
+                # One statement, so tables referencing each other can be truncated together
+                quoted = ', '.join(f'"{django_table}"' for django_table in django_tables)
+                cursor.execute(f"TRUNCATE {quoted} CASCADE")
+            else:
+                for django_table in django_tables:
+                    cursor.execute(f'DELETE FROM "{django_table}"')
+            conn.commit()
+        print(f"Cleared {len(django_tables)} target table(s) for a fresh copy")
+
+    def _print_result(self, table_name: str, result: Dict[str, Any]):
+        if result.get('skipped'):
+            print(f"{table_name}: already copied, skipping")
+            return
+        print(f"{table_name} -> {result['django_table']}: {result['rows_copied']} rows in "
+              f"{result['duration_seconds']:.1f}s ({result['rows_per_second']} rows/s, "
+              f"{result['mb_per_second']} MB/s)")
+
+    def summary(self, elapsed: float, levels: List[List[str]] = None) -> Dict[str, Any]:
+        """Totals across the tables copied by this run"""
+        copied = [result for result in self.results.values()
+                  if result.get('status') == 'completed' and not result.get('skipped')]
+        rows = sum(result['rows_copied'] for result in copied)
+        size = sum(result['bytes_copied'] for result in copied)
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'tables_copied': len(copied),
+            'tables_failed': sorted(name for name, result in self.results.items()
+                                    if result.get('status') in ('failed', 'skipped')),
+            'rows_copied': rows,
+            'bytes_copied': size,
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else None,
+            'mb_per_second': round(size / elapsed / 1e6, 2) if elapsed > 0 else None,
+            'copy_order': levels,
+            'tables': self.results
+        }
+
+    def export_report(self, summary: Dict[str, Any],
+                      output_path: str = "reports/migration-progress/bulk_copy.json"):
+        """Export copy results to a report"""
+        report_data = {
+            'generated_at': datetime.now().isoformat(),
+            'batch_rows': self.batch_rows,
+            'workers': self.workers,
+            **summary
+        }
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_file, 'w') as f:
+            json.dump(report_data, f, indent=2, default=str)
+
+        print(f"Report exported to: {output_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy Laravel tables into the Django database")
+    parser.add_argument('tables', nargs='*', help="Laravel tables; defaults to database_mapping")
+    parser.add_argument('--batch-rows', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=4, help="Tables copied at the same time")
+    parser.add_argument('--restart', action='store_true', help="Ignore checkpoints and copy from scratch")
+    parser.add_argument('--truncate', action='store_true',
+                        help="TRUNCATE ... CASCADE target tables before a fresh copy")
+    parser.add_argument('--disable-triggers', action='store_true',
+                        help="Load with session_replication_role=replica (skips FK checks; needs superuser)")
+    args = parser.parse_args()
+
+    engine = BulkCopyEngine(
+        batch_rows=args.batch_rows, workers=args.workers,
+        truncate=args.truncate, disable_triggers=args.disable_triggers
+    )
+    summary = engine.copy_tables(args.tables or None, resume=not args.restart)
+    print(f"Copied {summary['rows_copied']} rows from {summary['tables_copied']} table(s) in "
+          f"{summary['elapsed_seconds']:.1f}s ({summary['rows_per_second']} rows/s, "
+          f"{summary['mb_per_second']} MB/s)")
+    engine.export_report(summary)
+    if summary['tables_failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
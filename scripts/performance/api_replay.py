@@ -0,0 +1,346 @@
+"""
+Replays recorded API traffic against the Laravel and Django backends and compares responses
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.migration_config import MigrationConfig
+from config.test_settings import TEST_SETTINGS
+from tests import MigrationAssertions
+from tests.page_performance import summarize
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Responses to these carry no body, whatever their Content-Type says
+BODYLESS_STATUSES = (204, 304)
+
+# Compared instead of the body when a response has none
+BODYLESS_COMPARED_HEADERS = ('Content-Type',)
+
+# Headers that belong to the recorded connection or session, not to the request
+DROPPED_HEADERS = {
+    'host', 'content-length', 'connection', 'cookie', 'accept-encoding',
+    'keep-alive', 'transfer-encoding', 'upgrade', 'x-csrf-token', 'x-xsrf-token'
+}
+
+
+def _request_path(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}"
+
+
+def _clean_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {
+        name: value for name, value in headers.items()
+        if name.lower() not in DROPPED_HEADERS and not name.startswith(':')
+    }
+
+
+def read_har(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield requests recorded in a HAR file (browser devtools or proxy export)"""
+    with open(path, 'r') as f:
+        entries = json.load(f)['log']['entries']
+    for index, entry in enumerate(entries):
+        request, response = entry['request'], entry.get('response', {})
+        content = response.get('content', {})
+        yield {
+            'id': f"{index}",
+            'method': request['method'].upper(),
+            'path': _request_path(request['url']),
+            'headers': _clean_headers({header['name']: header['value'] for header in request.get('headers', [])}),
+            'body': request.get('postData', {}).get('text'),
+            'recorded_status': response.get('status'),
+            'recorded_content_type': content.get('mimeType'),
+            'recorded_body': content.get('text')
+        }
+
+
+def read_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield requests from newline-delimited JSON, one request object per line
+
+    Each line needs 'method' and 'path' (or 'url'); 'headers', 'body' and a
+    recorded 'response' with 'status' and 'body' are optional.
+    """
+    with open(path, 'r') as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response', {})
+            body = record.get('body')
+            recorded_body = response.get('body')
+            yield {
+                'id': str(record.get('id', index)),
+                'method': record.get('method', 'GET').upper(),
+                'path': record['path'] if 'path' in record else _request_path(record['url']),
+                'headers': _clean_headers(record.get('headers', {})),
+                'body': json.dumps(body) if isinstance(body, (dict, list)) else body,
+                'recorded_status': response.get('status'),
+                'recorded_content_type': response.get('content_type', 'application/json'),
+                'recorded_body': json.dumps(recorded_body) if isinstance(recorded_body, (dict, list))
+                else recorded_body
+            }
+
+
+def load_corpus(path: Path) -> Iterator[Dict[str, Any]]:
+    """Read a request corpus, choosing the format from the file extension"""
+    path = Path(path)
+    if path.suffix == '.har':
+        return read_har(path)
+    if path.suffix in ('.ndjson', '.jsonl'):
+        return read_ndjson(path)
+    raise ValueError(f"Unsupported corpus format: {path.suffix}")
+
+
+class ReplayResponse:
+    """Response captured during replay, shaped like requests.Response for MigrationAssertions"""
+
+    def __init__(self, status_code: int, headers, body: bytes, latency: float):
+        self.status_code = status_code
+        self.headers = CIMultiDict(headers)
+        self.content = body
+        self.latency = latency
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ApiReplayHarness:
+    """Fires each recorded request at both backends concurrently and compares the responses"""
+
+    def __init__(self, laravel_url: str = None, django_url: str = None, concurrency: int = 20,
+                 pool_size: int = None, timeout: float = None, headers: Dict[str, str] = None,
+                 include_unsafe: bool = False, ignore_paths: List[str] = None,
+                 max_recorded_mismatches: int = 200):
+        config = MigrationConfig()
+        self.base_urls = {
+            'laravel': (laravel_url or config.LARAVEL_APP_URL).rstrip('/'),
+            'django': (django_url or config.DJANGO_APP_URL).rstrip('/')
+        }
+        self.concurrency = concurrency
+        self.pool_size = pool_size or concurrency
+        self.timeout = timeout or TEST_SETTINGS['API']['TIMEOUT']
+        self.headers = headers or {}
+        self.include_unsafe = include_unsafe
+        self.ignore_paths = ignore_paths
+        self.max_recorded_mismatches = max_recorded_mismatches
+        self._reset()
+
+    def _reset(self):
+        self.latencies = {'laravel': [], 'django': []}
+        self.mismatches = []
+        self.stats = {'replayed': 0, 'matched': 0, 'mismatched': 0, 'errors': 0, 'skipped_unsafe': 0}
+
+    def _session(self) -> aiohttp.ClientSession:
+        # One keep-alive pool per backend, sized to the replay concurrency
+        connector = aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size)
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers
+        )
+
+    async def _send(self, session: aiohttp.ClientSession, app: str,
+                    request: Dict[str, Any]) -> ReplayResponse:
+        started = time.perf_counter()
+        async with session.request(
+            request['method'], f"{self.base_urls[app]}{request['path']}",
+            headers=request.get('headers'), data=request.get('body'), allow_redirects=False
+        ) as response:
+            body = await response.read()
+        return ReplayResponse(response.status, response.headers, body, time.perf_counter() - started)
+
+    async def _replay_one(self, sessions: Dict[str, aiohttp.ClientSession], request: Dict[str, Any]):
+        self.stats['replayed'] += 1
+        try:
+            laravel_response, django_response = await asyncio.gather(
+                self._send(sessions['laravel'], 'laravel', request),
+                self._send(sessions['django'], 'django', request)
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.stats['errors'] += 1
+            self._record_mismatch(request, f"Request failed: {e!r}")
+            return
+
+        self.latencies['laravel'].append(laravel_response.latency * 1000)
+        self.latencies['django'].append(django_response.latency * 1000)
+
+        try:
+            self._assert_parity(request, laravel_response, django_response)
+        except AssertionError as e:
+            self.stats['mismatched'] += 1
+            self._record_mismatch(request, str(e), laravel_response, django_response)
+        except ValueError as e:
+            # A body advertised as JSON that does not decode
+            self.stats['mismatched'] += 1
+            self._record_mismatch(request, f"Invalid JSON body: {e}", laravel_response, django_response)
+        else:
+            self.stats['matched'] += 1
+
+    def _assert_parity(self, request: Dict[str, Any], laravel_response: ReplayResponse,
+                       django_response: ReplayResponse):
+        """Compare two responses; ones without a body are compared by status and headers only"""
+        bodyless = (
+            request['method'] == 'HEAD'
+            or laravel_response.status_code in BODYLESS_STATUSES
+            or django_response.status_code in BODYLESS_STATUSES
+            or not (laravel_response.content or django_response.content)
+        )
+        if not bodyless:
+            MigrationAssertions.assert_api_parity(
+                laravel_response, django_response, ignore_paths=self.ignore_paths
+            )
+            return
+
+        assert laravel_response.status_code == django_response.status_code, (
+            f"Status codes don't match: Laravel {laravel_response.status_code} "
+            f"vs Django {django_response.status_code}"
+        )
+        for header in BODYLESS_COMPARED_HEADERS:
+            # Parameters such as charset are spelled differently by the two stacks
+            laravel_value = laravel_response.headers.get(header, '').split(';')[0].strip().lower()
+            django_value = django_response.headers.get(header, '').split(';')[0].strip().lower()
+            assert laravel_value == django_value, (
+                f"{header} doesn't match: Laravel {laravel_value or '<none>'} "
+                f"vs Django {django_value or '<none>'}"
+            )
+
+    def _record_mismatch(self, request: Dict[str, Any], message: str,
+                         laravel_response: ReplayResponse = None, django_response: ReplayResponse = None):
+        if len(self.mismatches) >= self.max_recorded_mismatches:
+            return
+        self.mismatches.append({
+            'id': request['id'],
+            'method': request['method'],
+            'path': request['path'],
+            'laravel_status': laravel_response.status_code if laravel_response else None,
+            'django_status': django_response.status_code if django_response else None,
+            'message': message
+        })
+
+    async def replay_async(self, requests: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replay a corpus with at most `concurrency` requests in flight
+
+        Requests are pulled from the iterable as workers free up, so large
+        corpora are streamed rather than loaded up front.
+        """
+        self._reset()
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async with self._session() as laravel_session, self._session() as django_session:
+            sessions = {'laravel': laravel_session, 'django': django_session}
+
+            async def worker():
+                while True:
+                    request = await queue.get()
+                    try:
+                        if request is None:
+                            return
+                        await self._replay_one(sessions, request)
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            started = time.perf_counter()
+            for request in requests:
+                if request['method'] not in SAFE_METHODS and not self.include_unsafe:
+                    self.stats['skipped_unsafe'] += 1
+                    continue
+                await queue.put(request)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            elapsed = time.perf_counter() - started
+
+        return self.summary(elapsed)
+
+    def replay(self, requests: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Replay a corpus from synchronous code"""
+        return asyncio.run(self.replay_async(requests))
+
+    def summary(self, elapsed: float = None) -> Dict[str, Any]:
+        replayed = self.stats['replayed']
+        return {
+            'base_urls': self.base_urls,
+            'concurrency': self.concurrency,
+            'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'requests_per_second': round(replayed / elapsed, 2) if elapsed else None,
+            **self.stats,
+            'parity_rate': round(self.stats['matched'] / replayed, 4) if replayed else None,
+            'latency_ms': {app: summarize(samples) for app, samples in self.latencies.items()},
+            'mismatches': self.mismatches
+        }
+
+    def export_report(self, summary: Dict[str, Any],
+                      output_path: str = "reports/performance-comparison/api_replay.json"):
+        """Export replay results to a JSON file"""
+        report = {'generated_at': datetime.now().isoformat(), **summary}
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Report exported to: {output_path}")
+
+
+async def _replay_against_stubs(harness: ApiReplayHarness, corpus: Path) -> Dict[str, Any]:
+    """Replay against local stub apps built from the corpus's recorded responses"""
+    from scripts.performance.stub_servers import create_stub_app, routes_from_corpus, running_stub_servers
+
+    routes = routes_from_corpus(load_corpus(corpus))
+    async with running_stub_servers(create_stub_app(routes), create_stub_app(routes)) as urls:
+        harness.base_urls = {'laravel': urls[0], 'django': urls[1]}
+        return await harness.replay_async(load_corpus(corpus))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded API traffic against both backends")
+    parser.add_argument('corpus', type=Path, help="HAR or NDJSON request corpus")
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--pool-size', type=int, default=None, help="Connections per backend")
+    parser.add_argument('--laravel-url', default=None)
+    parser.add_argument('--django-url', default=None)
+    parser.add_argument('--header', action='append', default=[], metavar='NAME:VALUE',
+                        help="Extra header for every request, e.g. an API token")
+    parser.add_argument('--include-unsafe', action='store_true',
+                        help="Also replay POST/PUT/PATCH/DELETE requests")
+    parser.add_argument('--stub', action='store_true',
+                        help="Replay against local stub servers instead of the real apps")
+    parser.add_argument('--output', default="reports/performance-comparison/api_replay.json")
+    args = parser.parse_args()
+
+    harness = ApiReplayHarness(
+        laravel_url=args.laravel_url,
+        django_url=args.django_url,
+        concurrency=args.concurrency,
+        pool_size=args.pool_size,
+        headers={name.strip(): value.strip() for name, value in (header.split(':', 1) for header in args.header)},
+        include_unsafe=args.include_unsafe
+    )
+    if args.stub:
+        summary = asyncio.run(_replay_against_stubs(harness, args.corpus))
+    else:
+        summary = harness.replay(load_corpus(args.corpus))
+    harness.export_report(summary, args.output)
+
+    print(f"Replayed {summary['replayed']} requests: {summary['matched']} matched, "
+          f"{summary['mismatched']} mismatched, {summary['errors']} errors")
+    sys.exit(1 if summary['mismatched'] or summary['errors'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Performance baseline store: per-run latency distributions and regression checks across runs
+"""
+import json
+import os
+import re
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+import numpy as np
+
+from config.test_settings import BASE_DIR, ENVIRONMENT
+
+# Quantiles kept per run: every 5th percentile plus p99, enough to plot and compare runs
+SKETCH_QUANTILES = tuple(range(0, 101, 5))
+
+# Scale factor that makes the median absolute deviation comparable to a standard deviation
+MAD_SCALE = 1.4826
+
+KINDS = ('page_load', 'api_latency', 'load_test', 'db_query')
+
+_PARAM_RE = re.compile(r'\{[^/]+\}|<[^/]+>')
+_TABLE_RE = re.compile(r'\b(?:from|join|into|update)\s+[`"]?(\w+)', re.IGNORECASE)
+
+
+def current_revision() -> str:
+    """Short git revision of the tree being measured; GIT_COMMIT wins on CI"""
+    if os.getenv('GIT_COMMIT'):
+        return os.getenv('GIT_COMMIT')[:12]
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short=12', 'HEAD'],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def new_run_id(revision: str = None) -> str:
+    """Identify one measurement run; xdist workers share the controller's id"""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{revision or current_revision()}-{os.getpid()}"
+
+
+def sketch(samples: Sequence[float]) -> Dict[str, Any]:
+    """Reduce raw samples to a compact distribution"""
+    values = np.asarray(samples, dtype=np.float64)
+    quantiles = np.percentile(values, SKETCH_QUANTILES)
+    return {
+        'count': int(values.size),
+        'mean': round(float(values.mean()), 3),
+        'quantiles': [round(float(value), 3) for value in quantiles],
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3)
+    }
+
+
+class PerformanceBaselineStore:
+    """Appends per-run distributions to JSONL history files and checks them against a rolling baseline
+
+    A run regresses on a statistic when it sits more than z_threshold robust
+    standard deviations (scaled MAD of the baseline runs) above the baseline
+    median, and is at least min_change slower in relative terms.
+    """
+
+    def __init__(self, root: Path = BASE_DIR / 'reports' / 'performance-comparison' / 'baselines',
+                 environment: str = None, revision: str = None, window: int = 10, min_runs: int = 3,
+                 z_threshold: float = 3.0, min_change: float = 0.10, noise_floor: float = 0.02,
+                 statistics: Sequence[str] = ('p50', 'p95'),
+                 config_path: Path = BASE_DIR / 'config' / 'component_mapping.json',
+                 run_id: str = None):
+        self.root = Path(root)
+        self.environment = environment or ENVIRONMENT
+        self.revision = revision or current_revision()
+        self.run_id = run_id or new_run_id(self.revision)
+        self.window = window
+        self.min_runs = min_runs
+        self.z_threshold = z_threshold
+        self.min_change = min_change
+        self.noise_floor = noise_floor
+        self.statistics = tuple(statistics)
+        self.components = self._load_components(Path(config_path))
+        self.records = []
+        self._history = {}
+
+    def _load_components(self, config_path: Path) -> Dict[str, Any]:
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f).get('components', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}
+
+    def component_for(self, kind: str, key: str) -> Optional[str]:
+        """Attribute a route or query fingerprint to a component in component_mapping.json"""
+        if kind == 'db_query':
+            tables = {table.lower() for table in _TABLE_RE.findall(key)}
+            for name, details in self.components.items():
+                for side in ('laravel', 'django'):
+                    if tables & set(details.get(side, {}).get('database_tables', [])):
+                        return name
+            return None
+
+        path = key.split('?', 1)[0].rstrip('/')
+        best, best_length = None, 0
+        for name, details in self.components.items():
+            routes = details.get('laravel', {}).get('routes', []) + details.get('django', {}).get('urls', [])
+            for route in routes:
+                prefix = _PARAM_RE.split(route)[0].rstrip('/')
+                if prefix and (path == prefix or path.startswith(prefix + '/')) and len(prefix) > best_length:
+                    best, best_length = name, len(prefix)
+        return best
+
+    def record(self, kind: str, key: str, side: str, samples: Sequence[float],
+               component: str = None, **context) -> Optional[Dict[str, Any]]:
+        """Add one measured distribution (milliseconds) to the current run"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown measurement kind: {kind}")
+        if len(samples) == 0:
+            return None
+        record = {
+            'run_id': self.run_id,
+            'recorded_at': datetime.now().isoformat(),
+            'revision': self.revision,
+            'environment': self.environment,
+            'kind': kind,
+            'key': key,
+            'side': side,
+            'component': component or self.component_for(kind, key),
+            **context,
+            **sketch(samples)
+        }
+        self.records.append(record)
+        return record
+
+    def record_page_performance(self, route_result: Dict[str, Any], metric: str = 'load'):
+        """Ingest a PagePerformanceCollector.measure_route() result"""
+        for side in ('laravel', 'django'):
+            for cache_mode, measurement in route_result[side].items():
+                self.record(
+                    'page_load', route_result['route'], side,
+                    [sample[metric] for sample in measurement['samples']],
+                    metric=metric, cache_mode=cache_mode
+                )
+
+    def record_query_metrics(self, metrics, **context):
+        """Ingest QueryMetrics reservoirs, one distribution per query fingerprint and side"""
+        for stats in metrics.stats():
+            self.record('db_query', stats.fingerprint, stats.side,
+                        [sample * 1000 for sample in stats.samples], **context)
+
+    def record_api_replay(self, harness):
+        """Ingest the per-side latencies of an ApiReplayHarness run"""
+        for side, samples in harness.latencies.items():
+            self.record('api_latency', 'replay', side, samples)
+
+    def record_load_test(self, runner):
+        """Ingest per-route samples of a LoadTestRunner run"""
+        for side, result in runner.results.items():
+            for route, measurement in result['routes'].items():
+                self.record('load_test', route, side, measurement['samples'], users=runner.users)
+
+    def _history_file(self, kind: str) -> Path:
+        return self.root / f"{kind}.jsonl"
+
+    def history(self, kind: str) -> List[Dict[str, Any]]:
+        """All stored records of one kind, oldest first"""
+        if kind not in self._history:
+            records = []
+            history_file = self._history_file(kind)
+            if history_file.exists():
+                with open(history_file, 'r') as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+            self._history[kind] = records
+        return self._history[kind]
+
+    def _series_key(self, record: Dict[str, Any]) -> tuple:
+        return (record['kind'], record['key'], record['side'], record['environment'],
+                record.get('metric'), record.get('cache_mode'), record.get('test'))
+
+    def baseline(self, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The most recent earlier runs measuring the same thing in the same environment"""
+        series = self._series_key(record)
+        earlier = [
+            stored for stored in self.history(record['kind'])
+            if stored['run_id'] != record['run_id'] and self._series_key(stored) == series
+        ]
+        return earlier[-self.window:]
+
+    def check(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare one record with its rolling baseline"""
+        baseline = self.baseline(record)
+        result = {
+            'kind': record['kind'],
+            'key': record['key'],
+            'side': record['side'],
+            'component': record['component'],
+            'baseline_runs': len(baseline),
+            'statistics': {}
+        }
+        if len(baseline) < self.min_runs:
+            result['status'] = 'insufficient_baseline'
+            return result
+
+        status = 'ok'
+        for statistic in self.statistics:
+            values = np.array([stored[statistic] for stored in baseline], dtype=np.float64)
+            center = float(np.median(values))
+            spread = max(MAD_SCALE * float(np.median(np.abs(values - center))),
+                         self.noise_floor * center, 1e-9)
+            current = record[statistic]
+            z_score = (current - center) / spread
+            change = current / center - 1 if center else 0.0
+
+            if z_score >= self.z_threshold and change >= self.min_change:
+                verdict = 'regression'
+                status = 'regression'
+            elif z_score <= -self.z_threshold and change <= -self.min_change:
+                verdict = 'improvement'
+                if status == 'ok':
+                    status = 'improvement'
+            else:
+                verdict = 'ok'
+
+            result['statistics'][statistic] = {
+                'current': current,
+                'baseline_median': round(center, 3),
+                'z_score': round(z_score, 2),
+                'change': round(change, 4),
+                'verdict': verdict
+            }
+        result['status'] = status
+        return result
+
+    def check_run(self, kind: str = None) -> List[Dict[str, Any]]:
+        """Check every record of the current run"""
+        return [self.check(record) for record in self.records if kind is None or record['kind'] == kind]
+
+    def regressions(self, kind: str = None) -> List[Dict[str, Any]]:
+        return [result for result in self.check_run(kind) if result['status'] == 'regression']
+
+    def flush(self):
+        """Append this run's records to the history files"""
+        if not self.records:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        by_kind = {}
+        for record in self.records:
+            by_kind.setdefault(record['kind'], []).append(record)
+        for kind, records in by_kind.items():
+            # One write per kind in append mode keeps concurrent xdist workers from interleaving lines
+            with open(self._history_file(kind), 'a') as f:
+                f.write(''.join(json.dumps(record) + '\n' for record in records))
+            self.history(kind).extend(records)
+        self.records = []
+
+    def trends(self, component: str = None, points: int = 30) -> Dict[str, Any]:
+        """Per-component time series of p50/p95 with the latest run's regression status"""
+        trends = {}
+        for kind in KINDS:
+            series = {}
+            for record in self.history(kind):
+                if component is not None and record['component'] != component:
+                    continue
+                series.setdefault(self._series_key(record), []).append(record)
+
+            for key, records in series.items():
+                latest = records[-1]
+                check = self.check(latest)
+                trends.setdefault(latest['component'] or 'unassigned', []).append({
+                    'kind': kind,
+                    'key': latest['key'],
+                    'side': latest['side'],
+                    'environment': latest['environment'],
+                    'metric': latest.get('metric'),
+                    'cache_mode': latest.get('cache_mode'),
+                    'status': check['status'],
+                    'latest': check['statistics'],
+                    'points': [
+                        {field: record[field] for field in ('recorded_at', 'revision', 'count', 'p50', 'p95', 'p99')}
+                        for record in records[-points:]
+                    ]
+                })
+        return trends
+
+    def export_report(self, checks: List[Dict[str, Any]] = None,
+                      output_path: str = "reports/performance-comparison/regression_report.json"):
+        """Export the current run's regression checks to a JSON file"""
+        checks = self.check_run() if checks is None else checks
+        report = {
+            'generated_at': datetime.now().isoformat(),
+            'run_id': self.run_id,
+            'revision': self.revision,
+            'environment': self.environment,
+            'window': self.window,
+            'z_threshold': self.z_threshold,
+            'min_change': self.min_change,
+            'summary': {
+                status: sum(1 for check in checks if check['status'] == status)
+                for status in ('ok', 'improvement', 'regression', 'insufficient_baseline')
+            },
+            'checks': checks
+        }
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Report exported to: {output_path}")
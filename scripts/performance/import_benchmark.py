@@ -0,0 +1,137 @@
+"""
+Import-time benchmark: test-suite startup and collection time, optionally against another git revision
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# What a pytest worker pays before running a single test
+COMMANDS = {
+    'import_conftest': [sys.executable, '-c', 'import tests.conftest'],
+    'collect_only': [sys.executable, '-m', 'pytest', '--collect-only', '-q', '-p', 'no:cacheprovider', 'tests']
+}
+
+# Heavy modules whose presence after importing conftest is worth reporting
+WATCHED_MODULES = ('selenium', 'mysql.connector', 'psycopg2', 'yaml', 'requests', 'bs4')
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def time_command(command: List[str], cwd: Path, runs: int) -> Dict[str, Any]:
+    """Run a command repeatedly in fresh interpreters and summarize wall-clock time in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, capture_output=True, check=False)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': runs,
+        'median_ms': round(statistics.median(samples), 1),
+        'min_ms': round(min(samples), 1),
+        'max_ms': round(max(samples), 1)
+    }
+
+
+def import_profile(cwd: Path, top: int = 15) -> Dict[str, Any]:
+    """Top-level modules by cumulative import time (-X importtime) and which heavy modules got loaded"""
+    probe = (
+        "import sys, json, tests.conftest; "
+        f"print(json.dumps([name for name in {WATCHED_MODULES!r} if name in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        cwd=cwd, capture_output=True, text=True, check=False
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        # Only direct imports (one level of indentation) so nested times are not double counted
+        if match and len(match.group(3)) == 1:
+            modules.append({'module': match.group(4), 'cumulative_ms': round(int(match.group(2)) / 1000, 1)})
+    modules.sort(key=lambda module: module['cumulative_ms'], reverse=True)
+
+    try:
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        loaded = None
+    return {'slowest_imports': modules[:top], 'heavy_modules_loaded': loaded}
+
+
+def benchmark(cwd: Path, runs: int) -> Dict[str, Any]:
+    """Measure every command plus the import profile in one checkout"""
+    results = {name: time_command(command, cwd, runs) for name, command in COMMANDS.items()}
+    results['profile'] = import_profile(cwd)
+    return results
+
+
+@contextmanager
+def checkout(ref: str):
+    """Temporary git worktree of ref, removed again afterwards"""
+    with tempfile.TemporaryDirectory(prefix='import-benchmark-') as directory:
+        path = Path(directory) / 'tree'
+        subprocess.run(['git', 'worktree', 'add', '--detach', str(path), ref],
+                       cwd=PROJECT_ROOT, capture_output=True, check=True)
+        try:
+            yield path
+        finally:
+            subprocess.run(['git', 'worktree', 'remove', '--force', str(path)],
+                           cwd=PROJECT_ROOT, capture_output=True, check=False)
+
+
+def export_report(report: Dict[str, Any], output_path: str = "reports/performance-comparison/import_time.json"):
+    """Export benchmark results to a JSON file"""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Report exported to: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark test-suite import and collection time")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--against', default=None, metavar='REF',
+                        help="Also measure this git revision (e.g. main) for a before/after comparison")
+    parser.add_argument('--output', default="reports/performance-comparison/import_time.json")
+    args = parser.parse_args()
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'current': benchmark(PROJECT_ROOT, args.runs)
+    }
+    if args.against:
+        with checkout(args.against) as path:
+            report['baseline'] = {'ref': args.against, **benchmark(path, args.runs)}
+        report['speedup'] = {
+            name: round(report['baseline'][name]['median_ms'] / report['current'][name]['median_ms'], 2)
+            for name in COMMANDS
+            if report['current'][name]['median_ms']
+        }
+
+    for name in COMMANDS:
+        line = f"{name:<16} {report['current'][name]['median_ms']:>8.1f} ms"
+        if args.against:
+            line += f"  ({args.against}: {report['baseline'][name]['median_ms']:.1f} ms, " \
+                    f"x{report['speedup'][name]})"
+        print(line)
+    print(f"Heavy modules loaded by conftest: {report['current']['profile']['heavy_modules_loaded']}")
+
+    export_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Latency distribution statistics shared by the performance comparison tools
+"""
+import math
+from typing import Dict, Any, Sequence
+
+import numpy as np
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+def percentiles(samples: Sequence[float], points: Sequence[int] = PERCENTILES) -> Dict[str, float]:
+    """Summarize samples as rounded percentiles plus mean and count"""
+    if len(samples) == 0:
+        return {'count': 0}
+    values = np.asarray(samples, dtype=np.float64)
+    summary = {f"p{point}": round(float(value), 2)
+               for point, value in zip(points, np.percentile(values, points))}
+    summary['mean'] = round(float(values.mean()), 2)
+    summary['count'] = int(values.size)
+    return summary
+
+
+def _average_ranks(values: np.ndarray):
+    """Rank values from 1, giving ties their average rank; also returns tie group sizes"""
+    order = np.argsort(values, kind='mergesort')
+    ordered = values[order]
+    starts = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+    group = np.cumsum(starts) - 1
+    bounds = np.append(np.flatnonzero(starts), values.size)
+    group_ranks = (bounds[:-1] + bounds[1:] + 1) / 2.0
+
+    ranks = np.empty(values.size, dtype=np.float64)
+    ranks[order] = group_ranks[group]
+    return ranks, np.diff(bounds)
+
+
+def mann_whitney_u(baseline: Sequence[float], candidate: Sequence[float]) -> Dict[str, Any]:
+    """Two-sided Mann-Whitney U test with the tie-corrected normal approximation
+
+    Latency distributions are skewed and long-tailed, so a rank test is used
+    rather than a t-test. probability_candidate_slower is the chance that a
+    random candidate sample exceeds a random baseline sample (0.5 = no shift).
+    """
+    baseline = np.asarray(baseline, dtype=np.float64)
+    candidate = np.asarray(candidate, dtype=np.float64)
+    n1, n2 = baseline.size, candidate.size
+    if n1 == 0 or n2 == 0:
+        return {'u': None, 'z': None, 'p_value': None, 'probability_candidate_slower': None}
+
+    ranks, ties = _average_ranks(np.concatenate([baseline, candidate]))
+    u_candidate = float(ranks[n1:].sum()) - n2 * (n2 + 1) / 2.0
+    n = n1 + n2
+    mean_u = n1 * n2 / 2.0
+    tie_term = float((ties ** 3 - ties).sum()) / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+
+    if sigma == 0:
+        z, p_value = 0.0, 1.0
+    else:
+        # Continuity correction towards the mean
+        z = (u_candidate - mean_u - math.copysign(0.5, u_candidate - mean_u)) / sigma \
+            if u_candidate != mean_u else 0.0
+        p_value = math.erfc(abs(z) / math.sqrt(2))
+
+    return {
+        'u': float(u_candidate),
+        'z': round(z, 4),
+        'p_value': p_value,
+        'probability_candidate_slower': round(u_candidate / (n1 * n2), 4)
+    }
+
+
+def compare_samples(laravel: Sequence[float], django: Sequence[float],
+                    alpha: float = 0.05, min_effect: float = 0.05) -> Dict[str, Any]:
+    """Compare Laravel and Django latency samples side by side
+
+    A difference is significant when p < alpha and the probability of Django
+    being slower is at least min_effect away from a coin flip, so huge sample
+    counts do not flag negligible shifts.
+    """
+    laravel_summary = percentiles(laravel)
+    django_summary = percentiles(django)
+    test = mann_whitney_u(laravel, django)
+
+    significant = (
+        test['p_value'] is not None
+        and test['p_value'] < alpha
+        and abs(test['probability_candidate_slower'] - 0.5) >= min_effect
+    )
+    if not significant:
+        verdict = 'no_significant_difference'
+    elif test['probability_candidate_slower'] > 0.5:
+        verdict = 'django_slower'
+    else:
+        verdict = 'django_faster'
+
+    ratios = {
+        key: round(django_summary[key] / laravel_summary[key], 3)
+        for key in ('p50', 'p95', 'p99')
+        if laravel_summary.get(key) and key in django_summary
+    }
+    return {
+        'laravel': laravel_summary,
+        'django': django_summary,
+        'django_to_laravel_ratio': ratios,
+        'mann_whitney': test,
+        'alpha': alpha,
+        'significant': significant,
+        'verdict': verdict
+    }
@@ -0,0 +1,360 @@
+"""
+Scenario-driven Locust load tests comparing Laravel and Django under identical workloads
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.migration_config import MigrationConfig
+from config.test_settings import TEST_SETTINGS, TEST_DATA
+from scripts.performance.latency_stats import compare_samples, percentiles
+from tests.login_forms import CSRF_FIELDS, LOGIN_PATHS, csrf_token
+
+# Requests per route kept for the significance test; older samples are replaced at random
+SAMPLE_RESERVOIR = 20000
+
+PRIORITY_WEIGHTS = {'high': 3, 'medium': 2, 'low': 1}
+
+# Routes that would end the virtual user's session or need form data
+SKIPPED_ROUTE_RE = re.compile(r'(^|/)(login|logout|register)(/|$)')
+_PARAM_RE = re.compile(r'\{[^/]+\}|<[^/]+>')
+
+
+def build_scenarios(config_path: str = "config/component_mapping.json",
+                    route_params: Dict[str, str] = None) -> List[Dict[str, Any]]:
+    """Pair each component's Laravel routes with its Django URLs as weighted GET scenarios
+
+    Parametrised routes are included only when every parameter has a value in
+    route_params (e.g. {'id': '1', 'pk': '1'}); routes that log in or out are skipped.
+    """
+    try:
+        with open(config_path, 'r') as f:
+            components = json.load(f)['components']
+    except FileNotFoundError:
+        print(f"Configuration file not found: {config_path}")
+        return []
+
+    route_params = route_params or {}
+
+    def fill(route: str) -> Optional[str]:
+        def substitute(match):
+            name = match.group(0).strip('{}<>').split(':')[-1]
+            if name not in route_params:
+                raise KeyError(name)
+            return route_params[name]
+        try:
+            return _PARAM_RE.sub(substitute, route)
+        except KeyError:
+            return None
+
+    scenarios = []
+    for component, details in components.items():
+        laravel_routes = details.get('laravel', {}).get('routes', [])
+        django_urls = details.get('django', {}).get('urls', [])
+        weight = PRIORITY_WEIGHTS.get(details.get('priority'), 1)
+
+        for laravel_route, django_url in zip(laravel_routes, django_urls):
+            if SKIPPED_ROUTE_RE.search(laravel_route):
+                continue
+            laravel_path, django_path = fill(laravel_route), fill(django_url)
+            if laravel_path is None or django_path is None:
+                continue
+            scenarios.append({
+                'name': laravel_route,
+                'component': component,
+                'weight': weight,
+                'laravel': laravel_path,
+                'django': django_path
+            })
+    return scenarios
+
+
+def make_user_class(scenarios: List[Dict[str, Any]], app: str, login: bool,
+                    wait: tuple = (1.0, 2.0), rng: random.Random = None):
+    """Build a Locust user class that requests the scenarios' routes for one app
+
+    Requests are named after the Laravel route, so both apps' statistics line up
+    per route even where the Django URL differs. Scenario choice and think times
+    draw from rng, so a seeded generator replays the same workload sequence.
+    """
+    from locust import FastHttpUser
+
+    rng = rng or random.Random()
+    weights = [scenario['weight'] for scenario in scenarios]
+
+    def request_scenario(user):
+        scenario = rng.choices(scenarios, weights)[0]
+        user.client.get(scenario[app], name=scenario['name'])
+
+    def wait_time(user):
+        return rng.uniform(*wait)
+
+    def on_start(user):
+        if not login:
+            return
+        credentials = TEST_DATA['USERS']['admin']
+        page = user.client.get(LOGIN_PATHS[app], name='login')
+        form = {'email': credentials['email'], 'password': credentials['password']}
+        token = csrf_token(app, page.text)
+        if token is not None:
+            form[CSRF_FIELDS[app]] = token
+        user.client.post(LOGIN_PATHS[app], data=form, name='login')
+
+    return type(f"{app.title()}ScenarioUser", (FastHttpUser,), {
+        'abstract': False,
+        'wait_time': wait_time,
+        'tasks': [request_scenario],
+        'on_start': on_start
+    })
+
+
+class LoadTestRunner:
+    """Runs the same Locust workload against each app and compares the results per route"""
+
+    def __init__(self, scenarios: List[Dict[str, Any]], users: int = None, duration: int = None,
+                 spawn_rate: float = None, wait: tuple = (1.0, 2.0), login: bool = True,
+                 seed: int = 42, alpha: float = 0.05):
+        performance = TEST_SETTINGS['PERFORMANCE']
+        self.scenarios = scenarios
+        self.users = users or performance['LOAD_TEST_USERS']
+        self.duration = duration or performance['LOAD_TEST_DURATION']
+        self.spawn_rate = spawn_rate or max(1.0, self.users / 10)
+        self.wait = wait
+        self.login = login
+        self.seed = seed
+        self.alpha = alpha
+        self.results = {}
+
+    def run_app(self, app: str, host: str) -> Dict[str, Any]:
+        """Run the workload headless against one app and collect per-route samples"""
+        import gevent
+        from locust.env import Environment
+
+        # Same seed for both runs, so task selection and think times follow the same sequence;
+        # the reservoir gets its own generator so it does not disturb that sequence
+        workload_random = random.Random(self.seed)
+        reservoir_random = random.Random(self.seed)
+        samples = {}
+        seen = {}
+
+        def on_request(request_type, name, response_time, response_length, exception=None, **kwargs):
+            if name == 'login' or exception is not None:
+                return
+            reservoir = samples.setdefault(name, [])
+            seen[name] = seen.get(name, 0) + 1
+            if len(reservoir) < SAMPLE_RESERVOIR:
+                reservoir.append(response_time)
+            else:
+                slot = reservoir_random.randrange(seen[name])
+                if slot < SAMPLE_RESERVOIR:
+                    reservoir[slot] = response_time
+
+        environment = Environment(
+            user_classes=[make_user_class(self.scenarios, app, self.login, self.wait, workload_random)],
+            host=host
+        )
+        environment.events.request.add_listener(on_request)
+        runner = environment.create_local_runner()
+
+        print(f"Load testing {app} at {host}: {self.users} users for {self.duration}s")
+        runner.start(self.users, spawn_rate=self.spawn_rate)
+        gevent.spawn_later(self.duration, runner.quit)
+        runner.greenlet.join()
+
+        routes = {}
+        for scenario in self.scenarios:
+            entry = environment.stats.entries.get((scenario['name'], 'GET'))
+            if entry is None:
+                continue
+            routes[scenario['name']] = {
+                'requests': entry.num_requests,
+                'failures': entry.num_failures,
+                'throughput_rps': round(entry.num_requests / self.duration, 2),
+                'latency_ms': percentiles(samples.get(scenario['name'], [])),
+                'samples': samples.get(scenario['name'], [])
+            }
+
+        total = environment.stats.total
+        return {
+            'host': host,
+            'requests': total.num_requests,
+            'failures': total.num_failures,
+            'throughput_rps': round(total.num_requests / self.duration, 2),
+            'routes': routes
+        }
+
+    def run(self, laravel_url: str, django_url: str) -> Dict[str, Any]:
+        """Run both apps one after the other so neither competes with the other for resources"""
+        self.results = {
+            'laravel': self.run_app('laravel', laravel_url),
+            'django': self.run_app('django', django_url)
+        }
+        return self.compare()
+
+    def compare(self) -> Dict[str, Any]:
+        """Side-by-side throughput, percentiles and significance per route"""
+        routes = {}
+        for scenario in self.scenarios:
+            name = scenario['name']
+            laravel = self.results['laravel']['routes'].get(name)
+            django = self.results['django']['routes'].get(name)
+            if laravel is None or django is None:
+                continue
+            routes[name] = {
+                'component': scenario['component'],
+                'laravel_path': scenario['laravel'],
+                'django_path': scenario['django'],
+                'throughput_rps': {'laravel': laravel['throughput_rps'], 'django': django['throughput_rps']},
+                'failures': {'laravel': laravel['failures'], 'django': django['failures']},
+                **compare_samples(laravel['samples'], django['samples'], alpha=self.alpha)
+            }
+
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'workload': {
+                'users': self.users,
+                'duration_seconds': self.duration,
+                'spawn_rate': self.spawn_rate,
+                'wait_seconds': list(self.wait),
+                'seed': self.seed,
+                'scenarios': [
+                    {key: scenario[key] for key in ('name', 'component', 'weight')}
+                    for scenario in self.scenarios
+                ]
+            },
+            'totals': {
+                app: {key: result[key] for key in ('host', 'requests', 'failures', 'throughput_rps')}
+                for app, result in self.results.items()
+            },
+            'routes': routes,
+            'significantly_slower_routes': sorted(
+                name for name, route in routes.items() if route['verdict'] == 'django_slower'
+            )
+        }
+
+    def export_report(self, comparison: Dict[str, Any],
+                      output_path: str = "reports/performance-comparison/load_test_comparison.json"):
+        """Export the load test comparison to a JSON file"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump(comparison, f, indent=2)
+
+        print(f"Report exported to: {output_path}")
+
+
+def print_comparison(comparison: Dict[str, Any]):
+    """Print a side-by-side table of the comparison"""
+    print(f"\n{'Route':<22} {'RPS L/D':>13} {'p50 L/D ms':>17} {'p95 L/D ms':>17} {'p-value':>9}  Verdict")
+    for name, route in comparison['routes'].items():
+        laravel, django = route['laravel'], route['django']
+        p_value = route['mann_whitney']['p_value']
+        print(
+            f"{name:<22} "
+            f"{route['throughput_rps']['laravel']:>6}/{route['throughput_rps']['django']:<6} "
+            f"{laravel.get('p50', '-'):>8}/{django.get('p50', '-'):<8} "
+            f"{laravel.get('p95', '-'):>8}/{django.get('p95', '-'):<8} "
+            f"{p_value if p_value is None else format(p_value, '.3g'):>9}  {route['verdict']}"
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_apps(scenarios: List[Dict[str, Any]], laravel_latency: tuple,
+                    django_latency: tuple):
+    """Start one stub app per side in its own process, returning the processes and URLs"""
+    processes, urls = [], []
+    for app, latency in (('laravel', laravel_latency), ('django', django_latency)):
+        port = _free_port()
+        command = [sys.executable, '-m', 'scripts.performance.stub_servers', '--port', str(port),
+                   '--latency', str(latency[0]), str(latency[1])]
+        for scenario in scenarios:
+            command += ['--path', scenario[app].split('?', 1)[0]]
+        for login_path in LOGIN_PATHS.values():
+            command += ['--path', login_path]
+        processes.append(subprocess.Popen(command, cwd=str(Path(__file__).resolve().parent.parent.parent)))
+        urls.append(f"http://127.0.0.1:{port}")
+
+    for url in urls:
+        port = int(url.rsplit(':', 1)[1])
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Stub app did not start on port {port}")
+                time.sleep(0.1)
+    return processes, urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Laravel and Django under identical Locust load")
+    parser.add_argument('--users', type=int, default=None, help="Defaults to LOAD_TEST_USERS")
+    parser.add_argument('--duration', type=int, default=None, help="Seconds; defaults to LOAD_TEST_DURATION")
+    parser.add_argument('--spawn-rate', type=float, default=None)
+    parser.add_argument('--wait', type=float, nargs=2, default=(1.0, 2.0), metavar=('MIN', 'MAX'))
+    parser.add_argument('--component', action='append', default=[], help="Only load these components")
+    parser.add_argument('--route-param', action='append', default=[], metavar='NAME=VALUE',
+                        help="Value for route parameters such as id=1 or pk=1")
+    parser.add_argument('--no-login', action='store_true', help="Run as an anonymous user")
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--stub', action='store_true', help="Run against local stub apps (CI)")
+    parser.add_argument('--stub-latency', type=float, nargs=4, default=(0.005, 0.02, 0.005, 0.02),
+                        metavar=('L_MIN', 'L_MAX', 'D_MIN', 'D_MAX'),
+                        help="Response delay ranges for the Laravel and Django stubs")
+    parser.add_argument('--output', default="reports/performance-comparison/load_test_comparison.json")
+    args = parser.parse_args()
+
+    scenarios = build_scenarios(
+        route_params=dict(param.split('=', 1) for param in args.route_param)
+    )
+    if args.component:
+        scenarios = [scenario for scenario in scenarios if scenario['component'] in args.component]
+    if not scenarios:
+        print("No load test scenarios to run")
+        sys.exit(1)
+
+    runner = LoadTestRunner(
+        scenarios, users=args.users, duration=args.duration, spawn_rate=args.spawn_rate,
+        wait=tuple(args.wait), login=not args.no_login and not args.stub, alpha=args.alpha
+    )
+
+    processes = []
+    try:
+        if args.stub:
+            processes, (laravel_url, django_url) = start_stub_apps(
+                scenarios, tuple(args.stub_latency[:2]), tuple(args.stub_latency[2:])
+            )
+        else:
+            config = MigrationConfig()
+            laravel_url, django_url = config.LARAVEL_APP_URL, config.DJANGO_APP_URL
+        comparison = runner.run(laravel_url, django_url)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    print_comparison(comparison)
+    runner.export_report(comparison, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Local stand-ins for the Laravel and Django apps, for replay and load tests without the real apps
+"""
+import argparse
+import asyncio
+import json
+import random
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Callable, Iterable, Optional, Tuple
+
+from aiohttp import web
+
+# Request key -> (status, content type, body)
+StubRoutes = Dict[Tuple[str, str], Tuple[int, str, bytes]]
+
+
+def routes_from_corpus(requests: Iterable[Dict[str, Any]]) -> StubRoutes:
+    """Build stub routes from the recorded responses of a replay corpus"""
+    routes = {}
+    for request in requests:
+        if request.get('recorded_status') is None:
+            continue
+        body = request.get('recorded_body') or ''
+        routes[(request['method'], request['path'])] = (
+            request['recorded_status'],
+            request.get('recorded_content_type') or 'application/json',
+            body.encode() if isinstance(body, str) else body
+        )
+    return routes
+
+
+def create_stub_app(routes: StubRoutes, latency: Tuple[float, float] = (0.0, 0.0),
+                    mutate: Optional[Callable[[Any], Any]] = None) -> web.Application:
+    """Create an app that answers every recorded request with its recorded response
+
+    latency is a (min, max) range in seconds added to each response. mutate, if
+    given, is applied to decoded JSON bodies to simulate behavioural drift.
+    """
+
+    async def handle(request: web.Request) -> web.Response:
+        if latency[1]:
+            await asyncio.sleep(random.uniform(*latency))
+        key = (request.method, request.path_qs)
+        if key not in routes:
+            return web.json_response({'message': 'Not Found'}, status=404)
+
+        status, content_type, body = routes[key]
+        if mutate is not None and content_type.startswith('application/json') and body:
+            body = json.dumps(mutate(json.loads(body))).encode()
+        return web.Response(status=status, body=body, content_type=content_type.split(';')[0])
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handle)
+    return app
+
+
+def create_route_stub_app(paths: Iterable[str], latency: Tuple[float, float] = (0.0, 0.0)) -> web.Application:
+    """Create an app that serves a small HTML page on every given path, for load tests"""
+    known = {path.rstrip('/') or '/' for path in paths}
+
+    async def handle(request: web.Request) -> web.Response:
+        if latency[1]:
+            await asyncio.sleep(random.uniform(*latency))
+        path = request.path.rstrip('/') or '/'
+        if path not in known:
+            return web.Response(status=404, text='Not Found')
+        return web.Response(
+            text=f"<html><body><h1>{path}</h1></body></html>", content_type='text/html'
+        )
+
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handle)
+    return app
+
+
+@asynccontextmanager
+async def running_stub_servers(laravel_app: web.Application, django_app: web.Application,
+                               host: str = '127.0.0.1'):
+    """Serve both stub apps on free local ports, yielding their base URLs"""
+    runners = []
+    urls = []
+    try:
+        for app in (laravel_app, django_app):
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, host, 0)
+            await site.start()
+            runners.append(runner)
+            port = site._server.sockets[0].getsockname()[1]
+            urls.append(f"http://{host}:{port}")
+        yield urls[0], urls[1]
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a stub app for load tests")
+    parser.add_argument('--port', type=int, required=True)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--path', action='append', default=[], help="Path to answer with 200")
+    parser.add_argument('--latency', type=float, nargs=2, default=(0.0, 0.0), metavar=('MIN', 'MAX'),
+                        help="Response delay range in seconds")
+    args = parser.parse_args()
+
+    web.run_app(
+        create_route_stub_app(args.path, tuple(args.latency)),
+        host=args.host, port=args.port, print=None
+    )
+
+
+if __name__ == "__main__":
+    main()
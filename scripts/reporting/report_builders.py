@@ -0,0 +1,377 @@
+"""
+Builders that turn raw result files into report summaries
+"""
+import json
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Any, List, Iterable
+
+# Files handed to a builder: path relative to the project root -> absolute path
+InputFiles = Dict[str, Path]
+
+SEVERITIES = ('high', 'medium', 'low', 'informational')
+
+# OWASP ZAP riskcode -> severity
+ZAP_RISKS = {'3': 'high', '2': 'medium', '1': 'low', '0': 'informational'}
+
+
+def _load_json(path: Path) -> Any:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _load_jsonl(path: Path) -> List[Dict[str, Any]]:
+    with open(path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _select(files: InputFiles, suffix: str, name: str = None) -> Dict[str, Path]:
+    return {
+        relative: path for relative, path in files.items()
+        if relative.endswith(suffix) and (name is None or Path(relative).name == name)
+    }
+
+
+def _card(label: str, value: Any) -> Dict[str, Any]:
+    return {'label': label, 'value': value}
+
+
+def _section(title: str, columns: List[str], rows: Iterable[List[Any]]) -> Dict[str, Any]:
+    return {'title': title, 'columns': columns, 'rows': [list(row) for row in rows]}
+
+
+def parse_junit(path: Path) -> List[Dict[str, Any]]:
+    """Read the test suites of a JUnit XML file as written by pytest --junitxml"""
+    root = ET.parse(path).getroot()
+    suites = [root] if root.tag == 'testsuite' else root.findall('testsuite')
+    parsed = []
+    for suite in suites:
+        cases = []
+        for case in suite.iter('testcase'):
+            outcome = 'passed'
+            for tag in ('failure', 'error', 'skipped'):
+                if case.find(tag) is not None:
+                    outcome = {'failure': 'failed', 'error': 'error', 'skipped': 'skipped'}[tag]
+                    break
+            cases.append({
+                'name': f"{case.get('classname', '')}::{case.get('name', '')}",
+                'time': float(case.get('time') or 0),
+                'outcome': outcome
+            })
+        parsed.append({
+            'name': suite.get('name', 'pytest'),
+            'timestamp': suite.get('timestamp'),
+            'time': float(suite.get('time') or 0),
+            'cases': cases
+        })
+    return parsed
+
+
+def _junit_totals(files: InputFiles) -> Dict[str, Any]:
+    """Totals over every JUnit file, counting each test case once
+
+    junit.xml and the per-suite files (security_tests.xml, ...) overlap, so a
+    case reported by several files counts with its most recent outcome.
+    """
+    suites, latest = [], {}
+    xml_files = sorted(_select(files, '.xml').items(), key=lambda item: (item[1].stat().st_mtime, item[0]))
+    for relative, path in xml_files:
+        for suite in parse_junit(path):
+            counts = {outcome: 0 for outcome in ('passed', 'failed', 'error', 'skipped')}
+            for case in suite['cases']:
+                counts[case['outcome']] += 1
+                latest[case['name']] = case
+            suites.append({'file': relative, 'name': suite['name'], 'tests': len(suite['cases']),
+                           'time': round(suite['time'], 2), **counts})
+
+    totals = {'tests': len(latest), 'passed': 0, 'failed': 0, 'error': 0, 'skipped': 0,
+              'time': round(sum(case['time'] for case in latest.values()), 2)}
+    for case in latest.values():
+        totals[case['outcome']] += 1
+    failures = [name for name, case in latest.items() if case['outcome'] in ('failed', 'error')]
+    suites.sort(key=lambda suite: suite['file'])
+    return {'totals': totals, 'suites': suites, 'failures': failures}
+
+
+def build_migration_progress(files: InputFiles) -> Dict[str, Any]:
+    """Component status from component_mapping.json plus data validation results"""
+    mapping = _load_json(files['config/component_mapping.json']) if 'config/component_mapping.json' in files else {}
+    components = mapping.get('components', {})
+    tracking = {
+        Path(relative).stem: _load_json(path)
+        for relative, path in _select(files, '.json').items()
+        if Path(relative).stem in components
+    }
+
+    statuses = [details.get('status', 'pending') for details in components.values()]
+    completed = statuses.count('completed')
+    in_progress = statuses.count('in_progress')
+    progress = round(completed / len(components) * 100, 2) if components else 0.0
+
+    component_rows = [
+        [name, details.get('status', 'pending'), details.get('priority', 'medium'),
+         details.get('estimated_effort', 'Unknown'), tracking.get(name, {}).get('progress', '')]
+        for name, details in components.items()
+    ]
+
+    field_rows = []
+    for path in _select(files, '.json', 'json_field_comparison.json').values():
+        for table, result in _load_json(path).get('tables', {}).items():
+            for field, stats in result.get('fields', {}).items():
+                field_rows.append([table, field, stats.get('rows_compared', 0), stats.get('mismatches', 0),
+                                   stats.get('missing_in_django', 0), stats.get('missing_in_laravel', 0)])
+
+    # Latest incremental validation run per table
+    latest_runs = {}
+    for path in _select(files, '.jsonl', 'incremental_runs.jsonl').values():
+        for run in _load_jsonl(path):
+            latest_runs[run.get('laravel_table')] = run
+    run_rows = [
+        [table, run.get('mode'), run.get('run_at'), run.get('count_match'),
+         run.get('rows_compared', 0), run.get('mismatches', 0)]
+        for table, run in sorted(latest_runs.items(), key=lambda item: str(item[0]))
+    ]
+
+    return {
+        'title': 'Migration Progress',
+        'cards': [
+            _card('Overall Progress', f"{progress}%"),
+            _card('Components Completed', completed),
+            _card('In Progress', in_progress),
+            _card('Pending', len(components) - completed - in_progress)
+        ],
+        'sections': [
+            _section('Components', ['Component', 'Status', 'Priority', 'Effort', 'Tracked progress'],
+                     component_rows),
+            _section('JSON field comparison', ['Table', 'Field', 'Rows compared', 'Mismatches',
+                                               'Missing in Django', 'Missing in Laravel'], field_rows),
+            _section('Incremental validation (latest run per table)',
+                     ['Table', 'Mode', 'Run at', 'Counts match', 'Rows compared', 'Mismatches'], run_rows)
+        ],
+        'data': {
+            'overall_progress': progress,
+            'components': {
+                name: {'status': details.get('status', 'pending'), 'priority': details.get('priority', 'medium'),
+                       'tracking': tracking.get(name)}
+                for name, details in components.items()
+            },
+            'json_field_mismatches': sum(row[3] for row in field_rows),
+            'incremental_runs': latest_runs
+        }
+    }
+
+
+def build_test_results(files: InputFiles) -> Dict[str, Any]:
+    """Pass/fail totals from JUnit XML plus phase profile, durations, driver pool and visual diff results"""
+    junit = _junit_totals(files)
+    totals = junit['totals']
+
+    profile = {}
+    for path in _select(files, '.json', 'phase_profile.json').values():
+        profile = _load_json(path)
+
+    durations = {}
+    for path in _select(files, '.json', 'durations.json').values():
+        durations = _load_json(path)
+    slowest = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:15]
+
+    pools = [
+        _load_json(path) for relative, path in sorted(files.items())
+        if Path(relative).name.startswith('driver_pool_') and relative.endswith('.json')
+    ]
+
+    visual = {}
+    for path in _select(files, '.json', 'visual_diff_report.json').values():
+        visual = _load_json(path)
+
+    phases = profile.get('overall', {}).get('phases', {})
+    return {
+        'title': 'Test Results',
+        'cards': [
+            _card('Tests', totals['tests']),
+            _card('Passed', totals['passed']),
+            _card('Failed / Errors', totals['failed'] + totals['error']),
+            _card('Suite Time', f"{totals['time']}s")
+        ],
+        'sections': [
+            _section('Suites', ['File', 'Suite', 'Tests', 'Passed', 'Failed', 'Errors', 'Skipped', 'Time (s)'],
+                     ([suite['file'], suite['name'], suite['tests'], suite['passed'], suite['failed'],
+                       suite['error'], suite['skipped'], suite['time']] for suite in junit['suites'])),
+            _section('Failing tests', ['Test'], ([name] for name in junit['failures'])),
+            _section('Time per phase', ['Phase', 'Seconds', 'Share'],
+                     ([name, seconds, f"{profile['overall']['share'].get(name, 0):.1%}"]
+                      for name, seconds in phases.items())),
+            _section('Time per component', ['Component', 'Tests', 'Wall (s)', 'Slowest phase'],
+                     ([name, component['tests'], component['wall'], component.get('slowest_phase') or '']
+                      for name, component in profile.get('components', {}).items())),
+            _section('Slowest tests (smoothed)', ['Test', 'Seconds'], slowest),
+            _section('Driver pool', ['Worker', 'Acquired', 'Hits', 'Created', 'Hit rate'],
+                     ([pool.get('worker'), pool.get('acquired', ''), pool.get('hits', ''),
+                       pool.get('created', ''), pool.get('hit_rate', '')] for pool in pools)),
+            _section('Visual diff failures', ['Route'], ([name] for name in visual.get('failing', [])))
+        ],
+        'data': {
+            'totals': totals,
+            'suites': junit['suites'],
+            'failures': junit['failures'],
+            'phases': profile.get('overall'),
+            'visual_diff_failing': visual.get('failing', [])
+        }
+    }
+
+
+def build_performance_comparison(files: InputFiles) -> Dict[str, Any]:
+    """Latency, throughput and regression summaries of the performance tools"""
+    reports = {Path(relative).name: _load_json(path) for relative, path in _select(files, '.json').items()
+               if not relative.startswith('reports/performance-comparison/page_timing/')}
+    sections, data = [], {}
+
+    load_test = reports.get('load_test_comparison.json')
+    if load_test:
+        sections.append(_section(
+            'Load test (Laravel vs Django)',
+            ['Route', 'RPS Laravel', 'RPS Django', 'p95 Laravel ms', 'p95 Django ms', 'Verdict'],
+            ([name, route['throughput_rps']['laravel'], route['throughput_rps']['django'],
+              route['laravel'].get('p95', ''), route['django'].get('p95', ''), route['verdict']]
+             for name, route in load_test.get('routes', {}).items())
+        ))
+        data['load_test_slower_routes'] = load_test.get('significantly_slower_routes', [])
+
+    replay = reports.get('api_replay.json')
+    if replay:
+        sections.append(_section(
+            'API replay', ['Side', 'p50 ms', 'p95 ms', 'p99 ms'],
+            ([side, latency.get('p50', ''), latency.get('p95', ''), latency.get('p99', '')]
+             for side, latency in replay.get('latency_ms', {}).items())
+        ))
+        data['api_parity_rate'] = replay.get('parity_rate')
+
+    # One query_latency_<worker>.json per xdist worker
+    latency_reports = [report for name, report in sorted(reports.items())
+                       if name.startswith('query_latency') and isinstance(report, dict)]
+    if latency_reports:
+        sides, slow_queries = {}, set()
+        for queries in latency_reports:
+            for side, stats in queries.get('sides', {}).items():
+                totals = sides.setdefault(side, {'queries': 0, 'rows': 0, 'total_time': 0.0})
+                for counter in totals:
+                    totals[counter] += stats.get(counter, 0)
+            slow_queries.update((query['side'], query['fingerprint']) for query in queries.get('slow_queries', []))
+        sections.append(_section(
+            'Database queries', ['Side', 'Queries', 'Rows', 'Total time (s)'],
+            ([side, stats['queries'], stats['rows'], round(stats['total_time'], 6)]
+             for side, stats in sides.items())
+        ))
+        data['slow_queries'] = len(slow_queries)
+
+    # regression_report.json from scripts, regression_report_<worker>.json from pytest workers
+    regression = None
+    for name, report in sorted(reports.items()):
+        if not (name.startswith('regression_report') and isinstance(report, dict)):
+            continue
+        if regression is None:
+            regression = {'checks': [], 'summary': {}}
+        regression['checks'].extend(report.get('checks', []))
+        for status, count in report.get('summary', {}).items():
+            regression['summary'][status] = regression['summary'].get(status, 0) + count
+    if regression:
+        sections.append(_section(
+            'Regressions against baseline', ['Kind', 'Key', 'Side', 'Status'],
+            ([check['kind'], check['key'], check['side'], check['status']]
+             for check in regression.get('checks', []) if check['status'] in ('regression', 'improvement'))
+        ))
+        data['regression_summary'] = regression.get('summary')
+
+    page_rows = []
+    for relative, path in sorted(files.items()):
+        if relative.startswith('reports/performance-comparison/page_timing/'):
+            route = _load_json(path)
+            for side in ('laravel', 'django'):
+                for cache_mode, measurement in route.get(side, {}).items():
+                    load = measurement.get('distributions', {}).get('load', {})
+                    page_rows.append([route.get('route'), side, cache_mode, load.get('p50', ''), load.get('p95', '')])
+    if page_rows:
+        sections.append(_section('Page load', ['Route', 'Side', 'Cache', 'p50 ms', 'p95 ms'], page_rows))
+
+    imports = reports.get('import_time.json')
+    if imports:
+        sections.append(_section(
+            'Test startup', ['Command', 'Median ms'],
+            ([name, timing['median_ms']] for name, timing in imports.get('current', {}).items()
+             if isinstance(timing, dict) and 'median_ms' in timing)
+        ))
+
+    regressions = (regression or {}).get('summary', {}).get('regression', 0)
+    return {
+        'title': 'Performance Comparison',
+        'cards': [
+            _card('Slower Routes (load test)', len(data.get('load_test_slower_routes', []))),
+            _card('API Parity', f"{data['api_parity_rate']:.1%}" if data.get('api_parity_rate') is not None else 'n/a'),
+            _card('Slow Queries', data.get('slow_queries', 0)),
+            _card('Regressions', regressions)
+        ],
+        'sections': sections,
+        'data': data
+    }
+
+
+def _security_findings(report: Any) -> List[Dict[str, Any]]:
+    """Normalize OWASP ZAP JSON reports and generic finding lists"""
+    findings = []
+    if isinstance(report, dict) and 'site' in report:
+        for site in report['site']:
+            for alert in site.get('alerts', []):
+                findings.append({
+                    'name': alert.get('name') or alert.get('alert'),
+                    'severity': ZAP_RISKS.get(str(alert.get('riskcode')), 'informational'),
+                    'target': site.get('@name'),
+                    'count': int(alert.get('count') or len(alert.get('instances', [])) or 1)
+                })
+        return findings
+
+    entries = report if isinstance(report, list) else (
+        report.get('findings') or report.get('alerts') or report.get('vulnerabilities') or []
+    )
+    for entry in entries:
+        severity = str(entry.get('severity') or entry.get('risk') or 'informational').lower()
+        findings.append({
+            'name': entry.get('name') or entry.get('title') or entry.get('test'),
+            'severity': severity if severity in SEVERITIES else 'informational',
+            'target': entry.get('target') or entry.get('url') or entry.get('path'),
+            'count': int(entry.get('count') or 1)
+        })
+    return findings
+
+
+def build_security_analysis(files: InputFiles) -> Dict[str, Any]:
+    """Scanner findings by severity plus the security test suite results"""
+    findings = []
+    for relative, path in sorted(_select(files, '.json').items()):
+        for finding in _security_findings(_load_json(path)):
+            findings.append({'source': relative, **finding})
+
+    junit = _junit_totals(_select(files, '.xml'))
+    by_severity = {severity: sum(f['count'] for f in findings if f['severity'] == severity)
+                   for severity in SEVERITIES}
+    order = {severity: index for index, severity in enumerate(SEVERITIES)}
+
+    return {
+        'title': 'Security Analysis',
+        'cards': [
+            _card('High', by_severity['high']),
+            _card('Medium', by_severity['medium']),
+            _card('Low', by_severity['low']),
+            _card('Failed Security Tests', junit['totals']['failed'] + junit['totals']['error'])
+        ],
+        'sections': [
+            _section('Findings', ['Severity', 'Finding', 'Target', 'Count', 'Source'],
+                     ([f['severity'], f['name'], f['target'], f['count'], f['source']]
+                      for f in sorted(findings, key=lambda f: order[f['severity']]))),
+            _section('Failing security tests', ['Test'], ([name] for name in junit['failures']))
+        ],
+        'data': {
+            'by_severity': by_severity,
+            'findings': findings,
+            'tests': junit['totals']
+        }
+    }
@@ -0,0 +1,330 @@
+"""
+Report pipeline: builds HTML/JSON summaries from raw result files, in parallel and only when inputs changed
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Dict, Any, List, Tuple
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.test_settings import BASE_DIR
+from scripts.reporting import report_builders
+
+TEMPLATE_DIR = BASE_DIR / 'templates' / 'reports'
+OUTPUT_DIR = BASE_DIR / 'reports' / 'summary'
+MANIFEST_NAME = '.manifest.json'
+
+# Report name -> title, input globs relative to the project root, builder
+REPORTS = {
+    'migration_progress': {
+        'title': 'Migration Progress',
+        'inputs': ['config/component_mapping.json', 'reports/migration-progress/*.json',
+                   'reports/migration-progress/*.jsonl'],
+        'builder': 'build_migration_progress'
+    },
+    'test_results': {
+        'title': 'Test Results',
+        'inputs': ['reports/test-results/*.xml', 'reports/test-results/*.json',
+                   'reports/test-results/visual-diff/visual_diff_report.json'],
+        'builder': 'build_test_results'
+    },
+    'performance_comparison': {
+        'title': 'Performance Comparison',
+        'inputs': ['reports/performance-comparison/*.json', 'reports/performance-comparison/page_timing/*.json'],
+        'builder': 'build_performance_comparison'
+    },
+    'security_analysis': {
+        'title': 'Security Analysis',
+        'inputs': ['reports/security-analysis/**/*.json', 'reports/test-results/security*.xml'],
+        'builder': 'build_security_analysis'
+    }
+}
+
+# Edits to the builders or templates must invalidate every report built with them
+CODE_FILES = (Path(report_builders.__file__).resolve(), Path(__file__).resolve())
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileHashCache:
+    """Content hashes of input files, re-read only when size or mtime changed"""
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]] = None):
+        self.entries = dict(entries or {})
+        self.hashed = 0
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path)
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        self.hashed += 1
+        entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256_file(path)}
+        self.entries[key] = entry
+        return entry['sha256']
+
+
+@lru_cache(maxsize=None)
+def _compile_template(path: Path, digest: str) -> Template:
+    # Keyed by content hash so a long-lived worker picks up edited templates
+    return Template(path.read_text())
+
+
+def load_template(name: str) -> Template:
+    """Return a compiled template, parsed once per process"""
+    path = TEMPLATE_DIR / name
+    return _compile_template(path, sha256_file(path))
+
+
+def input_files(spec: Dict[str, Any], root: Path = BASE_DIR, output_dir: Path = OUTPUT_DIR) -> Dict[str, Path]:
+    """Resolve a report's input globs to existing files, keyed by path relative to the root"""
+    files = {}
+    for pattern in spec['inputs']:
+        for path in root.glob(pattern):
+            if path.is_file() and output_dir not in path.parents:
+                files[path.relative_to(root).as_posix()] = path
+    return dict(sorted(files.items()))
+
+
+def fingerprint(name: str, files: Dict[str, Path], hashes: FileHashCache) -> str:
+    """Hash of everything a report depends on: input contents, builder code and templates"""
+    dependencies = [(relative, hashes.digest(path)) for relative, path in files.items()]
+    dependencies += [(path.name, hashes.digest(path)) for path in CODE_FILES]
+    dependencies += [(path.name, hashes.digest(path)) for path in sorted(TEMPLATE_DIR.glob('*.html'))]
+    return hashlib.sha256(json.dumps([name, dependencies]).encode()).hexdigest()
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, float):
+        value = round(value, 4)
+    return html.escape('' if value is None else str(value))
+
+
+def render_sections(sections: List[Dict[str, Any]]) -> str:
+    """Render summary tables; empty sections are omitted"""
+    rendered = []
+    for section in sections:
+        if not section['rows']:
+            continue
+        header = ''.join(f"<th>{_cell(column)}</th>" for column in section['columns'])
+        rows = '\n'.join(
+            '<tr>' + ''.join(f"<td>{_cell(value)}</td>" for value in row) + '</tr>'
+            for row in section['rows']
+        )
+        rendered.append(
+            f'            <div class="report-section">\n'
+            f'                <h2>{_cell(section["title"])}</h2>\n'
+            f'                <table>\n<thead><tr>{header}</tr></thead>\n<tbody>\n{rows}\n</tbody>\n</table>\n'
+            f'            </div>'
+        )
+    return '\n'.join(rendered) or '            <p>No result files found for this report yet.</p>'
+
+
+def render_cards(cards: List[Dict[str, Any]]) -> str:
+    return '\n'.join(
+        f'                <div class="stat-card"><h3>{_cell(card["value"])}</h3><p>{_cell(card["label"])}</p></div>'
+        for card in cards
+    )
+
+
+def build_report(name: str, files: Dict[str, str], output_dir: str) -> Dict[str, Any]:
+    """Build one report's JSON and HTML; runs in a worker process"""
+    started = time.perf_counter()
+    spec = REPORTS[name]
+    summary = getattr(report_builders, spec['builder'])({relative: Path(path) for relative, path in files.items()})
+    generated_at = datetime.now().isoformat(timespec='seconds')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(output_dir / f"{name}.json", 'w') as f:
+        json.dump({
+            'generated_at': generated_at,
+            'title': summary['title'],
+            'inputs': list(files),
+            'cards': summary['cards'],
+            **summary['data']
+        }, f, indent=2, default=str)
+
+    page = load_template('report.html').substitute(
+        title=html.escape(summary['title']),
+        generated_at=generated_at,
+        input_count=len(files),
+        cards=render_cards(summary['cards']),
+        sections=render_sections(summary['sections'])
+    )
+    (output_dir / f"{name}.html").write_text(page)
+
+    return {
+        'name': name,
+        'generated_at': generated_at,
+        'cards': summary['cards'],
+        'duration_seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+class ReportPipeline:
+    """Rebuilds the reports whose inputs changed since the last run, in parallel"""
+
+    def __init__(self, output_dir: Path = OUTPUT_DIR, root: Path = BASE_DIR, workers: int = None):
+        self.output_dir = Path(output_dir)
+        self.root = Path(root)
+        self.workers = workers or min(len(REPORTS), os.cpu_count() or 1)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+        self.hashes = FileHashCache(self.manifest.get('files'))
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'reports': {}, 'files': {}}
+
+    def _is_current(self, name: str, digest: str) -> bool:
+        entry = self.manifest.get('reports', {}).get(name)
+        return (
+            entry is not None and entry['fingerprint'] == digest
+            and (self.output_dir / f"{name}.json").exists() and (self.output_dir / f"{name}.html").exists()
+        )
+
+    def plan(self, names: List[str] = None, force: bool = False) -> Tuple[Dict[str, Any], List[str]]:
+        """Return the work for every selected report and the names that need rebuilding"""
+        work, stale = {}, []
+        for name in names or list(REPORTS):
+            files = input_files(REPORTS[name], self.root, self.output_dir)
+            digest = fingerprint(name, files, self.hashes)
+            work[name] = {'files': files, 'fingerprint': digest}
+            if force or not self._is_current(name, digest):
+                stale.append(name)
+        return work, stale
+
+    def run(self, names: List[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Build stale reports and refresh the index"""
+        started = time.perf_counter()
+        work, stale = self.plan(names, force)
+        built, failed = {}, {}
+
+        jobs = {name: {relative: str(path) for relative, path in work[name]['files'].items()} for name in stale}
+        if len(jobs) == 1 or self.workers == 1:
+            # A process pool costs more than it saves for a single report
+            for name, files in jobs.items():
+                try:
+                    built[name] = build_report(name, files, str(self.output_dir))
+                except Exception as e:
+                    failed[name] = str(e)
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+                futures = {
+                    executor.submit(build_report, name, files, str(self.output_dir)): name
+                    for name, files in jobs.items()
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        built[name] = future.result()
+                    except Exception as e:
+                        failed[name] = str(e)
+
+        reports = self.manifest.setdefault('reports', {})
+        for name, result in built.items():
+            reports[name] = {
+                'fingerprint': work[name]['fingerprint'],
+                'inputs': len(work[name]['files']),
+                'generated_at': result['generated_at'],
+                'cards': result['cards']
+            }
+        # Failed reports keep no fingerprint so the next run retries them
+        for name in failed:
+            reports.pop(name, None)
+
+        self.manifest['files'] = self.hashes.entries
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if built or not (self.output_dir / 'index.html').exists():
+            self.write_index()
+        self._save_manifest()
+
+        return {
+            'built': {name: result['duration_seconds'] for name, result in built.items()},
+            'up_to_date': sorted(set(work) - set(stale)),
+            'failed': failed,
+            'files_hashed': self.hashes.hashed,
+            'duration_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def write_index(self):
+        """Write an index page linking every built report"""
+        entries = []
+        for name, spec in REPORTS.items():
+            entry = self.manifest.get('reports', {}).get(name)
+            if entry is None:
+                continue
+            cards = ''.join(
+                f"<li>{html.escape(str(card['label']))}: <strong>{html.escape(str(card['value']))}</strong></li>"
+                for card in entry['cards']
+            )
+            entries.append(
+                f'                <div class="component-card">\n'
+                f'                    <div class="component-header"><h3 class="component-title">'
+                f'<a href="{name}.html">{html.escape(spec["title"])}</a></h3></div>\n'
+                f'                    <div class="component-body"><ul>{cards}</ul>'
+                f'<p><a href="{name}.json">JSON</a> &middot; {entry["generated_at"]}</p></div>\n'
+                f'                </div>'
+            )
+        page = load_template('index.html').substitute(
+            generated_at=datetime.now().isoformat(timespec='seconds'),
+            reports='\n'.join(entries)
+        )
+        (self.output_dir / 'index.html').write_text(page)
+
+    def _save_manifest(self):
+        temporary = self.manifest_path.with_suffix('.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        temporary.replace(self.manifest_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build migration reports from raw result files")
+    parser.add_argument('--only', action='append', choices=list(REPORTS), default=[],
+                        help="Build only this report; repeatable, all reports by default")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if no input changed")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR))
+    args = parser.parse_args()
+
+    pipeline = ReportPipeline(output_dir=Path(args.output_dir), workers=args.workers)
+    result = pipeline.run(args.only or None, force=args.force)
+
+    for name, seconds in result['built'].items():
+        print(f"Built {name} in {seconds:.2f}s")
+    for name in result['up_to_date']:
+        print(f"{name} is up to date")
+    for name, error in result['failed'].items():
+        print(f"Failed to build {name}: {error}")
+    print(f"Reports written to {pipeline.output_dir} in {result['duration_seconds']:.2f}s "
+          f"({result['files_hashed']} file(s) hashed)")
+
+    if result['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
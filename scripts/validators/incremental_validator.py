@@ -0,0 +1,346 @@
+"""
+Incremental delta validation of Laravel and Django tables using updated_at watermarks
+"""
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.database_config import DatabaseConfig, db_config
+from scripts.validators.json_field_comparator import canonicalize_json, _scalar
+
+# Rows are fetched by key in batches of this size when only one side reported a change
+KEY_BATCH_SIZE = 1000
+
+# Stands in for NULL when hashing rows; pandas hashes strings as C strings, so a
+# leading NUL byte would make NULL collide with the empty string
+NULL_SENTINEL = '\x1eNULL'
+
+
+def normalize_value(value: Any) -> Optional[str]:
+    """Normalize a driver value so MySQL and PostgreSQL representations compare equal"""
+    # None, NaN, NaT and pd.NA are all NULL; NaT is a datetime, so this must run first
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=' ')
+    if isinstance(value, Decimal):
+        return format(value.normalize(), 'f')
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (bytes, bytearray, dict, list)):
+        return canonicalize_json(value)
+    return str(value)
+
+
+def hash_rows(frame: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Hash the normalized values of each row into a single uint64"""
+    normalized = pd.DataFrame({
+        column: frame[column].map(normalize_value).fillna(NULL_SENTINEL) for column in columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def _side_column(columns: Dict[str, str], side: str, column: str) -> str:
+    """Translate a Laravel column name to the given side's column name"""
+    return columns.get(column, column) if side == 'django' else column
+
+
+class WatermarkStore:
+    """Persists per-table, per-side high-water marks and the last validation result"""
+
+    def __init__(self, path: str = "reports/migration-progress/watermarks.json"):
+        self.path = Path(path)
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, table_name: str) -> Dict[str, Any]:
+        """Return the stored state for a table"""
+        return self.data.get(table_name, {})
+
+    def update(self, table_name: str, state: Dict[str, Any]):
+        """Replace the stored state for a table and persist it"""
+        self.data[table_name] = state
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(self.data, f, indent=2, default=str)
+        temporary.replace(self.path)
+
+
+class IncrementalValidator:
+    """Validates only rows changed since the last run, with periodic full sweeps"""
+
+    def __init__(self, database: DatabaseConfig = None, store: WatermarkStore = None,
+                 full_sweep_every: int = 7, lookback_seconds: int = 300, chunk_size: int = 50000,
+                 max_examples: int = 10, config_path: str = "config/component_mapping.json",
+                 history_path: str = "reports/migration-progress/incremental_runs.jsonl"):
+        self.db = database or db_config
+        self.store = store or WatermarkStore()
+        self.full_sweep_every = full_sweep_every
+        # Rows committed late with an older updated_at are caught by re-reading a short window
+        self.lookback = timedelta(seconds=lookback_seconds)
+        self.chunk_size = chunk_size
+        self.max_examples = max_examples
+        self.history_path = Path(history_path)
+        self.table_mapping, self.field_mappings = self._load_mappings(Path(config_path))
+
+    def _load_mappings(self, config_path: Path) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+        """Load table and column mappings from the component configuration"""
+        try:
+            with open(config_path, 'r') as f:
+                data = json.load(f)
+            return data.get('database_mapping', {}), data.get('field_mappings', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}, {}
+
+    def _columns(self, table_name: str, django_table: str, key: str,
+                 watermark_column: str) -> Dict[str, str]:
+        """Return the Laravel to Django column mapping to compare"""
+        mapping = self.field_mappings.get(table_name)
+        if not mapping:
+            laravel_columns = [column['Field'] for column in self.db.get_laravel_table_info(table_name)]
+            django_columns = {
+                column['column_name'] for column in self.db.get_django_table_info(django_table)
+            }
+            mapping = {column: column for column in laravel_columns if column in django_columns}
+        mapping = dict(mapping)
+        mapping.setdefault(key, key)
+        mapping.setdefault(watermark_column, watermark_column)
+        return mapping
+
+    def validate_table(self, table_name: str, key: str = 'id', watermark_column: str = 'updated_at',
+                       full: bool = False) -> Dict[str, Any]:
+        """Validate a table incrementally, or fully when a sweep is due"""
+        django_table = self.table_mapping.get(table_name, table_name)
+        columns = self._columns(table_name, django_table, key, watermark_column)
+        state = self.store.get(table_name)
+        runs_since_full = state.get('runs_since_full', 0)
+        full = full or not state.get('laravel') or runs_since_full + 1 >= self.full_sweep_every
+
+        sides = {
+            'laravel': (self.db.laravel_connection, table_name, '`', list(columns)),
+            'django': (self.db.django_connection, django_table, '"', list(columns.values()))
+        }
+        start_time = time.perf_counter()
+        frames, watermarks, counts = {}, {}, {}
+
+        for side, (connection, table, quote, side_columns) in sides.items():
+            with connection() as conn:
+                cursor = conn.cursor()
+                if full:
+                    frame = self._fetch_all(
+                        cursor, table, side_columns, quote, _side_column(columns, side, key)
+                    )
+                else:
+                    frame = self._fetch_changed(
+                        cursor, table, side_columns, quote,
+                        _side_column(columns, side, key),
+                        _side_column(columns, side, watermark_column),
+                        state.get(side, {})
+                    )
+                cursor.execute(f"SELECT COUNT(*) FROM {quote}{table}{quote}")
+                counts[side] = cursor.fetchone()[0]
+            if side == 'django':
+                frame.columns = list(columns)
+            frames[side] = frame
+            watermarks[side] = self._watermark(frame, key, watermark_column, state.get(side, {}))
+
+        if not full:
+            self._fill_missing_rows(frames, sides, columns, key)
+
+        comparison = self._compare(frames['laravel'], frames['django'], list(columns), key)
+        result = {
+            'laravel_table': table_name,
+            'django_table': django_table,
+            'mode': 'full' if full else 'incremental',
+            'run_at': datetime.now().isoformat(),
+            'duration_seconds': round(time.perf_counter() - start_time, 3),
+            'row_counts': counts,
+            'count_match': counts['laravel'] == counts['django'],
+            **comparison
+        }
+
+        self.store.update(table_name, {
+            'laravel': watermarks['laravel'],
+            'django': watermarks['django'],
+            'runs_since_full': 0 if full else runs_since_full + 1,
+            'last_full_run': result['run_at'] if full else state.get('last_full_run'),
+            'last_result': {name: value for name, value in result.items() if name != 'examples'}
+        })
+        self._append_history(result)
+        return result
+
+    def _fetch_all(self, cursor, table: str, columns: List[str], quote: str, key: str) -> pd.DataFrame:
+        """Fetch a whole table with keyset pagination"""
+        frames, last_key = [], None
+        select = ', '.join(f'{quote}{column}{quote}' for column in columns)
+        while True:
+            query = f'SELECT {select} FROM {quote}{table}{quote}'
+            params = ()
+            if last_key is not None:
+                query += f' WHERE {quote}{key}{quote} > %s'
+                params = (last_key,)
+            query += f' ORDER BY {quote}{key}{quote} LIMIT {int(self.chunk_size)}'
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            frames.append(pd.DataFrame.from_records(rows, columns=columns))
+            last_key = _scalar(frames[-1][key].iloc[-1])
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def _fetch_changed(self, cursor, table: str, columns: List[str], quote: str, key: str,
+                       watermark_column: str, side_state: Dict[str, Any]) -> pd.DataFrame:
+        """Fetch rows updated since the stored watermark, or inserted past the stored key"""
+        select = ', '.join(f'{quote}{column}{quote}' for column in columns)
+        conditions, params = [], []
+        if side_state.get('updated_at'):
+            since = datetime.fromisoformat(side_state['updated_at']) - self.lookback
+            conditions.append(f'{quote}{watermark_column}{quote} >= %s')
+            params.append(since)
+        if side_state.get('key') is not None:
+            conditions.append(f'{quote}{key}{quote} > %s')
+            params.append(side_state['key'])
+
+        query = f'SELECT {select} FROM {quote}{table}{quote}'
+        if conditions:
+            query += ' WHERE ' + ' OR '.join(conditions)
+        cursor.execute(query, tuple(params))
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    def _fill_missing_rows(self, frames: Dict[str, pd.DataFrame], sides: Dict[str, Any],
+                           columns: Dict[str, str], key: str):
+        """Fetch rows by key on one side when only the other side reported them as changed"""
+        laravel_keys = set(frames['laravel'][key].map(_scalar))
+        django_keys = set(frames['django'][key].map(_scalar))
+        wanted = {'laravel': django_keys - laravel_keys, 'django': laravel_keys - django_keys}
+
+        for side, keys in wanted.items():
+            if not keys:
+                continue
+            connection, table, quote, side_columns = sides[side]
+            side_key = _side_column(columns, side, key)
+            select = ', '.join(f'{quote}{column}{quote}' for column in side_columns)
+            ordered = sorted(keys)
+            fetched = []
+            with connection() as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(ordered), KEY_BATCH_SIZE):
+                    batch = ordered[start:start + KEY_BATCH_SIZE]
+                    placeholders = ', '.join(['%s'] * len(batch))
+                    cursor.execute(
+                        f'SELECT {select} FROM {quote}{table}{quote} '
+                        f'WHERE {quote}{side_key}{quote} IN ({placeholders})',
+                        tuple(batch)
+                    )
+                    fetched.extend(cursor.fetchall())
+            if fetched:
+                extra = pd.DataFrame.from_records(fetched, columns=list(columns))
+                frames[side] = pd.concat([frames[side], extra], ignore_index=True)
+
+    def _watermark(self, frame: pd.DataFrame, key: str, watermark_column: str,
+                   previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Advance a side's high-water mark from the rows just fetched"""
+        watermark = dict(previous)
+        if not frame.empty:
+            max_key = _scalar(frame[key].max())
+            if watermark.get('key') is None or max_key > watermark['key']:
+                watermark['key'] = max_key
+            updated = pd.to_datetime(frame[watermark_column], errors='coerce', utc=True).max()
+            if pd.notna(updated):
+                updated = updated.tz_convert(None).to_pydatetime().isoformat()
+                if not watermark.get('updated_at') or updated > watermark['updated_at']:
+                    watermark['updated_at'] = updated
+        return watermark
+
+    def _compare(self, laravel_df: pd.DataFrame, django_df: pd.DataFrame,
+                 columns: List[str], key: str) -> Dict[str, Any]:
+        """Compare two frames row by row using hashed normalized values"""
+        laravel_df = laravel_df.drop_duplicates(subset=[key]).reset_index(drop=True)
+        django_df = django_df.drop_duplicates(subset=[key]).reset_index(drop=True)
+        value_columns = [column for column in columns if column != key]
+
+        laravel_hashes = pd.DataFrame({
+            key: laravel_df[key], 'hash': hash_rows(laravel_df, value_columns)
+        })
+        django_hashes = pd.DataFrame({
+            key: django_df[key], 'hash': hash_rows(django_df, value_columns)
+        })
+        merged = laravel_hashes.merge(
+            django_hashes, on=key, how='outer', suffixes=('_laravel', '_django'), indicator=True
+        )
+        side = merged['_merge'].to_numpy()
+        both = side == 'both'
+        mismatched = both & (merged['hash_laravel'].to_numpy() != merged['hash_django'].to_numpy())
+        mismatched_keys = [_scalar(value) for value in merged[key].to_numpy()[mismatched]]
+
+        examples = []
+        if mismatched_keys:
+            laravel_rows = laravel_df.set_index(key)
+            django_rows = django_df.set_index(key)
+            for row_key in mismatched_keys[:self.max_examples]:
+                laravel_row, django_row = laravel_rows.loc[row_key], django_rows.loc[row_key]
+                examples.append({
+                    key: row_key,
+                    'differences': {
+                        column: {
+                            'laravel': normalize_value(laravel_row[column]),
+                            'django': normalize_value(django_row[column])
+                        }
+                        for column in value_columns
+                        if normalize_value(laravel_row[column]) != normalize_value(django_row[column])
+                    }
+                })
+
+        return {
+            'rows_compared': int(both.sum()),
+            'mismatches': int(mismatched.sum()),
+            'missing_in_django': int((side == 'left_only').sum()),
+            'missing_in_laravel': int((side == 'right_only').sum()),
+            'examples': examples
+        }
+
+    def _append_history(self, result: Dict[str, Any]):
+        """Append a run result to the local history file"""
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_path, 'a') as f:
+            f.write(json.dumps(result, default=str) + '\n')
+
+    def validate_tables(self, table_names: List[str], full: bool = False) -> Dict[str, Any]:
+        """Validate several tables, recording errors per table"""
+        results = {}
+        for table_name in table_names:
+            try:
+                results[table_name] = self.validate_table(table_name, full=full)
+            except Exception as e:
+                results[table_name] = {'error': str(e)}
+        return results
+
+
+if __name__ == "__main__":
+    validator = IncrementalValidator()
+    tables = [name for name in sys.argv[1:] if not name.startswith('--')] or list(validator.table_mapping)
+    results = validator.validate_tables(tables, full='--full' in sys.argv)
+    print(json.dumps(results, indent=2, default=str))
@@ -0,0 +1,440 @@
+"""
+Set-based referential integrity, duplicate and required-data checks for the Laravel and Django databases
+"""
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Iterator
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.database_config import DatabaseConfig, db_config
+from scripts.validators.json_field_comparator import _scalar
+
+# Krayin foreign keys as (child table, column, parent table, parent column), in Laravel names
+KRAYIN_RELATIONSHIPS = [
+    ('leads', 'person_id', 'persons', 'id'),
+    ('leads', 'user_id', 'users', 'id'),
+    ('leads', 'lead_source_id', 'lead_sources', 'id'),
+    ('leads', 'lead_type_id', 'lead_types', 'id'),
+    ('leads', 'lead_pipeline_id', 'lead_pipelines', 'id'),
+    ('leads', 'lead_pipeline_stage_id', 'lead_pipeline_stages', 'id'),
+    ('persons', 'organization_id', 'organizations', 'id'),
+    ('persons', 'user_id', 'users', 'id'),
+    ('organizations', 'user_id', 'users', 'id'),
+    ('activities', 'user_id', 'users', 'id'),
+    ('quotes', 'person_id', 'persons', 'id'),
+    ('quotes', 'user_id', 'users', 'id'),
+    ('emails', 'person_id', 'persons', 'id'),
+    ('emails', 'lead_id', 'leads', 'id'),
+    ('lead_tags', 'lead_id', 'leads', 'id'),
+    ('lead_tags', 'tag_id', 'tags', 'id'),
+    ('lead_products', 'lead_id', 'leads', 'id'),
+    ('lead_products', 'product_id', 'products', 'id'),
+    ('lead_activities', 'lead_id', 'leads', 'id'),
+    ('lead_activities', 'activity_id', 'activities', 'id'),
+    ('lead_quotes', 'lead_id', 'leads', 'id'),
+    ('lead_quotes', 'quote_id', 'quotes', 'id'),
+    ('person_tags', 'person_id', 'persons', 'id'),
+    ('person_tags', 'tag_id', 'tags', 'id'),
+    ('person_activities', 'person_id', 'persons', 'id'),
+    ('person_activities', 'activity_id', 'activities', 'id'),
+]
+
+# Column sets expected to be unique per table; text is compared trimmed and case-folded
+KRAYIN_UNIQUE_KEYS = {
+    'users': [('email',)],
+    'tags': [('name',)],
+    'products': [('sku',)],
+    'lead_tags': [('lead_id', 'tag_id')],
+    'lead_products': [('lead_id', 'product_id')],
+    'lead_activities': [('lead_id', 'activity_id')],
+    'lead_quotes': [('lead_id', 'quote_id')],
+    'person_tags': [('person_id', 'tag_id')],
+    'person_activities': [('person_id', 'activity_id')],
+}
+
+# Columns that must hold a non-blank value
+KRAYIN_REQUIRED_FIELDS = {
+    'users': ['name', 'email'],
+    'persons': ['name'],
+    'organizations': ['name'],
+    'leads': ['title', 'lead_pipeline_stage_id'],
+    'products': ['name', 'sku'],
+    'quotes': ['subject'],
+    'activities': ['type'],
+    'tags': ['name'],
+}
+
+SIDES = ('laravel', 'django')
+
+# Headline counter of each check, compared between the two sides
+_SECTION_COUNTERS = {'orphans': 'orphaned_rows', 'duplicates': 'duplicate_rows', 'required': 'missing'}
+
+
+def key_array(values: List[Any]) -> np.ndarray:
+    """Pack key values into int64, hashing non-integer keys (UUIDs, codes) to 64-bit values"""
+    try:
+        return np.fromiter(values, dtype=np.int64, count=len(values))
+    except (TypeError, ValueError, OverflowError):
+        text = np.array([str(value) for value in values], dtype=object)
+        return pd.util.hash_array(text).view(np.int64)
+
+
+def find_orphans(child_keys: np.ndarray, parent_keys: np.ndarray) -> np.ndarray:
+    """Mask of child keys missing from the sorted, unique parent keys (binary search per key)"""
+    if not len(parent_keys):
+        return np.ones(len(child_keys), dtype=bool)
+    positions = np.searchsorted(parent_keys, child_keys)
+    positions[positions == len(parent_keys)] = 0
+    return parent_keys[positions] != child_keys
+
+
+def composite_hashes(rows: List[Tuple], columns: int) -> np.ndarray:
+    """Hash NULL-free composite key rows into uint64; text is trimmed and case-folded"""
+    frame = pd.DataFrame.from_records(rows, columns=range(columns))
+    for column in frame.columns:
+        if not pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = frame[column].map(_normalize_key_part)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def duplicate_groups(hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return hash values occurring more than once and how often they occur"""
+    values, counts = np.unique(hashes, return_counts=True)
+    repeated = counts > 1
+    return values[repeated], counts[repeated]
+
+
+def _normalize_key_part(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value).decode('utf-8', errors='replace')
+    if isinstance(value, str):
+        return value.strip().casefold()
+    return value
+
+
+class IntegrityChecker:
+    """Finds orphans, duplicates and missing required data with set operations on key arrays
+
+    The same checks run against either database, named in Laravel terms and translated
+    through the component mapping, so pre- and post-migration reports line up check by check.
+    """
+
+    def __init__(self, database: DatabaseConfig = None, chunk_size: int = 100000,
+                 max_examples: int = 10, config_path: str = "config/component_mapping.json",
+                 relationships: List[Tuple[str, str, str, str]] = None,
+                 unique_keys: Dict[str, List[Tuple[str, ...]]] = None,
+                 required_fields: Dict[str, List[str]] = None):
+        self.db = database or db_config
+        self.chunk_size = chunk_size
+        self.max_examples = max_examples
+        self.relationships = relationships if relationships is not None else KRAYIN_RELATIONSHIPS
+        self.unique_keys = unique_keys if unique_keys is not None else KRAYIN_UNIQUE_KEYS
+        self.required_fields = required_fields if required_fields is not None else KRAYIN_REQUIRED_FIELDS
+        self.table_mapping, self.field_mappings = self._load_mappings(Path(config_path))
+        # Sorted unique parent keys, loaded once per side and shared by every relationship
+        self._parent_keys = {}
+        self.results = {}
+
+    def _load_mappings(self, config_path: Path) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+        """Load table and column mappings from the component configuration"""
+        try:
+            with open(config_path, 'r') as f:
+                data = json.load(f)
+            return data.get('database_mapping', {}), data.get('field_mappings', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}, {}
+
+    def _table(self, side: str, table_name: str) -> str:
+        return self.table_mapping.get(table_name, table_name) if side == 'django' else table_name
+
+    def _column(self, side: str, table_name: str, column: str) -> str:
+        if side != 'django':
+            return column
+        return self.field_mappings.get(table_name, {}).get(column, column)
+
+    @staticmethod
+    def _quote(side: str, name: str) -> str:
+        return f'`{name}`' if side == 'laravel' else f'"{name}"'
+
+    @contextmanager
+    def _connection(self, side: str):
+        connection = self.db.laravel_connection if side == 'laravel' else self.db.django_connection
+        with connection() as conn:
+            yield conn
+
+    def _stream(self, side: str, query: str) -> Iterator[List[Tuple]]:
+        """Yield result rows in chunks from a server-side cursor, so only one chunk is held at a time"""
+        with self._connection(side) as conn:
+            if side == 'laravel':
+                cursor = conn.cursor(buffered=False)
+            else:
+                cursor = conn.cursor(name='integrity_keys')
+                cursor.itersize = self.chunk_size
+            try:
+                cursor.execute(query)
+                while True:
+                    rows = cursor.fetchmany(self.chunk_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cursor.close()
+
+    def load_keys(self, side: str, table_name: str, column: str) -> np.ndarray:
+        """Load the non-NULL values of one key column into an int64 array"""
+        quote = lambda name: self._quote(side, name)
+        name = self._column(side, table_name, column)
+        query = (f'SELECT {quote(name)} FROM {quote(self._table(side, table_name))} '
+                 f'WHERE {quote(name)} IS NOT NULL')
+        chunks = [key_array([row[0] for row in rows]) for rows in self._stream(side, query)]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def parent_keys(self, side: str, table_name: str, column: str) -> np.ndarray:
+        """Sorted unique keys of a referenced table, cached for the rest of the run"""
+        cache_key = (side, table_name, column)
+        if cache_key not in self._parent_keys:
+            self._parent_keys[cache_key] = np.unique(self.load_keys(side, table_name, column))
+        return self._parent_keys[cache_key]
+
+    def check_orphans(self, side: str, child_table: str, column: str,
+                      parent_table: str, parent_column: str = 'id') -> Dict[str, Any]:
+        """Count child rows whose foreign key has no parent row"""
+        start_time = time.perf_counter()
+        parents = self.parent_keys(side, parent_table, parent_column)
+        children = self.load_keys(side, child_table, column)
+        orphaned = find_orphans(children, parents)
+        missing = np.unique(children[orphaned])
+        return {
+            'rows_checked': int(len(children)),
+            'parent_keys': int(len(parents)),
+            'orphaned_rows': int(orphaned.sum()),
+            'missing_parent_keys': int(len(missing)),
+            'examples': [_scalar(value) for value in missing[:self.max_examples]],
+            'elapsed_seconds': round(time.perf_counter() - start_time, 3)
+        }
+
+    def check_duplicates(self, side: str, table_name: str, columns: Tuple[str, ...]) -> Dict[str, Any]:
+        """Count rows sharing a composite key, by hashing each key to one uint64"""
+        start_time = time.perf_counter()
+        quote = lambda name: self._quote(side, name)
+        names = [quote(self._column(side, table_name, column)) for column in columns]
+        # Like a unique index, keys with a NULL part never collide
+        query = (f'SELECT {", ".join(names)} FROM {quote(self._table(side, table_name))} '
+                 f'WHERE {" AND ".join(f"{name} IS NOT NULL" for name in names)}')
+
+        chunks = [composite_hashes(rows, len(columns)) for rows in self._stream(side, query)]
+        hashes = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.uint64)
+        del chunks
+        repeated, counts = duplicate_groups(hashes)
+
+        result = {
+            'rows_checked': int(len(hashes)),
+            'duplicate_groups': int(len(repeated)),
+            # Rows beyond the first of each group; what a cleanup would have to remove or merge
+            'duplicate_rows': int((counts - 1).sum()),
+            'examples': []
+        }
+        if len(repeated):
+            # Clean tables pay for one pass; a second one resolves example values for the report
+            largest = np.argsort(counts)[::-1][:self.max_examples]
+            result['examples'] = self._duplicate_examples(side, query, columns,
+                                                          repeated[largest], counts[largest])
+        result['elapsed_seconds'] = round(time.perf_counter() - start_time, 3)
+        return result
+
+    def _duplicate_examples(self, side: str, query: str, columns: Tuple[str, ...],
+                            hashes: np.ndarray, counts: np.ndarray) -> List[Dict[str, Any]]:
+        """Look up the key values behind the largest duplicate groups"""
+        values = {}
+        for rows in self._stream(side, query):
+            chunk_hashes = composite_hashes(rows, len(columns))
+            for index in np.flatnonzero(np.isin(chunk_hashes, hashes)):
+                values.setdefault(int(chunk_hashes[index]), rows[index])
+        return [
+            {
+                'key': dict(zip(columns, (_normalize_key_part(value) for value in values.get(int(digest), ())))),
+                'rows': int(count)
+            }
+            for digest, count in zip(hashes, counts)
+        ]
+
+    def check_required(self, side: str, table_name: str, columns: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Count NULL and blank values of required columns in a single aggregate query"""
+        start_time = time.perf_counter()
+        quote = lambda name: self._quote(side, name)
+        text_type = 'CHAR' if side == 'laravel' else 'TEXT'
+        aggregates = []
+        for column in columns:
+            name = quote(self._column(side, table_name, column))
+            aggregates.append(f'SUM(CASE WHEN {name} IS NULL THEN 1 ELSE 0 END)')
+            aggregates.append(f"SUM(CASE WHEN TRIM(CAST({name} AS {text_type})) = '' THEN 1 ELSE 0 END)")
+        query = f'SELECT COUNT(*), {", ".join(aggregates)} FROM {quote(self._table(side, table_name))}'
+
+        with self._connection(side) as conn:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            row = cursor.fetchone()
+
+        total = int(row[0])
+        elapsed = round(time.perf_counter() - start_time, 3)
+        results = {}
+        for index, column in enumerate(columns):
+            nulls, blanks = (int(value or 0) for value in row[1 + 2 * index:3 + 2 * index])
+            results[column] = {
+                'rows_checked': total,
+                'null': nulls,
+                'blank': blanks,
+                'missing': nulls + blanks,
+                'elapsed_seconds': elapsed
+            }
+        return results
+
+    def check_side(self, side: str, tables: List[str] = None) -> Dict[str, Any]:
+        """Run every configured check against one database; failures are recorded per check"""
+        if side not in SIDES:
+            raise ValueError(f"Unknown side '{side}', expected one of {SIDES}")
+        selected = set(tables) if tables else None
+        start_time = time.perf_counter()
+        report = {'orphans': {}, 'duplicates': {}, 'required': {}}
+
+        for child_table, column, parent_table, parent_column in self.relationships:
+            if selected and child_table not in selected:
+                continue
+            name = f"{child_table}.{column} -> {parent_table}.{parent_column}"
+            try:
+                report['orphans'][name] = self.check_orphans(side, child_table, column,
+                                                             parent_table, parent_column)
+            except Exception as e:
+                report['orphans'][name] = {'error': str(e)}
+
+        for table_name, keys in self.unique_keys.items():
+            if selected and table_name not in selected:
+                continue
+            for columns in keys:
+                name = f"{table_name}({', '.join(columns)})"
+                try:
+                    report['duplicates'][name] = self.check_duplicates(side, table_name, tuple(columns))
+                except Exception as e:
+                    report['duplicates'][name] = {'error': str(e)}
+
+        for table_name, columns in self.required_fields.items():
+            if selected and table_name not in selected:
+                continue
+            try:
+                for column, result in self.check_required(side, table_name, columns).items():
+                    report['required'][f"{table_name}.{column}"] = result
+            except Exception as e:
+                for column in columns:
+                    report['required'][f"{table_name}.{column}"] = {'error': str(e)}
+
+        report['summary'] = self._summarize(report)
+        report['summary']['elapsed_seconds'] = round(time.perf_counter() - start_time, 3)
+        self.results[side] = report
+        # Key arrays can be large; keep them only for the side being checked
+        self._parent_keys.clear()
+        return report
+
+    def _summarize(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        summary = {'errors': 0}
+        for section, counter in _SECTION_COUNTERS.items():
+            checks = report[section].values()
+            summary[counter] = sum(check.get(counter, 0) for check in checks)
+            summary['errors'] += sum(1 for check in checks if 'error' in check)
+        return summary
+
+    def compare_sides(self, laravel: Dict[str, Any] = None, django: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Line up both sides check by check
+
+        Django counts above Laravel's are regressions; a check that errored on
+        either side cannot be compared and is listed under failures instead.
+        """
+        laravel = laravel or self.results.get('laravel', {})
+        django = django or self.results.get('django', {})
+        comparison = {}
+        regressions = []
+        failures = []
+        for section, counter in _SECTION_COUNTERS.items():
+            names = list(dict.fromkeys(list(laravel.get(section, {})) + list(django.get(section, {}))))
+            rows = {}
+            for name in names:
+                checks = {'laravel': laravel.get(section, {}).get(name, {}),
+                          'django': django.get(section, {}).get(name, {})}
+                before = checks['laravel'].get(counter)
+                after = checks['django'].get(counter)
+                rows[name] = {
+                    'laravel': before,
+                    'django': after,
+                    'delta': after - before if before is not None and after is not None else None
+                }
+                errored = [side for side in SIDES if 'error' in checks[side]]
+                if errored:
+                    rows[name]['errors'] = {side: checks[side]['error'] for side in errored}
+                    failures.append(f"{section}: {name} (failed on {', '.join(errored)})")
+                elif rows[name]['delta'] is not None and rows[name]['delta'] > 0:
+                    regressions.append(f"{section}: {name}")
+            comparison[section] = rows
+        comparison['regressions'] = regressions
+        comparison['failures'] = failures
+        return comparison
+
+    def export_report(self, output_path: str = "reports/migration-progress/integrity_report.json"):
+        """Export integrity results, with a side-by-side comparison when both sides ran"""
+        report_data = {
+            'generated_at': datetime.now().isoformat(),
+            'sides': self.results
+        }
+        if all(side in self.results for side in SIDES):
+            report_data['comparison'] = self.compare_sides()
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_file, 'w') as f:
+            json.dump(report_data, f, indent=2, default=str)
+
+        print(f"Report exported to: {output_file}")
+        return report_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check orphans, duplicates and missing required data")
+    parser.add_argument('tables', nargs='*', help="Laravel table names; all configured tables by default")
+    parser.add_argument('--side', action='append', choices=SIDES, default=[],
+                        help="Database to check; repeatable, both by default")
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    parser.add_argument('--output', default="reports/migration-progress/integrity_report.json")
+    args = parser.parse_args()
+
+    checker = IntegrityChecker(chunk_size=args.chunk_size)
+    errors = 0
+    for side in args.side or list(SIDES):
+        summary = checker.check_side(side, args.tables or None)['summary']
+        errors += summary['errors']
+        print(f"{side}: {summary['orphaned_rows']} orphaned, {summary['duplicate_rows']} duplicate, "
+              f"{summary['missing']} missing required value(s), {summary['errors']} failed check(s) "
+              f"in {summary['elapsed_seconds']:.1f}s")
+
+    report = checker.export_report(args.output)
+    regressions = report.get('comparison', {}).get('regressions', [])
+    for name in regressions:
+        print(f"Introduced by the migration: {name}")
+    for name in report.get('comparison', {}).get('failures', []):
+        print(f"Could not compare: {name}")
+    # A check that failed to run proves nothing either way
+    if regressions or errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
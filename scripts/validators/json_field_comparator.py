@@ -0,0 +1,294 @@
+"""
+Vectorized comparison of Krayin JSON columns between Laravel and Django databases
+"""
+import json
+import sys
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Allow running as a script from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from config.database_config import DatabaseConfig, db_config
+
+# Krayin columns stored as JSON, keyed by Laravel table name
+KRAYIN_JSON_FIELDS = {
+    'persons': ['emails', 'contact_numbers'],
+    'organizations': ['address'],
+    'emails': ['from', 'cc', 'bcc'],
+    'quotes': ['billing_address', 'shipping_address'],
+}
+
+# Shared codec instances; json.dumps() with non-default options builds a new encoder per call
+_DECODER = json.JSONDecoder()
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def canonicalize_json(value: Any) -> Optional[str]:
+    """Return a canonical JSON string (sorted keys, no whitespace) for a column value"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    if isinstance(value, str):
+        try:
+            value = _DECODER.decode(value)
+        except ValueError:
+            # Not valid JSON - compare the raw text as-is
+            return value
+    return _ENCODER.encode(value)
+
+
+def canonicalize_series(values: pd.Series) -> pd.Series:
+    """Canonicalize a series, parsing each distinct raw value only once"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    distinct = [canonicalize_json(value) for value in np.asarray(uniques, dtype=object)]
+    canonical = np.array(distinct + [None], dtype=object)
+    # NULLs are coded -1 and pick up the trailing None
+    return pd.Series(canonical[codes], index=values.index)
+
+
+def hash_series(values: pd.Series) -> np.ndarray:
+    """Hash a series of strings into a uint64 array, keeping NULL distinct from ''"""
+    hashes = pd.util.hash_pandas_object(values.fillna(''), index=False).to_numpy()
+    return np.where(values.isna().to_numpy(), np.uint64(0), hashes)
+
+
+def _as_text(value: Any) -> Optional[str]:
+    """Normalize a raw driver value to text without parsing it"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    if isinstance(value, (dict, list)):
+        # psycopg2 decodes json/jsonb columns into Python objects
+        return _ENCODER.encode(value)
+    if value is None or pd.isna(value):
+        return None
+    return _ENCODER.encode(value)
+
+
+def _scalar(value: Any) -> Any:
+    """Convert NumPy scalars to Python values the database drivers can adapt"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class JsonFieldComparator:
+    """Compares JSON columns between Laravel MySQL and Django PostgreSQL in chunks"""
+
+    def __init__(self, database: DatabaseConfig = None, chunk_size: int = 50000,
+                 max_examples: int = 5, config_path: str = "config/component_mapping.json",
+                 snapshots=None):
+        self.db = database or db_config
+        self.snapshots = snapshots
+        self.chunk_size = chunk_size
+        self.max_examples = max_examples
+        self.table_mapping = self._load_table_mapping(Path(config_path))
+        self.results = {}
+
+    def _load_table_mapping(self, config_path: Path) -> Dict[str, str]:
+        """Load Laravel to Django table name mapping"""
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f).get('database_mapping', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return {}
+
+    def compare_table(self, table_name: str, fields: List[str] = None,
+                      key: str = 'id') -> Dict[str, Any]:
+        """Compare the JSON fields of a table on both databases"""
+        fields = fields or KRAYIN_JSON_FIELDS.get(table_name)
+        if not fields:
+            raise ValueError(f"No JSON fields configured for table '{table_name}'")
+
+        django_table = self.table_mapping.get(table_name, table_name)
+        stats = {field: self._empty_field_stats() for field in fields}
+        total_rows = 0
+        start_time = time.perf_counter()
+
+        with ExitStack() as stack:
+            django_cursor = stack.enter_context(self.db.django_connection()).cursor()
+            laravel_cursor = None
+            if self.snapshots is None:
+                laravel_cursor = stack.enter_context(self.db.laravel_connection()).cursor()
+            last_key = None
+
+            for laravel_df in self._laravel_chunks(laravel_cursor, table_name, fields, key):
+                upper_key = _scalar(laravel_df[key].iloc[-1])
+                django_df = self._fetch_chunk(
+                    django_cursor, django_table, fields, key, '"', last_key, upper_key=upper_key
+                )
+                self._merge_stats(stats, self.compare_frames(laravel_df, django_df, fields, key))
+
+                total_rows += len(laravel_df)
+                last_key = upper_key
+
+            # Rows that only exist on the Django side past the last Laravel key
+            trailing_query = f'SELECT COUNT(*) FROM "{django_table}"'
+            if last_key is not None:
+                trailing_query += f' WHERE "{key}" > %s'
+            django_cursor.execute(trailing_query, (last_key,) if last_key is not None else None)
+            trailing = django_cursor.fetchone()[0]
+            for field_stats in stats.values():
+                field_stats['missing_in_laravel'] += trailing
+
+        elapsed = time.perf_counter() - start_time
+        for field_stats in stats.values():
+            compared = field_stats['rows_compared']
+            field_stats['mismatch_rate'] = (
+                round(field_stats['mismatches'] / compared, 6) if compared else 0.0
+            )
+
+        result = {
+            'laravel_table': table_name,
+            'django_table': django_table,
+            'rows_scanned': total_rows,
+            'duration_seconds': round(elapsed, 3),
+            'rows_per_second': round(total_rows / elapsed, 1) if elapsed > 0 else None,
+            'fields': stats
+        }
+        self.results[table_name] = result
+        return result
+
+    def compare_all(self) -> Dict[str, Any]:
+        """Compare every configured Krayin JSON field"""
+        for table_name, fields in KRAYIN_JSON_FIELDS.items():
+            try:
+                self.compare_table(table_name, fields)
+            except Exception as e:
+                self.results[table_name] = {'error': str(e)}
+        return self.results
+
+    def _laravel_chunks(self, cursor, table_name: str, fields: List[str], key: str):
+        """Yield key-ordered Laravel chunks, from a local snapshot when one is configured"""
+        if self.snapshots is not None:
+            snapshot = self.snapshots.snapshot(table_name, key)
+            yield from snapshot.iter_frames([key] + fields, self.chunk_size)
+            return
+
+        last_key = None
+        while True:
+            chunk = self._fetch_chunk(
+                cursor, table_name, fields, key, '`', last_key, limit=self.chunk_size
+            )
+            if chunk.empty:
+                return
+            last_key = _scalar(chunk[key].iloc[-1])
+            yield chunk
+
+    def _fetch_chunk(self, cursor, table_name: str, fields: List[str], key: str, quote: str,
+                     lower_key=None, upper_key=None, limit: int = None) -> pd.DataFrame:
+        """Fetch one keyset-paginated chunk of key and JSON columns"""
+        columns = ', '.join(f'{quote}{name}{quote}' for name in [key] + fields)
+        conditions, params = [], []
+        if lower_key is not None:
+            conditions.append(f'{quote}{key}{quote} > %s')
+            params.append(lower_key)
+        if upper_key is not None:
+            conditions.append(f'{quote}{key}{quote} <= %s')
+            params.append(upper_key)
+
+        query = f'SELECT {columns} FROM {quote}{table_name}{quote}'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += f' ORDER BY {quote}{key}{quote}'
+        if limit:
+            query += f' LIMIT {int(limit)}'
+
+        cursor.execute(query, tuple(params))
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=[key] + fields)
+
+    def compare_frames(self, laravel_df: pd.DataFrame, django_df: pd.DataFrame,
+                       fields: List[str], key: str = 'id') -> Dict[str, Any]:
+        """Compare JSON fields of two aligned frames using hashed canonical forms"""
+        merged = laravel_df.merge(
+            django_df, on=key, how='outer', suffixes=('_laravel', '_django'), indicator=True
+        )
+        side = merged['_merge'].to_numpy()
+        both = side == 'both'
+        keys = merged[key].to_numpy()
+        stats = {}
+
+        for field in fields:
+            laravel_raw = merged[f'{field}_laravel'].map(_as_text)
+            django_raw = merged[f'{field}_django'].map(_as_text)
+
+            # Byte-identical values need no parsing; only canonicalize the rest
+            differs = both & (hash_series(laravel_raw) != hash_series(django_raw))
+            candidates = np.flatnonzero(differs)
+            mismatched = np.zeros(len(merged), dtype=bool)
+
+            if len(candidates):
+                laravel_canonical = canonicalize_series(laravel_raw.iloc[candidates])
+                django_canonical = canonicalize_series(django_raw.iloc[candidates])
+                mismatched[candidates] = (
+                    hash_series(laravel_canonical) != hash_series(django_canonical)
+                )
+
+            examples = [
+                {
+                    key: _scalar(keys[index]),
+                    'laravel': canonicalize_json(laravel_raw.iat[index]),
+                    'django': canonicalize_json(django_raw.iat[index])
+                }
+                for index in np.flatnonzero(mismatched)[:self.max_examples]
+            ]
+
+            stats[field] = {
+                'rows_compared': int(both.sum()),
+                'mismatches': int(mismatched.sum()),
+                'missing_in_django': int((side == 'left_only').sum()),
+                'missing_in_laravel': int((side == 'right_only').sum()),
+                'examples': examples
+            }
+
+        return stats
+
+    def _empty_field_stats(self) -> Dict[str, Any]:
+        """Initial accumulator for a single field"""
+        return {
+            'rows_compared': 0,
+            'mismatches': 0,
+            'missing_in_django': 0,
+            'missing_in_laravel': 0,
+            'examples': []
+        }
+
+    def _merge_stats(self, totals: Dict[str, Any], chunk_stats: Dict[str, Any]):
+        """Accumulate per-chunk statistics into the running totals"""
+        for field, chunk in chunk_stats.items():
+            field_totals = totals[field]
+            for counter in ('rows_compared', 'mismatches', 'missing_in_django', 'missing_in_laravel'):
+                field_totals[counter] += chunk[counter]
+            room = self.max_examples - len(field_totals['examples'])
+            if room > 0:
+                field_totals['examples'].extend(chunk['examples'][:room])
+
+    def export_report(self, output_path: str = "reports/migration-progress/json_field_comparison.json"):
+        """Export comparison results to a report"""
+        report_data = {
+            'generated_at': datetime.now().isoformat(),
+            'chunk_size': self.chunk_size,
+            'tables': self.results
+        }
+
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_file, 'w') as f:
+            json.dump(report_data, f, indent=2, default=str)
+
+        print(f"Report exported to: {output_file}")
+
+
+if __name__ == "__main__":
+    comparator = JsonFieldComparator()
+    comparator.compare_all()
+    comparator.export_report()
@@ -0,0 +1,367 @@
+"""
+Local columnar snapshots of Laravel source tables for repeated comparisons
+"""
+import hashlib
+import json
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.database_config import DatabaseConfig, db_config
+from config.test_settings import TEST_SETTINGS
+
+# MySQL column types stored as fixed-width numeric arrays; everything else
+# (including DECIMAL, to keep exact values) is stored as UTF-8 text
+INTEGER_TYPES = {'TINY', 'SHORT', 'LONG', 'LONGLONG', 'INT24', 'YEAR', 'BIT'}
+FLOAT_TYPES = {'FLOAT', 'DOUBLE'}
+DATETIME_TYPES = {'DATETIME', 'TIMESTAMP', 'DATE', 'NEWDATE'}
+
+MANIFEST_FILE = 'manifest.json'
+
+# Retired snapshots are kept this long for readers that may still have them mapped
+STALE_SNAPSHOT_SECONDS = 3600
+
+
+def _column_kind(type_code) -> str:
+    """Map a mysql.connector type code to a snapshot column kind"""
+    from mysql.connector import FieldType
+
+    type_name = FieldType.get_info(type_code)
+    if type_name in INTEGER_TYPES:
+        return 'int'
+    if type_name in FLOAT_TYPES:
+        return 'float'
+    if type_name in DATETIME_TYPES:
+        return 'datetime'
+    return 'text'
+
+
+class StringColumn:
+    """Memory-mapped UTF-8 text column stored as a byte buffer plus offsets"""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, valid: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+        self.valid = valid
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if not self.valid[index]:
+            return None
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:end].tobytes().decode('utf-8')
+
+    def raw(self, index: int) -> memoryview:
+        """Return the undecoded bytes of a value without copying"""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return memoryview(self.data[start:end])
+
+    def to_numpy(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Decode a range of values into a new object array (one Python str per value)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return np.array([self[index] for index in range(start, stop)], dtype=object)
+
+
+class TableSnapshot:
+    """Read-only view over a snapshot directory
+
+    Numeric columns are served as read-only memmaps; text columns are memory-mapped
+    too but decoded into Python strings when read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / MANIFEST_FILE, 'r') as f:
+            self.manifest = json.load(f)
+        self.table = self.manifest['table']
+        self.rows = self.manifest['rows']
+        self.columns = [column['name'] for column in self.manifest['columns']]
+        self._kinds = {column['name']: column['kind'] for column in self.manifest['columns']}
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _memmap(self, name: str, dtype, length: int) -> np.ndarray:
+        """Open a column file as a read-only memory map"""
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path / name, dtype=dtype, mode='r', shape=(length,))
+
+    def column(self, name: str):
+        """Return a column as a memory-mapped array or StringColumn"""
+        if name not in self._cache:
+            kind = self._kinds[name]
+            valid = self._memmap(f'{name}.valid', np.bool_, self.rows)
+            if kind == 'text':
+                offsets = self._memmap(f'{name}.offsets', np.int64, self.rows + 1)
+                data_length = int(offsets[-1]) if len(offsets) else 0
+                data = self._memmap(f'{name}.data', np.uint8, data_length)
+                self._cache[name] = StringColumn(data, offsets, valid)
+            else:
+                values = self._memmap(f'{name}.values', self._dtype(kind), self.rows)
+                self._cache[name] = (values, valid)
+        return self._cache[name]
+
+    def _dtype(self, kind: str):
+        return {'int': np.int64, 'float': np.float64, 'datetime': 'datetime64[us]'}[kind]
+
+    def values(self, name: str, start: int = 0, stop: int = None):
+        """Return a range of a column with NULLs as None/NaN/NaT"""
+        column = self.column(name)
+        if isinstance(column, StringColumn):
+            return column.to_numpy(start, stop)
+
+        values, valid = column
+        chunk, mask = values[start:stop], valid[start:stop]
+        if mask.all():
+            return chunk
+        if self._kinds[name] == 'int':
+            return pd.arrays.IntegerArray(np.asarray(chunk), ~np.asarray(mask))
+        if self._kinds[name] == 'datetime':
+            return np.where(mask, chunk, np.datetime64('NaT'))
+        return np.where(mask, chunk, np.nan)
+
+    def to_frame(self, columns: List[str] = None, start: int = 0, stop: int = None) -> pd.DataFrame:
+        """Materialize a row range as a DataFrame"""
+        columns = columns or self.columns
+        return pd.DataFrame({name: self.values(name, start, stop) for name in columns})
+
+    def iter_frames(self, columns: List[str] = None, chunk_size: int = 50000) -> Iterator[pd.DataFrame]:
+        """Iterate over the snapshot in primary-key ordered chunks"""
+        for start in range(0, self.rows, chunk_size):
+            yield self.to_frame(columns, start, start + chunk_size)
+
+
+class _ColumnWriter:
+    """Appends chunks of one column to its snapshot files"""
+
+    def __init__(self, path: Path, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.valid_file = open(path / f'{name}.valid', 'wb')
+        if kind == 'text':
+            self.data_file = open(path / f'{name}.data', 'wb')
+            self.offsets_file = open(path / f'{name}.offsets', 'wb')
+            self.offset = 0
+            np.array([0], dtype=np.int64).tofile(self.offsets_file)
+        else:
+            self.values_file = open(path / f'{name}.values', 'wb')
+
+    def write(self, values: List[Any]):
+        valid = np.array([value is not None for value in values], dtype=np.bool_)
+        valid.tofile(self.valid_file)
+
+        if self.kind == 'text':
+            encoded = [self._encode(value) for value in values]
+            lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+            offsets = self.offset + np.cumsum(lengths)
+            self.data_file.write(b''.join(encoded))
+            offsets.tofile(self.offsets_file)
+            if len(offsets):
+                self.offset = int(offsets[-1])
+        elif self.kind == 'int':
+            np.array([0 if value is None else int(value) for value in values],
+                     dtype=np.int64).tofile(self.values_file)
+        elif self.kind == 'float':
+            np.array([np.nan if value is None else float(value) for value in values],
+                     dtype=np.float64).tofile(self.values_file)
+        else:
+            np.array([np.datetime64('NaT') if value is None else np.datetime64(value, 'us')
+                      for value in values], dtype='datetime64[us]').tofile(self.values_file)
+
+    def _encode(self, value: Any) -> bytes:
+        if value is None:
+            return b''
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value)
+        if isinstance(value, (dict, list)):
+            return json.dumps(value).encode('utf-8')
+        return str(value).encode('utf-8')
+
+    def close(self):
+        self.valid_file.close()
+        if self.kind == 'text':
+            self.data_file.close()
+            self.offsets_file.close()
+        else:
+            self.values_file.close()
+
+
+class TableSnapshotCache:
+    """Exports Laravel tables once and serves them from local memory-mapped snapshots"""
+
+    def __init__(self, database: DatabaseConfig = None, root: str = None, chunk_size: int = 50000,
+                 use_checksum: bool = False):
+        self.db = database or db_config
+        self.root = Path(root or TEST_SETTINGS['DATABASE']['SNAPSHOT_PATH'])
+        self.chunk_size = chunk_size
+        # CHECKSUM TABLE reads every row on InnoDB; the watermarks' COUNT(*) still scans the
+        # smallest index on each verified snapshot() call, so pass verify=False to skip it
+        self.use_checksum = use_checksum
+        self._snapshots = {}
+
+    def source_fingerprint(self, table_name: str, key: str = 'id') -> Dict[str, Any]:
+        """Describe the current state of a source table (row count, watermarks, checksum)"""
+        with self.db.laravel_connection() as conn:
+            cursor = conn.cursor(buffered=True)
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = 'updated_at'",
+                (table_name,)
+            )
+            has_updated_at = cursor.fetchone()[0] > 0
+
+            watermark_columns = f"COUNT(*), MAX(`{key}`)"
+            if has_updated_at:
+                watermark_columns += ", MAX(`updated_at`)"
+            cursor.execute(f"SELECT {watermark_columns} FROM `{table_name}`")
+            watermark = cursor.fetchone()
+
+            checksum = None
+            if self.use_checksum:
+                cursor.execute(f"CHECKSUM TABLE `{table_name}`")
+                checksum = cursor.fetchone()[1]
+
+        return {
+            'rows': int(watermark[0]),
+            'max_key': None if watermark[1] is None else str(watermark[1]),
+            'max_updated_at': str(watermark[2]) if has_updated_at and watermark[2] else None,
+            'checksum': None if checksum is None else str(checksum)
+        }
+
+    def _snapshot_path(self, table_name: str, fingerprint: Dict[str, Any]) -> Path:
+        digest = hashlib.sha1(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+        return self.root / table_name / digest[:16]
+
+    def snapshot(self, table_name: str, key: str = 'id', refresh: bool = False,
+                 verify: bool = True) -> TableSnapshot:
+        """Return a snapshot of a table, exporting it if the source changed or none exists
+
+        With verify=False an existing snapshot is served without contacting the
+        source database at all.
+        """
+        if not verify and not refresh:
+            snapshot = self._snapshots.get(table_name) or self._latest_on_disk(table_name)
+            if snapshot is not None:
+                self._snapshots[table_name] = snapshot
+                return snapshot
+
+        fingerprint = self.source_fingerprint(table_name, key)
+        path = self._snapshot_path(table_name, fingerprint)
+        if refresh or not (path / MANIFEST_FILE).exists():
+            self._export(table_name, key, fingerprint, path)
+
+        snapshot = TableSnapshot(path)
+        self._snapshots[table_name] = snapshot
+        return snapshot
+
+    def _latest_on_disk(self, table_name: str) -> Optional[TableSnapshot]:
+        """Load the most recent complete snapshot of a table, if any"""
+        manifests = sorted(
+            (manifest for manifest in (self.root / table_name).glob(f'*/{MANIFEST_FILE}')
+             if not manifest.parent.name.startswith('.')),
+            key=lambda manifest: manifest.stat().st_mtime
+        )
+        return TableSnapshot(manifests[-1].parent) if manifests else None
+
+    def _export(self, table_name: str, key: str, fingerprint: Dict[str, Any], path: Path):
+        """Stream a table from the Laravel database into columnar snapshot files"""
+        # Every xdist worker may export the same table at once, so each one
+        # stages privately and publishes with an atomic rename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f'.{path.name}.', suffix='.partial', dir=path.parent))
+        try:
+            rows, writers = self._write_columns(table_name, key, staging)
+            manifest = {
+                'table': table_name,
+                'key': key,
+                'rows': rows,
+                'source': fingerprint,
+                'created_at': datetime.now().isoformat(),
+                'columns': [{'name': writer.name, 'kind': writer.kind} for writer in writers]
+            }
+            with open(staging / MANIFEST_FILE, 'w') as f:
+                json.dump(manifest, f, indent=2)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._publish(staging, path)
+        print(f"Snapshot of {table_name} exported to: {path} ({rows} rows)")
+
+    def _write_columns(self, table_name: str, key: str, staging: Path):
+        """Write every column of a table into the staging directory"""
+        rows = 0
+        with self.db.laravel_connection() as conn:
+            # Unbuffered cursor streams rows instead of loading the table client-side
+            cursor = conn.cursor(buffered=False)
+            cursor.execute(f"SELECT * FROM `{table_name}` ORDER BY `{key}`")
+            writers = [
+                _ColumnWriter(staging, description[0], _column_kind(description[1]))
+                for description in cursor.description
+            ]
+            try:
+                while True:
+                    chunk = cursor.fetchmany(self.chunk_size)
+                    if not chunk:
+                        break
+                    for index, writer in enumerate(writers):
+                        writer.write([row[index] for row in chunk])
+                    rows += len(chunk)
+            finally:
+                for writer in writers:
+                    writer.close()
+        return rows, writers
+
+    @staticmethod
+    def _publish(staging: Path, path: Path):
+        """Move a finished staging directory into place and retire superseded snapshots"""
+        if (path / MANIFEST_FILE).exists():
+            # A refresh replaces the snapshot; move the old one aside so the rename can land
+            TableSnapshotCache._retire(path)
+        try:
+            staging.rename(path)
+        except OSError:
+            # Another worker published the same fingerprint first; its copy is identical
+            shutil.rmtree(staging, ignore_errors=True)
+
+        # Older snapshots of this table are superseded by the new fingerprint, but readers
+        # may still have them mapped, so they are retired rather than deleted. Other
+        # dot-prefixed directories are exports still in progress and belong to their workers.
+        expired = time.time() - STALE_SNAPSHOT_SECONDS
+        for entry in path.parent.iterdir():
+            if entry == path or not entry.is_dir():
+                continue
+            if not entry.name.startswith('.'):
+                TableSnapshotCache._retire(entry)
+            elif entry.name.endswith('.stale') and entry.stat().st_mtime < expired:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @staticmethod
+    def _retire(path: Path):
+        """Move a snapshot into a dot-prefixed .stale directory next to it"""
+        retired = Path(tempfile.mkdtemp(prefix=f'.{path.name}.', suffix='.stale', dir=path.parent))
+        try:
+            path.rename(retired / path.name)
+        except FileNotFoundError:
+            # Retired concurrently by another worker
+            retired.rmdir()
+
+    def clear(self, table_name: str = None):
+        """Remove snapshots for one table or all tables"""
+        target = self.root / table_name if table_name else self.root
+        if target.exists():
+            shutil.rmtree(target)
+        if table_name:
+            self._snapshots.pop(table_name, None)
+        else:
+            self._snapshots.clear()
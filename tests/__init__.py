@@ -1,9 +1,20 @@
 """
 Package initialization for tests module
 """
+import importlib
 
-# Test module imports
-from .base_migration_test import BaseMigrationTest
-from .conftest import MigrationAssertions
+# Test module exports are imported on first access, so importing a light
+# helper such as tests.api_diff does not load Selenium
+_EXPORTS = {
+    'BaseMigrationTest': 'tests.base_migration_test',
+    'MigrationAssertions': 'tests.conftest',
+    'HttpParityTest': 'tests.http_parity'
+}
 
-__all__ = ['BaseMigrationTest', 'MigrationAssertions']
+__all__ = ['BaseMigrationTest', 'MigrationAssertions', 'HttpParityTest']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,353 @@
+"""
+Adaptive page waits: an in-page readiness hook awaited in one async script call, with per-route learned timeouts
+"""
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.test_settings import TEST_SETTINGS
+
+ADAPTIVE_SETTINGS = TEST_SETTINGS['SELENIUM']['ADAPTIVE_WAIT']
+
+# Tracks readyState, in-flight fetch/XHR requests and the last DOM mutation; idempotent per document
+READINESS_SCRIPT = """
+(function () {
+    if (window.__migrationReadiness) { return; }
+    var state = {pending: 0, lastActivity: Date.now(), completeAt: null, unloading: false};
+    window.__migrationReadiness = state;
+    function touch() { state.lastActivity = Date.now(); }
+    function settle() { state.pending = Math.max(0, state.pending - 1); touch(); }
+    function markComplete() {
+        if (document.readyState === 'complete' && state.completeAt === null) { state.completeAt = Date.now(); }
+    }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            touch();
+            var request;
+            try {
+                request = originalFetch.apply(this, arguments);
+            } catch (e) {
+                settle();
+                throw e;
+            }
+            request.then(settle, settle);
+            return request;
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        touch();
+        this.addEventListener('loadend', settle);
+        try {
+            return originalSend.apply(this, arguments);
+        } catch (e) {
+            this.removeEventListener('loadend', settle);
+            settle();
+            throw e;
+        }
+    };
+    new MutationObserver(touch).observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    document.addEventListener('readystatechange', markComplete);
+    window.addEventListener('pagehide', function () { state.unloading = true; });
+    window.addEventListener('beforeunload', function () { state.unloading = true; });
+    markComplete();
+})();
+"""
+
+# Resolves once the page is complete, idle on the network and free of mutations for the quiet period
+WAIT_SCRIPT = """
+var quietPeriod = arguments[0], timeout = arguments[1], interval = arguments[2], fromStart = arguments[3];
+var done = arguments[arguments.length - 1];
+""" + READINESS_SCRIPT + """
+var state = window.__migrationReadiness, started = Date.now();
+(function check() {
+    var now = Date.now();
+    // After a click the old document may look settled until the navigation starts
+    var quietFor = now - (fromStart ? Math.max(state.lastActivity, started) : state.lastActivity);
+    var ready = !state.unloading && document.readyState === 'complete'
+        && state.pending === 0 && quietFor >= quietPeriod;
+    if (ready || now - started >= timeout) {
+        done({
+            ready: ready,
+            elapsed: now - started,
+            readyState: document.readyState,
+            completeAfter: state.completeAt === null ? null : Math.max(0, state.completeAt - started),
+            pending: state.pending,
+            unloading: state.unloading
+        });
+        return;
+    }
+    setTimeout(check, interval);
+})();
+"""
+
+# Extra script timeout on top of the in-page one, so the page always answers first
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# A document replaced mid-wait is awaited again in the new one, at most this many times
+MAX_DOCUMENT_SWITCHES = 5
+
+# Routes need this many settle times before their learned timeout replaces the default
+MIN_SAMPLES = 3
+
+_ID_SEGMENT_RE = re.compile(r'^(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{24,})$', re.IGNORECASE)
+
+
+def route_key(url: str) -> str:
+    """Host and path of a URL with id-like segments collapsed, so /leads/7 and /leads/9 share timings"""
+    parsed = urlparse(url)
+    segments = ['{id}' if _ID_SEGMENT_RE.match(segment) else segment for segment in parsed.path.split('/')]
+    return f"{parsed.netloc}{'/'.join(segments) or '/'}"
+
+
+class RouteTimeouts:
+    """Wait timeouts per route, learned from how long its pages took to settle in earlier waits"""
+
+    def __init__(self, path: Path = None, history: int = None, factor: float = None,
+                 minimum: float = None, maximum: float = None):
+        self.path = Path(path or ADAPTIVE_SETTINGS['TIMEOUTS_FILE'])
+        self.history = history or ADAPTIVE_SETTINGS['HISTORY']
+        self.factor = factor or ADAPTIVE_SETTINGS['TIMEOUT_FACTOR']
+        self.minimum = minimum or ADAPTIVE_SETTINGS['MIN_TIMEOUT']
+        self.maximum = maximum or TEST_SETTINGS['SELENIUM']['EXPLICIT_WAIT']
+        self.samples = self._load()
+        self._recorded = {}
+
+    def _load(self) -> Dict[str, List[float]]:
+        try:
+            with open(self.path, 'r') as f:
+                return {route: entry['samples'] for route, entry in json.load(f).get('routes', {}).items()}
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return {}
+
+    def timeout(self, route: Optional[str]) -> float:
+        """Learned timeout for a route; unknown routes get the explicit wait"""
+        samples = self.samples.get(route) if route else None
+        if not samples or len(samples) < MIN_SAMPLES:
+            return self.maximum
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return min(self.maximum, max(self.minimum, p95 * self.factor))
+
+    def record(self, route: Optional[str], seconds: float):
+        if not route:
+            return
+        seconds = round(seconds, 3)
+        self.samples[route] = (self.samples.get(route, []) + [seconds])[-self.history:]
+        self._recorded.setdefault(route, []).append(seconds)
+
+    def save(self):
+        """Merge this worker's new samples into the shared file; concurrent workers may drop a few"""
+        if not self._recorded:
+            return
+        merged = self._load()
+        for route, samples in self._recorded.items():
+            merged[route] = (merged.get(route, []) + samples)[-self.history:]
+        self.samples = merged
+        self._recorded = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temporary, 'w') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'routes': {
+                    route: {'samples': samples, 'timeout': round(self.timeout(route), 3)}
+                    for route, samples in sorted(merged.items())
+                }
+            }, f, indent=2)
+        temporary.replace(self.path)
+
+
+class AdaptiveWait:
+    """Waits for pages to settle with a single execute_async_script call per document"""
+
+    def __init__(self, timeouts: RouteTimeouts = None, quiet_period_ms: int = None,
+                 poll_interval_ms: int = None):
+        self.timeouts = timeouts or RouteTimeouts()
+        self.quiet_period_ms = quiet_period_ms if quiet_period_ms is not None else \
+            ADAPTIVE_SETTINGS['QUIET_PERIOD_MS']
+        self.poll_interval_ms = poll_interval_ms or ADAPTIVE_SETTINGS['POLL_INTERVAL_MS']
+        self._prepared = weakref.WeakSet()
+        self._routes = weakref.WeakKeyDictionary()
+        # Concurrent page captures wait on two drivers from two threads
+        self._lock = threading.Lock()
+        self.stats = {
+            'waits': 0,
+            'settled': 0,
+            # Complete pages that never went quiet (polling, animations) within their timeout
+            'unsettled': 0,
+            'extended': 0,
+            'document_switches': 0,
+            'wait_seconds': 0.0
+        }
+
+    def prepare(self, driver):
+        """Drop the implicit wait and register the readiness hook for every new document"""
+        with self._lock:
+            if driver in self._prepared:
+                return
+            self._prepared.add(driver)
+        driver.implicitly_wait(0)
+        driver.set_script_timeout(self.timeouts.maximum + SCRIPT_TIMEOUT_MARGIN)
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Local Chromium: the hook sees requests the page starts before the first wait
+            try:
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': READINESS_SCRIPT})
+            except WebDriverException as e:
+                print(f"Could not register readiness hook, installing it per wait: {e}")
+
+    def navigated(self, driver, url: str):
+        """Remember the route a driver was sent to, selecting the timeout of its next wait"""
+        self._routes[driver] = route_key(url)
+
+    def wait(self, driver, url: str = None, after_action: bool = False,
+             timeout: float = None) -> Dict[str, Any]:
+        """Wait until the page is complete, has no requests in flight and stopped mutating
+
+        A complete page that never goes quiet is accepted once its learned timeout passes;
+        one that is still loading gets the full explicit wait before TimeoutException.
+        """
+        self.prepare(driver)
+        if url:
+            self.navigated(driver, url)
+        route = self._routes.get(driver)
+        # A click may land on another route; its settle time belongs to the destination
+        rekey = after_action and not url
+        ceiling = timeout or self.timeouts.maximum
+        limit = min(ceiling, self.timeouts.timeout(route))
+        raised_script_timeout = ceiling > self.timeouts.maximum
+        if raised_script_timeout:
+            driver.set_script_timeout(ceiling + SCRIPT_TIMEOUT_MARGIN)
+        started = time.perf_counter()
+        switches = 0
+        self._count('waits')
+
+        try:
+            while True:
+                remaining = limit - (time.perf_counter() - started)
+                try:
+                    result = driver.execute_async_script(
+                        WAIT_SCRIPT, self.quiet_period_ms, max(0, int(remaining * 1000)),
+                        self.poll_interval_ms, after_action
+                    )
+                except TimeoutException:
+                    raise
+                except WebDriverException:
+                    # The document was replaced while waiting; wait again in the new one
+                    switches += 1
+                    self._count('document_switches')
+                    if switches > MAX_DOCUMENT_SWITCHES or remaining <= 0:
+                        raise
+                    after_action = False
+                    continue
+
+                if rekey and (result['ready'] or result['readyState'] == 'complete'):
+                    route = self._landed_route(driver, route)
+                if result['ready']:
+                    self._count('settled')
+                    self._record(route, time.perf_counter() - started)
+                    return result
+                if result['readyState'] == 'complete' and not result['unloading']:
+                    self._count('unsettled')
+                    # Load time, not the wait, so the route keeps a timeout that cuts noisy pages short
+                    if result['completeAfter'] is not None:
+                        self._record(route, result['completeAfter'] / 1000)
+                    return result
+                if limit < ceiling:
+                    self._count('extended')
+                    limit = ceiling
+                    continue
+                raise TimeoutException(
+                    f"Page did not finish loading within {ceiling}s "
+                    f"(readyState={result['readyState']}, pending requests={result['pending']})"
+                )
+        finally:
+            self._count('wait_seconds', time.perf_counter() - started)
+            if raised_script_timeout:
+                driver.set_script_timeout(self.timeouts.maximum + SCRIPT_TIMEOUT_MARGIN)
+
+    def _landed_route(self, driver, route: Optional[str]) -> Optional[str]:
+        """Re-key a driver to the route it is on now, keeping the old one if the URL is unreadable"""
+        try:
+            route = route_key(driver.current_url)
+        except WebDriverException:
+            return route
+        self._routes[driver] = route
+        return route
+
+    def _count(self, name: str, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _record(self, route: Optional[str], seconds: float):
+        with self._lock:
+            self.timeouts.record(route, seconds)
+
+    def report(self) -> Dict[str, Any]:
+        waits = self.stats['waits']
+        return {
+            **self.stats,
+            'wait_seconds': round(self.stats['wait_seconds'], 3),
+            'mean_wait_seconds': round(self.stats['wait_seconds'] / waits, 4) if waits else 0.0,
+            'routes_learned': sum(1 for samples in self.timeouts.samples.values() if len(samples) >= MIN_SAMPLES)
+        }
+
+
+# One engine per process; each pytest-xdist worker is its own process
+_adaptive_wait = None
+
+
+def get_adaptive_wait() -> AdaptiveWait:
+    """Return this worker's adaptive wait engine, creating it on first use"""
+    global _adaptive_wait
+    if _adaptive_wait is None:
+        _adaptive_wait = AdaptiveWait()
+    return _adaptive_wait
+
+
+def wait_for_page_ready(driver, url: str = None, after_action: bool = False, timeout: float = None):
+    """Wait for a page with the adaptive engine, or by polling readyState when it is disabled"""
+    if ADAPTIVE_SETTINGS['ENABLED']:
+        return get_adaptive_wait().wait(driver, url, after_action=after_action, timeout=timeout)
+    WebDriverWait(driver, timeout or TEST_SETTINGS['SELENIUM']['EXPLICIT_WAIT']).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+    return None
+
+
+def close_adaptive_wait(report_dir: Path = None):
+    """Persist learned route timeouts and write this worker's wait statistics"""
+    global _adaptive_wait
+    if _adaptive_wait is None:
+        return
+
+    _adaptive_wait.timeouts.save()
+    report_dir = Path(report_dir or TEST_SETTINGS['REPORTING']['REPORT_PATH'])
+    report_dir.mkdir(parents=True, exist_ok=True)
+    worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+    with open(report_dir / f"adaptive_wait_{worker}.json", 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(),
+            'worker': worker,
+            **_adaptive_wait.report()
+        }, f, indent=2)
+
+    print(f"Adaptive waits ({worker}): {_adaptive_wait.stats['waits']} in "
+          f"{_adaptive_wait.stats['wait_seconds']:.1f}s")
+    _adaptive_wait = None
@@ -0,0 +1,238 @@
+"""
+Recursive structural diff of Laravel and Django JSON API responses
+"""
+import math
+import re
+from fnmatch import fnmatchcase
+from itertools import zip_longest
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+
+from config.test_settings import TEST_SETTINGS
+
+_INDEX_RE = re.compile(r'\[\d+\]')
+
+_MISSING = object()
+
+# Brackets in ignore patterns are literal array subscripts, not fnmatch character classes
+_LITERAL_BRACKETS = str.maketrans({'[': '[[]', ']': '[]]'})
+
+
+def json_type(value) -> str:
+    """Name the JSON type of a decoded value; ints and floats are both numbers"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, dict):
+        return 'object'
+    return type(value).__name__
+
+
+def _preview(value, limit: int = 80):
+    """Shorten a value for the diff report"""
+    if value is _MISSING:
+        return '<missing>'
+    if isinstance(value, (dict, list)):
+        return f"<{json_type(value)} of {len(value)}>"
+    if isinstance(value, str) and len(value) > limit:
+        return value[:limit] + '...'
+    return value
+
+
+class JsonStructureDiff:
+    """Compares decoded JSON documents by type, shape and value, reporting differences by path
+
+    Paths look like ``$.data[3].email``. Ignore patterns are shell-style globs
+    matched against the path and against its index-free form (``$.data[*].email``),
+    so ``*.updated_at`` skips every ``updated_at`` at any depth. Brackets in a
+    pattern match literally; ``[*]`` stands for any index, not a character class.
+    """
+
+    def __init__(self, ignore_paths: List[str] = None, numeric_tolerance: float = None,
+                 relative_tolerance: float = 0.0, compare_values: bool = True,
+                 max_differences: int = 100):
+        settings = TEST_SETTINGS['API']['DIFF']
+        self.ignore_paths = list(settings['IGNORE_PATHS'] if ignore_paths is None else ignore_paths)
+        self.numeric_tolerance = settings['NUMERIC_TOLERANCE'] if numeric_tolerance is None else numeric_tolerance
+        self.relative_tolerance = relative_tolerance
+        self.compare_values = compare_values
+        self.max_differences = max_differences
+
+    def is_ignored(self, path: str) -> bool:
+        generic = _INDEX_RE.sub('[*]', path)
+        for pattern in self.ignore_paths:
+            pattern = pattern.translate(_LITERAL_BRACKETS)
+            if fnmatchcase(path, pattern) or fnmatchcase(generic, pattern):
+                return True
+        return False
+
+    def _numbers_match(self, laravel, django) -> bool:
+        if isinstance(laravel, float) and isinstance(django, float) and math.isnan(laravel) and math.isnan(django):
+            return True
+        return math.isclose(laravel, django, rel_tol=self.relative_tolerance, abs_tol=self.numeric_tolerance)
+
+    def walk(self, laravel, django, path: str = '$') -> Iterator[Dict[str, Any]]:
+        """Yield every difference between two documents, depth first"""
+        if self.is_ignored(path):
+            return
+        if laravel is _MISSING or django is _MISSING:
+            yield {
+                'path': path,
+                'kind': 'missing' if django is _MISSING else 'extra',
+                'laravel': _preview(laravel),
+                'django': _preview(django)
+            }
+            return
+
+        laravel_type, django_type = json_type(laravel), json_type(django)
+        if laravel_type != django_type:
+            yield {'path': path, 'kind': 'type', 'laravel': laravel_type, 'django': django_type}
+            return
+
+        if laravel_type == 'object':
+            for key in sorted(laravel.keys() | django.keys()):
+                yield from self.walk(
+                    laravel.get(key, _MISSING), django.get(key, _MISSING), f"{path}.{key}"
+                )
+        elif laravel_type == 'array':
+            if len(laravel) != len(django):
+                yield {'path': path, 'kind': 'length', 'laravel': len(laravel), 'django': len(django)}
+            for index, (laravel_item, django_item) in enumerate(zip(laravel, django)):
+                yield from self.walk(laravel_item, django_item, f"{path}[{index}]")
+            # Elements present on one side only are still checked against the other side's schema
+            longer, shorter = (laravel, django) if len(laravel) > len(django) else (django, laravel)
+            if len(longer) != len(shorter) and shorter:
+                yield from self._schema_drift(
+                    longer[len(shorter):], shorter[0], path, len(shorter), longer is laravel
+                )
+        elif self.compare_values:
+            if laravel_type == 'number':
+                equal = self._numbers_match(laravel, django)
+            else:
+                equal = laravel == django
+            if not equal:
+                yield {'path': path, 'kind': 'value', 'laravel': _preview(laravel), 'django': _preview(django)}
+
+    def _schema_drift(self, items: List[Any], reference, path: str, offset: int,
+                      items_are_laravel: bool) -> Iterator[Dict[str, Any]]:
+        """Compare only the shape of unmatched array elements against a reference element"""
+        reference_schema = schema(reference)
+        for index, item in enumerate(items, start=offset):
+            item_schema = schema(item)
+            if item_schema == reference_schema:
+                continue
+            yield {
+                'path': f"{path}[{index}]",
+                'kind': 'schema',
+                'laravel': item_schema if items_are_laravel else reference_schema,
+                'django': reference_schema if items_are_laravel else item_schema
+            }
+
+    def diff(self, laravel, django) -> Dict[str, Any]:
+        """Diff two documents, keeping at most max_differences detailed entries"""
+        report = _new_report()
+        for difference in self.walk(laravel, django):
+            _add_difference(report, difference, self.max_differences)
+        return report
+
+    def diff_items(self, laravel_items: Iterable[Any], django_items: Iterable[Any]) -> Dict[str, Any]:
+        """Diff two item streams pairwise without holding either list in memory
+
+        Meant for paginated list endpoints: pass iter_paginated() for each app.
+        """
+        report = _new_report()
+        report['items_compared'] = 0
+        counts = {'laravel': 0, 'django': 0}
+
+        for index, (laravel_item, django_item) in enumerate(
+                zip_longest(laravel_items, django_items, fillvalue=_MISSING)):
+            report['items_compared'] += 1
+            counts['laravel'] += laravel_item is not _MISSING
+            counts['django'] += django_item is not _MISSING
+            for difference in self.walk(laravel_item, django_item, f"$[{index}]"):
+                _add_difference(report, difference, self.max_differences)
+
+        report['item_counts'] = counts
+        return report
+
+
+def schema(value) -> Any:
+    """Reduce a value to its shape: object keys mapped to types, arrays to their element schemas"""
+    value_type = json_type(value)
+    if value_type == 'object':
+        return {key: schema(item) for key, item in sorted(value.items())}
+    if value_type == 'array':
+        element_schemas = []
+        for item in value:
+            item_schema = schema(item)
+            if item_schema not in element_schemas:
+                element_schemas.append(item_schema)
+        return element_schemas
+    return value_type
+
+
+def _new_report() -> Dict[str, Any]:
+    return {'equal': True, 'difference_count': 0, 'by_kind': {}, 'differences': [], 'truncated': False}
+
+
+def _add_difference(report: Dict[str, Any], difference: Dict[str, Any], max_differences: int):
+    report['equal'] = False
+    report['difference_count'] += 1
+    report['by_kind'][difference['kind']] = report['by_kind'].get(difference['kind'], 0) + 1
+    if len(report['differences']) < max_differences:
+        report['differences'].append(difference)
+    else:
+        report['truncated'] = True
+
+
+def format_differences(report: Dict[str, Any]) -> str:
+    """Render a diff report as one line per difference"""
+    lines = [
+        f"{difference['path']}: {difference['kind']} "
+        f"laravel={difference['laravel']!r} django={difference['django']!r}"
+        for difference in report['differences']
+    ]
+    if report['truncated']:
+        lines.append(f"... {report['difference_count'] - len(report['differences'])} more")
+    return "\n".join(lines)
+
+
+def _page_items(payload) -> List[Any]:
+    """Items of one page from a Laravel paginator, API resource or DRF response"""
+    if isinstance(payload, list):
+        return payload
+    for key in ('data', 'results'):
+        if isinstance(payload.get(key), list):
+            return payload[key]
+    raise ValueError(f"Unrecognised paginated payload with keys: {sorted(payload)}")
+
+
+def _next_page_url(payload) -> Optional[str]:
+    """Next page link from a Laravel paginator, API resource or DRF response"""
+    if not isinstance(payload, dict):
+        return None
+    links = payload.get('links')
+    if isinstance(links, dict) and links.get('next'):
+        return links['next']
+    return payload.get('next_page_url') or payload.get('next')
+
+
+def iter_paginated(session, url: str, params: Dict[str, Any] = None,
+                   timeout: int = None, max_pages: int = None) -> Iterator[Any]:
+    """Yield list items page by page, following the API's next links"""
+    timeout = timeout or TEST_SETTINGS['API']['TIMEOUT']
+    pages = 0
+    while url and (max_pages is None or pages < max_pages):
+        response = session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        payload = response.json()
+        pages += 1
+        yield from _page_items(payload)
+        # Next links already carry the query string
+        url, params = _next_page_url(payload), None
@@ -4,6 +4,7 @@ Base test class for migration testing with common utilities and setup
 import os
 import pytest
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -13,6 +14,33 @@ from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from config.test_settings import TEST_SETTINGS, TEST_DATA
 from config.migration_config import MigrationConfig
+from tests.adaptive_wait import get_adaptive_wait, wait_for_page_ready
+from tests.driver_pool import get_driver_pool
+from tests.http_parity import element_comparison
+from tests.phase_profiler import phase, profiled
+from tests.session_cache import get_session_cache
+
+# Collects text, presence and attributes for every selector in one round trip
+EXTRACT_ELEMENTS_SCRIPT = """
+var selectors = arguments[0], attributes = arguments[1] || [], result = {};
+Object.keys(selectors).forEach(function (name) {
+    var element = document.querySelector(selectors[name]);
+    if (!element) {
+        result[name] = {present: false, text: null, attributes: {}};
+        return;
+    }
+    var values = {};
+    attributes.forEach(function (attribute) {
+        values[attribute] = element.getAttribute(attribute);
+    });
+    result[name] = {
+        present: true,
+        text: (element.innerText || '').trim(),
+        attributes: values
+    };
+});
+return result;
+"""
 
 class BaseMigrationTest:
     """Base class for all migration tests"""
@@ -26,22 +54,40 @@ class BaseMigrationTest:
         
     def setup_method(self, method):
         """Setup method called before each test"""
-        self.driver = self._create_driver()
-        self.wait = WebDriverWait(
-            self.driver, 
-            self.test_settings['SELENIUM']['EXPLICIT_WAIT']
-        )
-        self.driver.implicitly_wait(
-            self.test_settings['SELENIUM']['IMPLICIT_WAIT']
-        )
-        self.driver.set_window_size(*self.test_settings['SELENIUM']['WINDOW_SIZE'])
+        self._test_failed = False
+        self.driver_pool = None
+        with phase('driver'):
+            if self.test_settings['SELENIUM']['DRIVER_POOL']['ENABLED']:
+                self.driver_pool = get_driver_pool(self._create_driver)
+                self.driver = self.driver_pool.acquire()
+            else:
+                self.driver = self._create_driver()
+            self.wait = WebDriverWait(
+                self.driver, 
+                self.test_settings['SELENIUM']['EXPLICIT_WAIT']
+            )
+            if self.test_settings['SELENIUM']['ADAPTIVE_WAIT']['ENABLED']:
+                # No implicit wait: absent elements fail at once, page waits are event driven
+                get_adaptive_wait().prepare(self.driver)
+            else:
+                self.driver.implicitly_wait(
+                    self.test_settings['SELENIUM']['IMPLICIT_WAIT']
+                )
+            self.driver.set_window_size(*self.test_settings['SELENIUM']['WINDOW_SIZE'])
         
     def teardown_method(self, method):
         """Cleanup method called after each test"""
         if self.driver:
-            if hasattr(self, '_test_failed') and self._test_failed:
-                self._take_screenshot(method.__name__)
-            self.driver.quit()
+            failed = getattr(self, '_test_failed', False)
+            if failed:
+                self._take_screenshot(getattr(method, '__name__', 'base_test'))
+            with phase('driver'):
+                if self.driver_pool is not None:
+                    # Sessions from failed tests are not trusted for reuse
+                    self.driver_pool.release(self.driver, failed=failed)
+                else:
+                    self.driver.quit()
+            self.driver = None
     
     def _create_driver(self):
         """Create and configure WebDriver instance"""
@@ -81,6 +127,7 @@ class BaseMigrationTest:
         else:
             raise ValueError(f"Unsupported browser: {browser}")
     
+    @profiled('screenshot')
     def _take_screenshot(self, test_name):
         """Take screenshot on test failure"""
         if self.test_settings['REPORTING']['SCREENSHOT_ON_FAILURE']:
@@ -92,47 +139,77 @@ class BaseMigrationTest:
             self.driver.save_screenshot(str(screenshot_path))
             print(f"Screenshot saved: {screenshot_path}")
     
+    @profiled('navigation')
     def navigate_to_laravel(self, path=""):
         """Navigate to Laravel application"""
         url = f"{self.config.LARAVEL_APP_URL}{path}"
         self.driver.get(url)
+        self._navigated(self.driver, url)
         
+    @profiled('navigation')
     def navigate_to_django(self, path=""):
         """Navigate to Django application"""
         url = f"{self.config.DJANGO_APP_URL}{path}"
         self.driver.get(url)
+        self._navigated(self.driver, url)
     
+    def _navigated(self, driver, url):
+        """Let the next page wait use the timeout learned for this route"""
+        if self.test_settings['SELENIUM']['ADAPTIVE_WAIT']['ENABLED']:
+            get_adaptive_wait().navigated(driver, url)
+    
+    @profiled('login')
     def login_laravel(self, email=None, password=None):
         """Login to Laravel application"""
         email = email or self.test_data['USERS']['admin']['email']
         password = password or self.test_data['USERS']['admin']['password']
         
         self.navigate_to_laravel('/login')
+        self.wait_for_page_load()
         self.driver.find_element(By.NAME, 'email').send_keys(email)
         self.driver.find_element(By.NAME, 'password').send_keys(password)
         self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]').click()
+        self.wait_for_page_load(after_action=True)
         
+    @profiled('login')
     def login_django(self, email=None, password=None):
         """Login to Django application"""
         email = email or self.test_data['USERS']['admin']['email']
         password = password or self.test_data['USERS']['admin']['password']
         
         self.navigate_to_django('/login/')
+        self.wait_for_page_load()
         self.driver.find_element(By.NAME, 'email').send_keys(email)
         self.driver.find_element(By.NAME, 'password').send_keys(password)
         self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]').click()
+        self.wait_for_page_load(after_action=True)
     
+    @profiled('login')
+    def login_as(self, app, role='admin', path='', driver=None):
+        """Open a page as an authenticated user by injecting cached session cookies"""
+        driver = driver or self.driver
+        session_cache = get_session_cache()
+        if not session_cache.inject_into_driver(driver, app, role, path):
+            # The server rejected the cached session; log in again and retry once
+            if not session_cache.inject_into_driver(driver, app, role, path):
+                pytest.fail(f"Could not open {app}{path or '/'} as {role}: "
+                            f"a freshly obtained session was also redirected to the login page")
+    
+    @profiled('wait')
     def wait_for_element(self, locator, timeout=None):
         """Wait for element to be present and visible"""
         timeout = timeout or self.test_settings['SELENIUM']['EXPLICIT_WAIT']
         wait = WebDriverWait(self.driver, timeout)
         return wait.until(EC.visibility_of_element_located(locator))
     
-    def wait_for_page_load(self):
-        """Wait for page to load completely"""
-        self.wait.until(
-            lambda driver: driver.execute_script("return document.readyState") == "complete"
-        )
+    @profiled('wait')
+    def wait_for_page_load(self, after_action=False):
+        """Wait for page to load completely, including its XHR/fetch calls and DOM updates
+        
+        Pass after_action=True after a click or submit, so a navigation that has not
+        started yet is not mistaken for a settled page.
+        """
+        wait_for_page_ready(self.driver, after_action=after_action)
     
     def compare_page_elements(self, laravel_path, django_path, elements_to_compare):
         """Compare specific elements between Laravel and Django pages"""
@@ -169,10 +246,78 @@ class BaseMigrationTest:
             }
         }
     
+    def extract_elements(self, elements_to_extract, attributes=None, driver=None):
+        """Extract text, presence and attributes of all selectors in a single script call"""
+        driver = driver or self.driver
+        return driver.execute_script(
+            EXTRACT_ELEMENTS_SCRIPT, elements_to_extract, list(attributes or [])
+        )
+    
+    def _capture_page(self, driver, url, elements_to_compare, attributes, session=None):
+        """Load a page in the given driver and extract the requested elements
+        
+        With session=(app, role, path) the page is opened through the session cache,
+        so a driver that has never logged in is authenticated first.
+        """
+        if session is not None:
+            self.login_as(*session, driver=driver)
+        else:
+            with phase('navigation'):
+                driver.get(url)
+        with phase('wait'):
+            wait_for_page_ready(driver, url)
+        return self.extract_elements(elements_to_compare, attributes, driver)
+    
+    def compare_page_elements_concurrent(self, laravel_path, django_path, elements_to_compare,
+                                         attributes=None, role='admin'):
+        """Compare elements with both pages loaded concurrently in two browser sessions
+        
+        Every selector is resolved in one execute_script call per page, so absent
+        elements cost nothing instead of the implicit wait. Both sessions are logged
+        in as role from the session cache before their pages load, so the two sides
+        always compare the same user.
+        """
+        with phase('driver'):
+            if self.driver_pool is not None:
+                django_driver = self.driver_pool.acquire()
+            else:
+                django_driver = self._create_driver()
+            # Same viewport on both sides so responsive layouts render alike
+            django_driver.set_window_size(*self.test_settings['SELENIUM']['WINDOW_SIZE'])
+        failed = False
+        
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                laravel_future = executor.submit(
+                    self._capture_page, self.driver,
+                    f"{self.config.LARAVEL_APP_URL}{laravel_path}", elements_to_compare, attributes,
+                    session=('laravel', role, laravel_path)
+                )
+                django_future = executor.submit(
+                    self._capture_page, django_driver,
+                    f"{self.config.DJANGO_APP_URL}{django_path}", elements_to_compare, attributes,
+                    session=('django', role, django_path)
+                )
+                laravel_details = laravel_future.result()
+                django_details = django_future.result()
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with phase('driver'):
+                if self.driver_pool is not None:
+                    self.driver_pool.release(django_driver, failed=failed)
+                else:
+                    django_driver.quit()
+        
+        return element_comparison(laravel_details, django_details, elements_to_compare)
+    
     def measure_page_load_time(self, url):
         """Measure page load time"""
         start_time = time.time()
-        self.driver.get(url)
+        with phase('navigation'):
+            self.driver.get(url)
+            self._navigated(self.driver, url)
         self.wait_for_page_load()
         end_time = time.time()
         return end_time - start_time
@@ -12,7 +12,14 @@ sys.path.insert(0, str(project_root))
 
 from config.test_settings import TEST_SETTINGS
 from config.migration_config import MigrationConfig
-from tests.base_migration_test import BaseMigrationTest
+from config.database_config import get_db_config
+from tests.driver_pool import close_driver_pool
+
+# Duration-aware xdist scheduling and --changed-since test selection; per-test phase profiling
+pytest_plugins = ['tests.scheduling_plugin', 'tests.phase_profiler']
+
+# Matches pytest's *_test.py pattern but only holds the Selenium base class
+collect_ignore = ['base_migration_test.py']
 
 @pytest.fixture(scope="session")
 def test_config():
@@ -27,21 +34,37 @@ def migration_config():
 @pytest.fixture(scope="function")
 def base_test():
     """Provide base test instance with setup and teardown"""
+    # Selenium is only loaded once a test actually needs a browser
+    from tests.base_migration_test import BaseMigrationTest
     test_instance = BaseMigrationTest()
     test_instance.setup_method(None)
     yield test_instance
     test_instance.teardown_method(None)
 
+@pytest.fixture(scope="session")
+def http_parity():
+    """Provide browser-free parity checks over pooled HTTP sessions"""
+    from tests.http_parity import HttpParityTest
+    parity = HttpParityTest()
+    yield parity
+    parity.close()
+
 @pytest.fixture(scope="function")
 def authenticated_laravel_session(base_test):
     """Provide authenticated Laravel session"""
-    base_test.login_laravel()
+    if TEST_SETTINGS['SELENIUM']['SESSION_CACHE']['ENABLED']:
+        base_test.login_as('laravel')
+    else:
+        base_test.login_laravel()
     yield base_test
 
 @pytest.fixture(scope="function")
 def authenticated_django_session(base_test):
     """Provide authenticated Django session"""
-    base_test.login_django()
+    if TEST_SETTINGS['SELENIUM']['SESSION_CACHE']['ENABLED']:
+        base_test.login_as('django')
+    else:
+        base_test.login_django()
     yield base_test
 
 @pytest.fixture(scope="session", autouse=True)
@@ -57,6 +80,22 @@ def setup_test_environment():
     
     yield
     
+    # Quit warm browser sessions and record pool hit rate for this worker
+    close_driver_pool(reports_dir)
+
+    # Learned page wait timeouts; only workers that ran browser tests loaded the engine
+    adaptive_wait = sys.modules.get('tests.adaptive_wait')
+    if adaptive_wait is not None:
+        adaptive_wait.close_adaptive_wait(reports_dir)
+
+    # Persist query latency summary collected through DatabaseConfig, one file per xdist worker
+    if get_db_config().query_metrics.has_samples():
+        worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+        get_db_config().query_metrics.export_report(
+            f"reports/performance-comparison/query_latency_{worker}.json",
+            max_time=TEST_SETTINGS['PERFORMANCE']['MAX_DATABASE_QUERY_TIME']
+        )
+    
     # Cleanup after all tests
     print("Test environment cleanup completed")
 
@@ -100,6 +139,72 @@ def performance_threshold():
         'database_query_time': TEST_SETTINGS['PERFORMANCE']['MAX_DATABASE_QUERY_TIME']
     }
 
+@pytest.fixture(scope="function")
+def page_performance(base_test):
+    """Provide a Navigation Timing collector bound to the test's browser"""
+    from tests.page_performance import PagePerformanceCollector
+    return PagePerformanceCollector(base_test)
+
+@pytest.fixture(scope="session")
+def visual_diff_engine():
+    """Provide the background screenshot diff engine shared by the session"""
+    from tests.visual_diff import VisualDiffEngine
+    engine = VisualDiffEngine()
+    yield engine
+    if engine.results:
+        engine.export_report()
+    engine.close()
+
+@pytest.fixture(scope="function")
+def visual_parity(base_test, visual_diff_engine):
+    """Provide screenshot capture for visual comparisons of both apps"""
+    from tests.visual_diff import VisualParity
+    return VisualParity(base_test, visual_diff_engine)
+
+@pytest.fixture(scope="function")
+def query_metrics():
+    """Provide query latencies recorded during the current test only"""
+    with get_db_config().query_metrics.scoped() as metrics:
+        yield metrics
+
+def _baseline_run_id(config):
+    """One baseline run id per pytest invocation, shared by every xdist worker"""
+    if hasattr(config, 'workerinput'):
+        return config.workerinput.get('baseline_run_id')
+    if not hasattr(config, '_baseline_run_id'):
+        from scripts.performance.baseline_store import new_run_id
+        config._baseline_run_id = new_run_id()
+    return config._baseline_run_id
+
+@pytest.fixture(scope="session")
+def performance_baseline(request):
+    """Provide the cross-run performance baseline store; this run is appended at session end"""
+    from scripts.performance.baseline_store import PerformanceBaselineStore
+    store = PerformanceBaselineStore(run_id=_baseline_run_id(request.config))
+    yield store
+    if store.records:
+        # Workers share the run id, so each one writes its own share of the checks
+        worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+        store.export_report(output_path=f"reports/performance-comparison/regression_report_{worker}.json")
+        store.flush()
+
+@pytest.fixture(autouse=True)
+def _baseline_query_metrics(request):
+    """Record the queries of each test using performance_baseline as the test finishes"""
+    if 'performance_baseline' not in request.fixturenames:
+        yield
+        return
+    store = request.getfixturevalue('performance_baseline')
+    with get_db_config().query_metrics.scoped() as metrics:
+        yield
+    store.record_query_metrics(metrics, test=request.node.nodeid)
+
+@pytest.fixture(scope="session")
+def table_snapshots():
+    """Provide Laravel tables from local snapshots instead of the source database"""
+    from scripts.validators.table_snapshot import TableSnapshotCache
+    return TableSnapshotCache(get_db_config())
+
 @pytest.fixture(scope="function")
 def test_data():
     """Provide test data for tests"""
@@ -111,7 +216,9 @@ def pytest_configure_node(node):
     """Configure node for parallel execution"""
     if hasattr(node.config.option, 'dist') and node.config.option.dist == 'each':
         # Configure for parallel execution
-        node.slaveinput['selenium_grid'] = True
+        node.workerinput['selenium_grid'] = True
+    # Measurements of every worker belong to the same baseline run
+    node.workerinput['baseline_run_id'] = _baseline_run_id(node.config)
 
 # Custom assertion helpers
 class MigrationAssertions:
@@ -136,23 +243,112 @@ class MigrationAssertions:
         )
     
     @staticmethod
-    def assert_api_parity(laravel_response, django_response):
-        """Assert that API responses have parity"""
+    def assert_api_parity(laravel_response, django_response, ignore_paths=None,
+                          numeric_tolerance=None, compare_values=True):
+        """Assert that API responses have parity in status, structure, types and values"""
+        from tests.api_diff import JsonStructureDiff, format_differences
+        
         assert laravel_response.status_code == django_response.status_code, (
             f"Status codes don't match: Laravel {laravel_response.status_code} "
             f"vs Django {django_response.status_code}"
         )
         
-        # Compare response structure (keys)
+        # Compare response structure recursively
         if laravel_response.headers.get('content-type', '').startswith('application/json'):
-            laravel_data = laravel_response.json()
-            django_data = django_response.json()
+            differ = JsonStructureDiff(
+                ignore_paths=ignore_paths, numeric_tolerance=numeric_tolerance,
+                compare_values=compare_values
+            )
+            report = differ.diff(laravel_response.json(), django_response.json())
             
-            assert set(laravel_data.keys()) == set(django_data.keys()), (
-                f"Response structure mismatch:\n"
-                f"Laravel keys: {set(laravel_data.keys())}\n"
-                f"Django keys: {set(django_data.keys())}"
+            assert report['equal'], (
+                f"Response mismatch: {report['difference_count']} difference(s) {report['by_kind']}\n"
+                + format_differences(report)
             )
+    
+    @staticmethod
+    def assert_paginated_api_parity(session, laravel_url, django_url, params=None,
+                                    ignore_paths=None, numeric_tolerance=None, max_pages=None):
+        """Assert parity of every item of a paginated list endpoint, one page at a time"""
+        from tests.api_diff import JsonStructureDiff, format_differences, iter_paginated
+        
+        differ = JsonStructureDiff(ignore_paths=ignore_paths, numeric_tolerance=numeric_tolerance)
+        report = differ.diff_items(
+            iter_paginated(session, laravel_url, params, max_pages=max_pages),
+            iter_paginated(session, django_url, params, max_pages=max_pages)
+        )
+        
+        assert report['equal'], (
+            f"Paginated response mismatch over {report['items_compared']} item(s) "
+            f"{report['item_counts']}: {report['difference_count']} difference(s) {report['by_kind']}\n"
+            + format_differences(report)
+        )
+    
+    @staticmethod
+    def assert_page_performance(route_result, max_load_time=None, metric='load',
+                                statistic='p95', cache_mode='warm'):
+        """Assert that both apps load a route within the page load time threshold"""
+        max_load_time = max_load_time or TEST_SETTINGS['PERFORMANCE']['MAX_PAGE_LOAD_TIME']
+        failures = []
+        
+        for app in ('laravel', 'django'):
+            distribution = route_result[app][cache_mode]['distributions'][metric]
+            observed = distribution[statistic] / 1000  # browser timings are in ms
+            if observed > max_load_time:
+                failures.append(f"{app}: {metric} {statistic} {observed:.3f}s")
+        
+        assert not failures, (
+            f"Page performance above {max_load_time}s for {route_result['route']} "
+            f"({cache_mode} cache): " + ", ".join(failures)
+        )
+    
+    @staticmethod
+    def assert_visual_parity(diff_result, max_diff_ratio=None):
+        """Assert that a route looks the same on both apps"""
+        max_diff_ratio = max_diff_ratio if max_diff_ratio is not None else \
+            TEST_SETTINGS['VISUAL_DIFF']['MAX_DIFF_RATIO']
+        if hasattr(diff_result, 'result'):
+            diff_result = diff_result.result()
+        
+        assert not diff_result['size_mismatch'] and diff_result['diff_ratio'] <= max_diff_ratio, (
+            f"Visual parity failed for {diff_result['name']}: "
+            f"{diff_result['diff_ratio']:.2%} of blocks differ (max {max_diff_ratio:.2%}), "
+            f"sizes Laravel {diff_result['laravel_size']} vs Django {diff_result['django_size']}\n"
+            f"Heatmap: {diff_result['heatmap']}"
+        )
+    
+    @staticmethod
+    def assert_no_performance_regression(store, kind=None):
+        """Assert that no measurement of this run regressed against its rolling baseline"""
+        regressions = store.regressions(kind)
+        
+        assert not regressions, (
+            f"{len(regressions)} performance regression(s) against the last {store.window} runs:\n" +
+            "\n".join(
+                f"[{result['kind']}] {result['key']} ({result['side']}): " + ", ".join(
+                    f"{statistic} {values['current']:.1f}ms vs {values['baseline_median']:.1f}ms "
+                    f"({values['change']:+.1%}, z={values['z_score']})"
+                    for statistic, values in result['statistics'].items()
+                    if values['verdict'] == 'regression'
+                )
+                for result in regressions
+            )
+        )
+    
+    @staticmethod
+    def assert_query_performance(metrics, max_time=None, side=None):
+        """Assert that no recorded query exceeded the database query time threshold"""
+        max_time = max_time or TEST_SETTINGS['PERFORMANCE']['MAX_DATABASE_QUERY_TIME']
+        slow_queries = metrics.slow_queries(max_time, side=side)
+        
+        assert not slow_queries, (
+            f"{len(slow_queries)} query fingerprint(s) exceeded {max_time}s:\n" +
+            "\n".join(
+                f"[{query['side']}] max {query['max_time']:.3f}s "
+                f"over {query['count']} run(s): {query['fingerprint']}"
+                for query in slow_queries
+            )
+        )
 
 @pytest.fixture
 def migration_assertions():
@@ -0,0 +1,193 @@
+"""
+Per-worker WebDriver session pool that hands out warm browser sessions
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, List
+
+from config.test_settings import TEST_SETTINGS
+from config.migration_config import MigrationConfig
+
+# Clears everything the apps may have stored for the origin of the current page
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class DriverPool:
+    """Hands out reusable WebDriver sessions, resetting them between tests"""
+
+    def __init__(self, factory: Callable[[], Any], max_uses: int = 50,
+                 reset_origins: List[str] = None):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.reset_origins = reset_origins or []
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            'acquired': 0,
+            'hits': 0,
+            'created': 0,
+            'recycled': 0,
+            'discarded_on_failure': 0,
+            'reset_failures': 0
+        }
+
+    def acquire(self):
+        """Return a warm session if one is idle, otherwise start a new browser"""
+        self._count('acquired')
+        while True:
+            with self._lock:
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._is_alive(driver):
+                self._count('hits')
+                return driver
+            self._quit(driver)
+
+        self._count('created')
+        driver = self.factory()
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver, failed: bool = False):
+        """Return a session to the pool, or quit it if it failed or reached its use limit"""
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            # Concurrent page captures release from two threads
+            if failed:
+                discarded = 'discarded_on_failure'
+            elif uses >= self.max_uses:
+                discarded = 'recycled'
+            else:
+                discarded = None
+            if discarded:
+                self.stats[discarded] += 1
+
+        if discarded:
+            self._quit(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except Exception as e:
+            print(f"Driver reset failed, discarding session: {e}")
+            self._count('reset_failures')
+            self._quit(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def reset(self, driver):
+        """Bring a session back to a clean state: one window, no cookies or storage"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Local Chromium: clear every origin without navigating
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            for origin in self.reset_origins:
+                driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                    'origin': origin.rstrip('/'),
+                    'storage_types': 'local_storage,session_storage,indexeddb,cache_storage'
+                })
+        else:
+            # Cookies and storage can only be cleared for the origin currently loaded
+            for origin in self.reset_origins:
+                driver.get(f"{origin.rstrip('/')}/favicon.ico")
+                driver.delete_all_cookies()
+                driver.execute_script(CLEAR_STORAGE_SCRIPT)
+
+        driver.get('about:blank')
+        driver.set_window_size(*TEST_SETTINGS['SELENIUM']['WINDOW_SIZE'])
+
+    def _is_alive(self, driver) -> bool:
+        """Check that the remote session still responds"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+
+    def hit_rate(self) -> float:
+        """Fraction of acquisitions served by a warm session"""
+        acquired = self.stats['acquired']
+        return self.stats['hits'] / acquired if acquired else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'hit_rate': round(self.hit_rate(), 4),
+            'idle_sessions': len(self._idle),
+            'max_uses': self.max_uses
+        }
+
+    def close(self):
+        """Quit all idle sessions"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+
+
+# One pool per process; each pytest-xdist worker is its own process
+_pool = None
+
+
+def get_driver_pool(factory: Callable[[], Any]) -> DriverPool:
+    """Return this worker's driver pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        config = MigrationConfig()
+        _pool = DriverPool(
+            factory,
+            max_uses=TEST_SETTINGS['SELENIUM']['DRIVER_POOL']['MAX_USES'],
+            reset_origins=[config.LARAVEL_APP_URL, config.DJANGO_APP_URL]
+        )
+    return _pool
+
+
+def close_driver_pool(report_dir: Path = None):
+    """Quit pooled sessions and write this worker's pool statistics"""
+    global _pool
+    if _pool is None:
+        return
+
+    report_dir = Path(report_dir or TEST_SETTINGS['REPORTING']['REPORT_PATH'])
+    report_dir.mkdir(parents=True, exist_ok=True)
+    worker = os.getenv('PYTEST_XDIST_WORKER', 'main')
+    report_file = report_dir / f"driver_pool_{worker}.json"
+    with open(report_file, 'w') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(),
+            'worker': worker,
+            **_pool.report()
+        }, f, indent=2)
+
+    print(f"Driver pool hit rate ({worker}): {_pool.hit_rate():.2%}")
+    _pool.close()
+    _pool = None
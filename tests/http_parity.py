@@ -0,0 +1,262 @@
+"""
+Browser-free parity checks for server-rendered Laravel and Django pages
+"""
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.test_settings import TEST_SETTINGS, TEST_DATA
+from config.migration_config import MigrationConfig
+from tests.login_forms import CSRF_FIELDS, LOGIN_PATHS, is_login_page
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def element_comparison(laravel_details: Dict[str, Dict[str, Any]],
+                       django_details: Dict[str, Dict[str, Any]],
+                       elements_to_compare: Dict[str, str]) -> Dict[str, Any]:
+    """Build the comparison result shared by the HTTP and browser page comparisons"""
+    def element_values(details):
+        return {
+            name: details[name]['text'] if details[name]['present']
+            else f"ERROR: no element matches selector '{selector}'"
+            for name, selector in elements_to_compare.items()
+        }
+
+    return {
+        'laravel': element_values(laravel_details),
+        'django': element_values(django_details),
+        'details': {
+            'laravel': laravel_details,
+            'django': django_details
+        },
+        'comparison': {
+            element: laravel_details[element] == django_details[element]
+            for element in elements_to_compare.keys()
+        }
+    }
+
+
+class HttpParityTest:
+    """Compares server-rendered pages over pooled HTTP sessions, using the browser only when needed"""
+
+    def __init__(self, config_path: str = "config/component_mapping.json", browser_test=None):
+        self.config = MigrationConfig()
+        self.test_settings = TEST_SETTINGS
+        self.test_data = TEST_DATA
+        self.base_urls = {
+            'laravel': self.config.LARAVEL_APP_URL,
+            'django': self.config.DJANGO_APP_URL
+        }
+        self.sessions = {app: self._create_session() for app in self.base_urls}
+        self.js_dependent_routes = self._load_js_dependent_routes(Path(config_path))
+        self.browser_test = browser_test
+        self._owns_browser = False
+        # Role the browser fallback logs in as; use_cached_session() keeps it in step
+        self.role = 'admin'
+
+    def _create_session(self) -> requests.Session:
+        """Create a session with a keep-alive connection pool and retries"""
+        api_settings = self.test_settings['API']
+        pool_size = self.test_settings['PARALLEL_EXECUTION']['MAX_WORKERS'] * 2
+        retry = Retry(
+            total=api_settings['RETRY_COUNT'],
+            backoff_factor=api_settings['RETRY_DELAY'],
+            status_forcelist=(502, 503, 504),
+            allowed_methods=('GET', 'HEAD')
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['Accept'] = 'text/html,application/xhtml+xml'
+        return session
+
+    def _load_js_dependent_routes(self, config_path: Path) -> List[str]:
+        """Load routes that only render correctly with JavaScript"""
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f).get('js_dependent_routes', [])
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            return []
+
+    def is_js_dependent(self, path: str) -> bool:
+        """Check whether a path matches a route marked as JavaScript-dependent"""
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        for route in self.js_dependent_routes:
+            pattern = '^' + re.sub(r'\\\{[^/]+\\\}|<[^/]+>', '[^/]+', re.escape(route.rstrip('/'))) + '$'
+            if re.match(pattern, path):
+                return True
+        return False
+
+    def login(self, app: str, email: str = None, password: str = None):
+        """Log a session in by submitting the application's login form"""
+        email = email or self.test_data['USERS']['admin']['email']
+        password = password or self.test_data['USERS']['admin']['password']
+        session = self.sessions[app]
+        url = f"{self.base_urls[app]}{LOGIN_PATHS[app]}"
+
+        login_page = session.get(url, timeout=self.test_settings['API']['TIMEOUT'])
+        login_page.raise_for_status()
+        token = BeautifulSoup(login_page.text, 'html.parser').find(
+            'input', attrs={'name': CSRF_FIELDS[app]}
+        )
+        form = {'email': email, 'password': password}
+        if token is not None:
+            form[CSRF_FIELDS[app]] = token.get('value', '')
+
+        response = session.post(
+            url, data=form, headers={'Referer': url},
+            timeout=self.test_settings['API']['TIMEOUT']
+        )
+        response.raise_for_status()
+        # A rejected login redirects back to the form with a 200, not an error status
+        if is_login_page(app, response.url):
+            raise requests.HTTPError(
+                f"Login to {app} as {email} failed: redirected back to {response.url}",
+                response=response
+            )
+        return response
+
+    def use_cached_session(self, app: str, role: str = 'admin'):
+        """Authenticate a session with cookies shared with the browser tests"""
+        from tests.session_cache import get_session_cache
+
+        self.role = role
+        get_session_cache().apply_to_http_session(self.sessions[app], app, role, http_parity=self)
+
+    def fetch_page(self, app: str, path: str) -> BeautifulSoup:
+        """Fetch and parse a page from one application"""
+        response = self.sessions[app].get(
+            f"{self.base_urls[app]}{path}", timeout=self.test_settings['API']['TIMEOUT']
+        )
+        response.raise_for_status()
+        # Two login pages would compare equal on every selector missing from both
+        if is_login_page(app, response.url) and not is_login_page(app, path):
+            raise requests.HTTPError(
+                f"{app} redirected {path} to the login page {response.url}; the session is not authenticated",
+                response=response
+            )
+        return BeautifulSoup(response.text, 'html.parser')
+
+    def extract_elements(self, soup: BeautifulSoup, elements_to_extract: Dict[str, str],
+                         attributes: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Extract text, presence and attributes of each selector from a parsed page"""
+        details = {}
+        for name, selector in elements_to_extract.items():
+            element = soup.select_one(selector)
+            if element is None:
+                details[name] = {'present': False, 'text': None, 'attributes': {}}
+                continue
+            details[name] = {
+                'present': True,
+                'text': _WHITESPACE_RE.sub(' ', element.get_text(' ', strip=True)),
+                'attributes': {
+                    attribute: self._attribute_value(element.get(attribute))
+                    for attribute in attributes or []
+                }
+            }
+        return details
+
+    def _attribute_value(self, value) -> Optional[str]:
+        # BeautifulSoup returns multi-valued attributes such as class as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def _capture(self, app: str, path: str, elements_to_compare: Dict[str, str],
+                 attributes: List[str]) -> Dict[str, Dict[str, Any]]:
+        return self.extract_elements(self.fetch_page(app, path), elements_to_compare, attributes)
+
+    def compare_page_elements(self, laravel_path: str, django_path: str,
+                              elements_to_compare: Dict[str, str],
+                              attributes: List[str] = None) -> Dict[str, Any]:
+        """Compare elements between Laravel and Django pages over HTTP
+
+        Routes marked in js_dependent_routes fall back to the browser comparison.
+        """
+        if self.is_js_dependent(laravel_path) or self.is_js_dependent(django_path):
+            result = self._browser().compare_page_elements_concurrent(
+                laravel_path, django_path, elements_to_compare, attributes, role=self.role
+            )
+            result['mode'] = 'browser'
+            return result
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            laravel_future = executor.submit(
+                self._capture, 'laravel', laravel_path, elements_to_compare, attributes
+            )
+            django_future = executor.submit(
+                self._capture, 'django', django_path, elements_to_compare, attributes
+            )
+            laravel_details = laravel_future.result()
+            django_details = django_future.result()
+
+        return {
+            'mode': 'http',
+            **element_comparison(laravel_details, django_details, elements_to_compare)
+        }
+
+    def compare_pages(self, page_pairs: List[Tuple[str, str]], elements_to_compare: Dict[str, str],
+                      attributes: List[str] = None, max_workers: int = None) -> Dict[str, Any]:
+        """Sweep many page pairs concurrently; browser fallbacks run one at a time"""
+        max_workers = max_workers or self.test_settings['PARALLEL_EXECUTION']['MAX_WORKERS']
+        http_pairs = [
+            pair for pair in page_pairs
+            if not (self.is_js_dependent(pair[0]) or self.is_js_dependent(pair[1]))
+        ]
+        browser_pairs = [pair for pair in page_pairs if pair not in http_pairs]
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                pair: executor.submit(
+                    self.compare_page_elements, pair[0], pair[1], elements_to_compare, attributes
+                )
+                for pair in http_pairs
+            }
+            for pair, future in futures.items():
+                try:
+                    results[pair[0]] = future.result()
+                except Exception as e:
+                    results[pair[0]] = {'error': str(e)}
+
+        # A single browser session is shared, so JS-dependent pages are not parallelized
+        for laravel_path, django_path in browser_pairs:
+            try:
+                results[laravel_path] = self.compare_page_elements(
+                    laravel_path, django_path, elements_to_compare, attributes
+                )
+            except Exception as e:
+                results[laravel_path] = {'error': str(e)}
+        return results
+
+    def _browser(self):
+        """Return a browser-backed test instance, starting one on first use
+
+        Each comparison logs both of its sessions in as self.role, so a role
+        switched by use_cached_session() applies to the next fallback.
+        """
+        if self.browser_test is None:
+            from tests.base_migration_test import BaseMigrationTest
+
+            browser_test = BaseMigrationTest()
+            browser_test.setup_method(None)
+            self.browser_test = browser_test
+            self._owns_browser = True
+        return self.browser_test
+
+    def close(self):
+        """Close HTTP sessions and any browser started for fallbacks"""
+        for session in self.sessions.values():
+            session.close()
+        if self._owns_browser:
+            self.browser_test.teardown_method(None)
+            self.browser_test = None
+            self._owns_browser = False
@@ -0,0 +1,39 @@
+"""
+Login form paths and CSRF handling shared by the browser, HTTP and load tests
+
+Standard library only: the Locust load test imports this before gevent
+monkey-patches the network stack.
+"""
+import re
+from typing import Optional
+from urllib.parse import urlparse
+
+# Name of the CSRF form field each framework renders into its forms
+CSRF_FIELDS = {
+    'laravel': '_token',
+    'django': 'csrfmiddlewaretoken'
+}
+
+LOGIN_PATHS = {
+    'laravel': '/login',
+    'django': '/login/'
+}
+
+_CSRF_INPUT_RES = {
+    app: re.compile(
+        rf'<input\b(?=[^>]*\bname=["\']{re.escape(field)}["\'])[^>]*\bvalue=["\']([^"\']*)["\']',
+        re.IGNORECASE
+    )
+    for app, field in CSRF_FIELDS.items()
+}
+
+
+def is_login_page(app: str, url: str) -> bool:
+    """Check whether a URL is the application's login page"""
+    return urlparse(url).path.rstrip('/') == LOGIN_PATHS[app].rstrip('/')
+
+
+def csrf_token(app: str, html: str) -> Optional[str]:
+    """Return the CSRF token rendered into an application's form, if any"""
+    match = _CSRF_INPUT_RES[app].search(html or '')
+    return match.group(1) if match else None
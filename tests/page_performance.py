@@ -0,0 +1,200 @@
+"""
+Page performance capture from the browser's Navigation and Resource Timing APIs
+"""
+import json
+import re
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.test_settings import TEST_SETTINGS
+from tests.phase_profiler import phase
+from tests.session_cache import get_session_cache
+
+# Timings are milliseconds relative to navigation start, as reported by the browser
+NAVIGATION_TIMING_SCRIPT = """
+var topResources = arguments[0];
+var navigation = performance.getEntriesByType('navigation')[0];
+if (!navigation || navigation.loadEventEnd === 0) {
+    return null;
+}
+var resources = performance.getEntriesByType('resource').map(function (entry) {
+    return {
+        name: entry.name,
+        type: entry.initiatorType,
+        duration: entry.duration,
+        transfer_size: entry.transferSize || 0
+    };
+});
+var transferred = resources.reduce(function (total, entry) {
+    return total + entry.transfer_size;
+}, 0);
+resources.sort(function (a, b) { return b.duration - a.duration; });
+return {
+    ttfb: navigation.responseStart - navigation.requestStart,
+    response_end: navigation.responseEnd,
+    dom_interactive: navigation.domInteractive,
+    dom_content_loaded: navigation.domContentLoadedEventEnd,
+    load: navigation.loadEventEnd,
+    document_transfer_size: navigation.transferSize || 0,
+    document_body_size: navigation.decodedBodySize || 0,
+    resource_count: resources.length,
+    resource_transfer_size: transferred,
+    slowest_resources: resources.slice(0, topResources)
+};
+"""
+
+TIMING_METRICS = ('ttfb', 'response_end', 'dom_interactive', 'dom_content_loaded', 'load')
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize a list of samples into a distribution"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        'min': round(ordered[0], 2),
+        'median': round(statistics.median(ordered), 2),
+        'mean': round(statistics.fmean(ordered), 2),
+        'p95': round(ordered[p95_index], 2),
+        'max': round(ordered[-1], 2),
+        'stdev': round(statistics.stdev(ordered), 2) if len(ordered) > 1 else 0.0
+    }
+
+
+class PagePerformanceCollector:
+    """Collects repeated page timing distributions for Laravel and Django routes"""
+
+    def __init__(self, base_test, repetitions: int = 5, top_resources: int = 5,
+                 report_dir: str = "reports/performance-comparison/page_timing", role: str = 'admin'):
+        self.base_test = base_test
+        self.role = role
+        self.repetitions = repetitions
+        self.top_resources = top_resources
+        self.report_dir = Path(report_dir)
+        self.results = {}
+
+    def _base_url(self, app: str) -> str:
+        config = self.base_test.config
+        return config.LARAVEL_APP_URL if app == 'laravel' else config.DJANGO_APP_URL
+
+    def _load_and_read_timing(self, driver, url: str) -> Dict[str, Any]:
+        """Navigate and wait until the navigation entry has a load event end"""
+        with phase('navigation'):
+            driver.get(url)
+        with phase('wait'):
+            return WebDriverWait(driver, TEST_SETTINGS['SELENIUM']['EXPLICIT_WAIT']).until(
+                lambda d: d.execute_script(NAVIGATION_TIMING_SCRIPT, self.top_resources)
+            )
+
+    def _cold_driver(self, app: str):
+        """Start a browser with an empty cache, sized and logged in like the test's driver"""
+        driver = self.base_test._create_driver()
+        try:
+            with phase('driver'):
+                driver.set_window_size(*TEST_SETTINGS['SELENIUM']['WINDOW_SIZE'])
+            with phase('login'):
+                # Any login happens in the test's driver so this cache stays empty
+                get_session_cache().add_cookies_to_driver(
+                    driver, app, self.role, login_driver=self.base_test.driver
+                )
+        except Exception:
+            driver.quit()
+            raise
+        return driver
+
+    def _clear_cache(self, driver) -> bool:
+        """Clear the HTTP cache where the driver supports it"""
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        return True
+
+    def measure(self, app: str, path: str, cache_mode: str = 'warm',
+                repetitions: int = None) -> Dict[str, Any]:
+        """Measure one route on one app, returning raw samples and distributions"""
+        if cache_mode not in ('warm', 'cold'):
+            raise ValueError(f"Unsupported cache mode: {cache_mode}")
+
+        repetitions = repetitions or self.repetitions
+        url = f"{self._base_url(app)}{path}"
+        driver = self.base_test.driver
+        samples = []
+
+        # The test's driver may be anonymous or logged in to the other app; a login
+        # redirect on one side would be timed against the real page on the other
+        with phase('login'):
+            get_session_cache().add_cookies_to_driver(driver, app, self.role)
+
+        if cache_mode == 'warm':
+            # Prime the cache; the priming load is not recorded
+            self._load_and_read_timing(driver, url)
+
+        for _ in range(repetitions):
+            fresh_driver = None
+            if cache_mode == 'cold' and not self._clear_cache(driver):
+                # Without CDP a new browser profile is the only reliable empty cache
+                fresh_driver = self._cold_driver(app)
+            try:
+                samples.append(self._load_and_read_timing(fresh_driver or driver, url))
+            finally:
+                if fresh_driver is not None:
+                    fresh_driver.quit()
+
+        return {
+            'url': url,
+            'cache_mode': cache_mode,
+            'repetitions': repetitions,
+            'samples': samples,
+            'distributions': {
+                metric: summarize([sample[metric] for sample in samples])
+                for metric in TIMING_METRICS + ('resource_transfer_size',)
+            },
+            'slowest_resources': self._slowest_resources(samples)
+        }
+
+    def _slowest_resources(self, samples: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rank resources by their median duration across samples"""
+        durations = {}
+        for sample in samples:
+            for resource in sample['slowest_resources']:
+                durations.setdefault(resource['name'], []).append(resource['duration'])
+        ranked = sorted(
+            ({'name': name, 'median_duration': round(statistics.median(values), 2)}
+             for name, values in durations.items()),
+            key=lambda resource: resource['median_duration'],
+            reverse=True
+        )
+        return ranked[:self.top_resources]
+
+    def measure_route(self, laravel_path: str, django_path: str = None,
+                      cache_modes=('cold', 'warm'), repetitions: int = None) -> Dict[str, Any]:
+        """Measure the same route on both apps in every cache mode"""
+        django_path = django_path or laravel_path
+        result = {
+            'route': laravel_path,
+            'measured_at': datetime.now().isoformat(),
+            'max_page_load_time': TEST_SETTINGS['PERFORMANCE']['MAX_PAGE_LOAD_TIME'],
+            'laravel': {},
+            'django': {}
+        }
+        for cache_mode in cache_modes:
+            result['laravel'][cache_mode] = self.measure('laravel', laravel_path, cache_mode, repetitions)
+            result['django'][cache_mode] = self.measure('django', django_path, cache_mode, repetitions)
+
+        self.results[laravel_path] = result
+        self.export_route(result)
+        return result
+
+    def export_route(self, result: Dict[str, Any]):
+        """Write one route's distributions to its own report file"""
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', result['route']).strip('_') or 'root'
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report_file = self.report_dir / f"{slug}.json"
+        with open(report_file, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Page timing report exported to: {report_file}")
@@ -0,0 +1,291 @@
+"""
+Pytest plugin that attributes each test's wall time to phases and aggregates it per component
+"""
+import json
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import pytest
+
+from config.query_metrics import query_metrics
+from config.test_settings import TEST_SETTINGS
+
+PROFILE_FILE = TEST_SETTINGS['REPORTING']['REPORT_PATH'] / 'phase_profile.json'
+
+# 'driver' covers creating, pooling and releasing browser sessions; 'other' is
+# whatever wall time no phase claimed (assertions, fixtures, pure Python)
+PHASES = ('driver', 'login', 'navigation', 'wait', 'db', 'screenshot', 'other')
+
+# Slowest tests listed individually in the report
+SLOWEST_TESTS = 20
+
+_USER_PROPERTY = 'phase_profile'
+
+
+class PhaseRecord:
+    """Phase timings of the test currently running in this process
+
+    db_seconds returns the database time recorded so far for the test. Queries
+    run inside a phase are taken out of it, as they are reported as db.
+    """
+
+    def __init__(self, nodeid: str, db_seconds: Callable[[], float] = None):
+        self.nodeid = nodeid
+        self.db_seconds = db_seconds or (lambda: 0.0)
+        self.started = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, duration: float, count: int = 1):
+        with self._lock:
+            self.phases[phase] += duration
+            self.counts[phase] += count
+
+    def finish(self) -> Dict[str, Any]:
+        """Close the record; phases overlapping in worker threads may add up past the wall time"""
+        wall = time.perf_counter() - self.started
+        phases = dict(self.phases)
+        phases['other'] = max(0.0, wall - sum(phases.values()))
+        return {
+            'wall': round(wall, 4),
+            'phases': {phase: round(seconds, 4) for phase, seconds in phases.items()},
+            'counts': {phase: count for phase, count in self.counts.items() if count}
+        }
+
+
+class PhaseProfiler:
+    """Per-process recorder behind phase(); a no-op while no test is being profiled"""
+
+    def __init__(self):
+        self.current = None
+        self._depth = threading.local()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block as one phase; nested phases are absorbed by the outermost one
+
+        A login that navigates and waits therefore counts as login only.
+        """
+        current = self.current
+        depth = getattr(self._depth, 'value', 0)
+        if current is None or depth:
+            self._depth.value = depth + 1
+            try:
+                yield
+            finally:
+                self._depth.value = depth
+            return
+
+        self._depth.value = 1
+        started = time.perf_counter()
+        db_started = current.db_seconds()
+        try:
+            yield
+        finally:
+            self._depth.value = 0
+            elapsed = time.perf_counter() - started
+            current.add(name, max(0.0, elapsed - (current.db_seconds() - db_started)))
+
+    def start(self, nodeid: str, db_seconds: Callable[[], float] = None) -> PhaseRecord:
+        self.current = PhaseRecord(nodeid, db_seconds)
+        return self.current
+
+    def stop(self) -> Optional[PhaseRecord]:
+        current, self.current = self.current, None
+        return current
+
+
+_phase_profiler = PhaseProfiler()
+
+
+def get_phase_profiler() -> PhaseProfiler:
+    """Return the phase profiler of this worker"""
+    return _phase_profiler
+
+
+def phase(name: str):
+    """Context manager timing a block as a phase of the current test"""
+    return _phase_profiler.phase(name)
+
+
+def profiled(name: str):
+    """Decorator timing every call of a function as a phase of the current test"""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _phase_profiler.phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summarize(records: List[Dict[str, Any]], slowest: int = SLOWEST_TESTS) -> Dict[str, Any]:
+    """Aggregate per-test phase records per component and overall"""
+
+    def empty():
+        return {'tests': 0, 'wall': 0.0, 'phases': dict.fromkeys(PHASES, 0.0)}
+
+    def add(bucket, record):
+        bucket['tests'] += 1
+        bucket['wall'] += record['wall']
+        for phase_name, seconds in record['phases'].items():
+            bucket['phases'][phase_name] += seconds
+
+    def finish(bucket):
+        total = sum(bucket['phases'].values())
+        bucket['wall'] = round(bucket['wall'], 3)
+        bucket['phases'] = {name: round(seconds, 3) for name, seconds in bucket['phases'].items()}
+        bucket['share'] = {
+            name: round(seconds / total, 4) if total else 0.0
+            for name, seconds in bucket['phases'].items()
+        }
+        measured = {name: seconds for name, seconds in bucket['phases'].items() if name != 'other'}
+        bucket['slowest_phase'] = max(measured, key=measured.get) if any(measured.values()) else None
+        return bucket
+
+    overall = empty()
+    components = {}
+    for record in records:
+        add(overall, record)
+        for component in record['components'] or ['unassigned']:
+            add(components.setdefault(component, empty()), record)
+
+    return {
+        'overall': finish(overall),
+        'components': {
+            name: finish(bucket)
+            for name, bucket in sorted(components.items(), key=lambda item: item[1]['wall'], reverse=True)
+        },
+        'slowest_tests': sorted(records, key=lambda record: record['wall'], reverse=True)[:slowest]
+    }
+
+
+def publish(summary: Dict[str, Any], tracker_url: str, timeout: float = 5.0) -> bool:
+    """POST a profile summary to the migration tracker; failures never fail the run"""
+    request = urllib.request.Request(
+        f"{tracker_url.rstrip('/')}/api/test-profile",
+        data=json.dumps(summary).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            return True
+    except OSError as e:
+        print(f"Could not publish test profile to {tracker_url}: {e}")
+        return False
+
+
+def _db_seconds(metrics) -> float:
+    return sum(entry.total_time for entry in metrics.stats())
+
+
+class PhaseProfilePlugin:
+    """Profiles every test on workers and aggregates the records on the controller"""
+
+    def __init__(self, config):
+        self.config = config
+        self.profiler = get_phase_profiler()
+        self.output = Path(config.getoption('phase_profile_file'))
+        self.tracker_url = config.getoption('tracker_url')
+        self.records = []
+
+    def _components(self, item) -> List[str]:
+        # Same attribution as test selection, so dashboards and --changed-since agree
+        scheduling = self.config.pluginmanager.get_plugin('migration-scheduling')
+        if scheduling is None:
+            return sorted(marker.args[0] for marker in item.iter_markers('component') if marker.args)
+        return sorted(scheduling.impact_map.components_for_item(item))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        item._phase_components = self._components(item)
+        with query_metrics.scoped() as metrics:
+            item._phase_queries = metrics
+            self.profiler.start(item.nodeid, lambda: _db_seconds(metrics))
+            yield
+        # Normally stopped at the teardown report; this covers interrupted tests
+        self.profiler.stop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != 'teardown':
+            return
+        current = self.profiler.stop()
+        if current is None:
+            return
+        metrics = getattr(item, '_phase_queries', None)
+        if metrics is not None:
+            current.add('db', _db_seconds(metrics), sum(entry.count for entry in metrics.stats()))
+        record = current.finish()
+        record['components'] = item._phase_components
+        # user_properties travel with the report from xdist workers to the controller
+        outcome.get_result().user_properties.append((_USER_PROPERTY, record))
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != 'teardown' or hasattr(self.config, 'workerinput'):
+            return
+        for name, value in report.user_properties:
+            if name == _USER_PROPERTY:
+                self.records.append({'nodeid': report.nodeid, **value})
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, 'workerinput') or not self.records:
+            return
+        summary = {
+            'generated_at': datetime.now().isoformat(),
+            'tests': len(self.records),
+            **summarize(self.records)
+        }
+        self.export_report(summary)
+        if self.tracker_url:
+            publish(summary, self.tracker_url)
+
+    def export_report(self, summary: Dict[str, Any]):
+        """Export the phase profile to a JSON file"""
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        print(f"Phase profile exported to: {self.output}")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if hasattr(self.config, 'workerinput') or not self.records:
+            return
+        overall = summarize(self.records)['overall']
+        terminalreporter.write_sep('-', 'time per phase')
+        for name in PHASES:
+            terminalreporter.write_line(
+                f"{name:<12} {overall['phases'][name]:>9.2f}s  {overall['share'][name]:>6.1%}"
+            )
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('migration-profiling', 'per-test phase profiling')
+    group.addoption(
+        '--phase-profile', action='store_true', default=False,
+        help='attribute test time to driver, login, navigation, wait, db and screenshot phases'
+    )
+    group.addoption(
+        '--phase-profile-file', default=str(PROFILE_FILE),
+        help='JSON file the per-component phase profile is written to'
+    )
+    group.addoption(
+        '--tracker-url', default=TEST_SETTINGS['REPORTING']['TRACKER_URL'],
+        help='migration tracker base URL the profile summary is published to'
+    )
+
+
+def pytest_configure(config):
+    # Opt-in, so unit test runs neither print a profile nor overwrite the last one
+    if config.getoption('phase_profile'):
+        config.pluginmanager.register(PhaseProfilePlugin(config), 'migration-phase-profile')
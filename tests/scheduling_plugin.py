@@ -0,0 +1,358 @@
+"""
+Pytest plugin for duration-aware xdist scheduling and change-based test selection
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Iterable
+
+import pytest
+
+from config.test_settings import BASE_DIR, TEST_SETTINGS
+
+DURATIONS_FILE = TEST_SETTINGS['REPORTING']['REPORT_PATH'] / 'durations.json'
+
+# Weight of the latest run when updating a test's recorded duration
+DURATION_SMOOTHING = 0.5
+
+# Changed files under these paths never widen the selection to the whole suite
+NON_CODE_PATTERNS = (re.compile(r'^docs/'), re.compile(r'\.md$'), re.compile(r'^reports/'))
+
+_TOKEN_SPLIT_RE = re.compile(r'[^a-z0-9]+')
+_CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+
+def _tokens(text: str) -> Set[str]:
+    """Split a path, identifier or route into lowercase tokens"""
+    text = _CAMEL_RE.sub('_', text)
+    return {token for token in _TOKEN_SPLIT_RE.split(text.lower()) if len(token) > 2}
+
+
+def _singular(token: str) -> str:
+    if token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+class ImpactMap:
+    """Maps changed files and tests to components from component_mapping.json"""
+
+    def __init__(self, config_path: Path = BASE_DIR / 'config' / 'component_mapping.json'):
+        try:
+            with open(config_path, 'r') as f:
+                components = json.load(f).get('components', {})
+        except FileNotFoundError:
+            print(f"Configuration file not found: {config_path}")
+            components = {}
+        self.component_tokens = {
+            name: self._component_tokens(name, details) for name, details in components.items()
+        }
+
+    def _component_tokens(self, name: str, details: Dict[str, Any]) -> Set[str]:
+        """Collect identifying tokens from a component's routes, views, models and tables"""
+        # Only the name-bearing parts; 'api', 'crm', 'index' and friends are too generic
+        identifiers = [name]
+        for side in ('laravel', 'django'):
+            parts = details.get(side, {})
+            for field in ('controller', 'model'):
+                if field in parts:
+                    identifiers.append(parts[field])
+            for field in ('controllers', 'models', 'views', 'viewsets', 'serializers', 'database_tables'):
+                identifiers.extend(parts.get(field, []))
+            for route in parts.get('routes', []) + parts.get('urls', []):
+                segments = [segment for segment in route.split('/') if segment and segment not in ('api', 'v1')]
+                if segments:
+                    identifiers.append(segments[0])
+
+        generic = {'controller', 'view', 'views', 'list', 'create', 'update', 'viewset',
+                   'serializer', 'crm', 'api', 'blade', 'php', 'html', 'index', 'edit', 'form',
+                   'set', 'type', 'endpoint'}
+        tokens = set()
+        for identifier in identifiers:
+            tokens |= {_singular(token) for token in _tokens(identifier)}
+        return tokens - generic
+
+    def components_for_tokens(self, tokens: Iterable[str]) -> Set[str]:
+        singular = {_singular(token) for token in tokens}
+        return {
+            name for name, component_tokens in self.component_tokens.items()
+            if singular & component_tokens
+        }
+
+    def components_for_file(self, path: str) -> Set[str]:
+        """Return the components a changed file belongs to"""
+        return self.components_for_tokens(_tokens(path))
+
+    def components_for_nodeid(self, nodeid: str) -> Set[str]:
+        """Infer components from a test's path and name"""
+        tokens = {_singular(token) for token in _tokens(nodeid)}
+        # A component named in the test wins over ones that merely share a model,
+        # otherwise every lead test would also belong to api_endpoints
+        named = {
+            name for name in self.component_tokens
+            if {_singular(token) for token in _tokens(name)} & tokens
+        }
+        return named or self.components_for_tokens(tokens)
+
+    def components_for_item(self, item) -> Set[str]:
+        """Return the components a collected test exercises"""
+        explicit = set()
+        for marker in item.iter_markers('component'):
+            explicit.update(marker.args)
+        explicit.update(
+            marker.name for marker in item.iter_markers() if marker.name in self.component_tokens
+        )
+        return explicit or self.components_for_nodeid(item.nodeid)
+
+
+def load_durations(path: Path = DURATIONS_FILE) -> Dict[str, float]:
+    """Load recorded per-test durations"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def changed_files_since(ref: str) -> List[str]:
+    """List files changed since a git ref, including uncommitted and untracked files"""
+    changed = []
+    for command in (['git', 'diff', '--name-only', ref],
+                    ['git', 'ls-files', '--others', '--exclude-standard']):
+        result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        changed.extend(line for line in result.stdout.splitlines() if line)
+    return changed
+
+
+class SchedulingPlugin:
+    """Records test durations, orders tests by impact and balances xdist workers"""
+
+    def __init__(self, config):
+        self.config = config
+        self.durations_file = Path(config.getoption('durations_file'))
+        self.durations = load_durations(self.durations_file)
+        self.current_durations = {}
+        self.impact_map = ImpactMap()
+        self.impacted_components = self._impacted_components()
+        # The xdist controller never collects items, so workers hand it the
+        # marker-based selection through this file
+        self.impacted_file = None
+        if hasattr(config, 'workerinput') and 'impacted_nodeids_file' in config.workerinput:
+            self.impacted_file = Path(config.workerinput['impacted_nodeids_file'])
+
+    def _impacted_components(self):
+        """Return the components touched by the change, None for 'everything'"""
+        changed = []
+        if self.config.getoption('changed_files'):
+            changed = [path.strip() for path in self.config.getoption('changed_files').split(',')]
+        elif self.config.getoption('changed_since'):
+            ref = self.config.getoption('changed_since')
+            try:
+                changed = changed_files_since(ref)
+            except (subprocess.CalledProcessError, OSError) as e:
+                detail = (getattr(e, 'stderr', None) or str(e)).strip().splitlines()[0]
+                self.config.issue_config_time_warning(pytest.PytestConfigWarning(
+                    f"Could not list files changed since {ref!r} ({detail}); "
+                    f"running the full suite in default order"
+                ), stacklevel=2)
+                return None
+        else:
+            return None
+
+        components = set()
+        for path in changed:
+            file_components = self.impact_map.components_for_file(path)
+            if not file_components and not any(pattern.search(path) for pattern in NON_CODE_PATTERNS):
+                # Shared code (config, base classes, fixtures) can affect every component
+                return None
+            components |= file_components
+        return components
+
+    def is_impacted(self, components: Set[str]) -> bool:
+        if self.impacted_components is None or not components:
+            # Tests that cannot be attributed to a component always run
+            return True
+        return bool(components & self.impacted_components)
+
+    def expected_duration(self, nodeid: str) -> float:
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        # Unknown tests are assumed to be typical rather than free
+        return statistics.median(self.durations.values()) if self.durations else 0.0
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        impacted, unaffected = [], []
+        for item in items:
+            components = self.impact_map.components_for_item(item)
+            (impacted if self.is_impacted(components) else unaffected).append(item)
+
+        if config.getoption('impacted_only'):
+            if unaffected:
+                config.hook.pytest_deselected(items=unaffected)
+            items[:] = impacted
+        else:
+            # Affected tests first; stable order keeps fixture grouping within each group
+            items[:] = impacted + unaffected
+
+        if self.impacted_file is not None:
+            self._write_impacted([item.nodeid for item in impacted])
+
+    def _write_impacted(self, nodeids: List[str]):
+        """Share this worker's impacted tests with the controller; every worker writes the same list"""
+        temporary = self.impacted_file.with_name(
+            f"{self.impacted_file.name}.{self.config.workerinput['workerid']}"
+        )
+        with open(temporary, 'w') as f:
+            json.dump(nodeids, f)
+        temporary.replace(self.impacted_file)
+
+    def impacted_nodeids(self) -> Optional[Set[str]]:
+        """Impacted tests as selected by the workers, None if they did not report any"""
+        if self.impacted_file is None:
+            return None
+        try:
+            with open(self.impacted_file, 'r') as f:
+                return set(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        if self.impacted_components is None:
+            return
+        if self.impacted_file is None:
+            handle, name = tempfile.mkstemp(prefix='impacted-', suffix='.json')
+            os.close(handle)
+            os.unlink(name)
+            self.impacted_file = Path(name)
+        node.workerinput['impacted_nodeids_file'] = str(self.impacted_file)
+
+    def pytest_runtest_logreport(self, report):
+        # With xdist the controller receives every worker's reports
+        if hasattr(self.config, 'workerinput'):
+            return
+        self.current_durations[report.nodeid] = (
+            self.current_durations.get(report.nodeid, 0.0) + report.duration
+        )
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, 'workerinput'):
+            return
+        if self.impacted_file is not None:
+            self.impacted_file.unlink(missing_ok=True)
+        if not self.current_durations:
+            return
+        merged = dict(self.durations)
+        for nodeid, duration in self.current_durations.items():
+            previous = merged.get(nodeid)
+            merged[nodeid] = round(
+                duration if previous is None
+                else DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * previous,
+                4
+            )
+
+        self.durations_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.durations_file.with_suffix('.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+        temporary.replace(self.durations_file)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getoption('no_duration_scheduling') or config.getvalue('dist') != 'load':
+            return None
+        return make_duration_scheduler(config, log, self)
+
+
+def make_duration_scheduler(config, log, plugin: SchedulingPlugin):
+    """Build an xdist scheduler that hands out the longest tests first"""
+    from itertools import cycle
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """Longest-processing-time-first scheduling with small work chunks
+
+        Workers pull the next longest pending test as they free up, so slow
+        Selenium tests spread across workers instead of piling up on one.
+        """
+
+        def __init__(self, config, log=None):
+            super().__init__(config, log)
+            # Small chunks keep the schedule adaptive; xdist keeps two tests queued per worker
+            if self.maxschedchunk is None:
+                self.maxschedchunk = 2
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                return super().schedule()
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            self.collection = next(iter(self.node2collection.values()))
+            if not self.collection:
+                return
+
+            # Same marker-based selection as pytest_collection_modifyitems on the workers
+            impacted_nodeids = plugin.impacted_nodeids()
+            impacted = {
+                index: (nodeid in impacted_nodeids if impacted_nodeids is not None
+                        else plugin.is_impacted(plugin.impact_map.components_for_nodeid(nodeid)))
+                for index, nodeid in enumerate(self.collection)
+            }
+            self.pending[:] = sorted(
+                range(len(self.collection)),
+                key=lambda index: (
+                    not impacted[index], -plugin.expected_duration(self.collection[index])
+                )
+            )
+
+            # Deal the longest tests out one at a time, two per worker
+            nodes = cycle(self.nodes)
+            for _ in range(min(len(self.pending), 2 * len(self.nodes))):
+                self._send_tests(next(nodes), 1)
+
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+    return DurationScheduling(config, log)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('migration-scheduling', 'duration-aware scheduling and test selection')
+    group.addoption(
+        '--durations-file', default=str(DURATIONS_FILE),
+        help='JSON file with recorded per-test durations'
+    )
+    group.addoption(
+        '--no-duration-scheduling', action='store_true', default=False,
+        help='use the default xdist load scheduler'
+    )
+    group.addoption(
+        '--changed-files', default=None,
+        help='comma-separated changed paths used to prioritise affected tests'
+    )
+    group.addoption(
+        '--changed-since', default=None,
+        help='git ref; files changed since it are used to prioritise affected tests'
+    )
+    group.addoption(
+        '--impacted-only', action='store_true', default=False,
+        help='deselect tests for components not touched by the change'
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "component(name): attributes a test to a component in component_mapping.json"
+    )
+    config.pluginmanager.register(SchedulingPlugin(config), 'migration-scheduling')
@@ -0,0 +1,177 @@
+"""
+Per-worker cache of authenticated session cookies for Laravel and Django
+"""
+import time
+from typing import Dict, Any, List
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config.test_settings import TEST_SETTINGS, TEST_DATA
+from config.migration_config import MigrationConfig
+from tests.adaptive_wait import wait_for_page_ready
+from tests.login_forms import LOGIN_PATHS, is_login_page
+
+# Cookies expiring sooner than this are treated as already expired
+EXPIRY_MARGIN_SECONDS = 60
+
+
+def _requests_to_selenium(cookie) -> Dict[str, Any]:
+    """Convert a requests/http.cookiejar cookie to the WebDriver cookie format"""
+    converted = {
+        'name': cookie.name,
+        'value': cookie.value,
+        'path': cookie.path or '/',
+        'secure': bool(cookie.secure)
+    }
+    if cookie.domain:
+        converted['domain'] = cookie.domain
+    if cookie.expires:
+        converted['expiry'] = int(cookie.expires)
+    return converted
+
+
+class SessionCache:
+    """Logs in once per app and role, then injects the session cookies into drivers and HTTP clients"""
+
+    def __init__(self, ttl: int = None):
+        self.config = MigrationConfig()
+        self.ttl = ttl or TEST_SETTINGS['SELENIUM']['SESSION_CACHE']['TTL']
+        self.base_urls = {
+            'laravel': self.config.LARAVEL_APP_URL,
+            'django': self.config.DJANGO_APP_URL
+        }
+        self._entries = {}
+        self.stats = {'hits': 0, 'logins': 0, 'invalidations': 0}
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check the cache TTL and the earliest cookie expiry"""
+        now = time.time()
+        if now - entry['obtained_at'] > self.ttl:
+            return False
+        expiries = [cookie['expiry'] for cookie in entry['cookies'] if 'expiry' in cookie]
+        return not expiries or min(expiries) > now + EXPIRY_MARGIN_SECONDS
+
+    def get_cookies(self, app: str, role: str = 'admin', driver=None,
+                    http_parity=None) -> List[Dict[str, Any]]:
+        """Return cached cookies for an app and role, logging in if needed"""
+        entry = self._entries.get((app, role))
+        if entry is not None and self._is_fresh(entry):
+            self.stats['hits'] += 1
+            return entry['cookies']
+
+        if driver is not None:
+            cookies = self._login_with_driver(app, role, driver)
+        elif http_parity is not None:
+            cookies = self._login_with_http(app, role, http_parity)
+        else:
+            raise ValueError("A driver or HTTP parity client is required to log in")
+
+        self.stats['logins'] += 1
+        self._entries[(app, role)] = {'cookies': cookies, 'obtained_at': time.time()}
+        return cookies
+
+    def invalidate(self, app: str, role: str = 'admin'):
+        """Forget the cookies for an app and role, e.g. after the server expired them"""
+        if self._entries.pop((app, role), None) is not None:
+            self.stats['invalidations'] += 1
+
+    def _credentials(self, role: str):
+        user = TEST_DATA['USERS'][role]
+        return user['email'], user['password']
+
+    def _login_with_driver(self, app: str, role: str, driver) -> List[Dict[str, Any]]:
+        """Log in through the UI once and capture the resulting cookies"""
+        email, password = self._credentials(role)
+        login_url = f"{self.base_urls[app]}{LOGIN_PATHS[app]}"
+
+        driver.delete_all_cookies()
+        driver.get(login_url)
+        wait_for_page_ready(driver, login_url)
+        driver.find_element(By.NAME, 'email').send_keys(email)
+        driver.find_element(By.NAME, 'password').send_keys(password)
+        driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]').click()
+        WebDriverWait(driver, TEST_SETTINGS['SELENIUM']['EXPLICIT_WAIT']).until(
+            lambda d: not self._on_login_page(app, d.current_url)
+        )
+        return driver.get_cookies()
+
+    def _login_with_http(self, app: str, role: str, http_parity) -> List[Dict[str, Any]]:
+        """Log in by posting the login form and capture the resulting cookies"""
+        email, password = self._credentials(role)
+        session = http_parity.sessions[app]
+        session.cookies.clear()
+        http_parity.login(app, email, password)
+        return [_requests_to_selenium(cookie) for cookie in session.cookies]
+
+    def _on_login_page(self, app: str, url: str) -> bool:
+        return is_login_page(app, url)
+
+    def inject_into_driver(self, driver, app: str, role: str = 'admin', path: str = '') -> bool:
+        """Open a page already authenticated; returns False if the cookies were rejected"""
+        self.add_cookies_to_driver(driver, app, role)
+        driver.get(f"{self.base_urls[app]}{path}")
+        if self._on_login_page(app, driver.current_url):
+            self.invalidate(app, role)
+            return False
+        return True
+
+    def add_cookies_to_driver(self, driver, app: str, role: str = 'admin', login_driver=None):
+        """Set the session cookies in a driver without opening any application page
+
+        A missing session is logged in with login_driver (default: driver itself),
+        which keeps a cold-cache driver from loading the login page.
+        """
+        cookies = self.get_cookies(app, role, driver=login_driver or driver)
+        base_url = self.base_urls[app]
+
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Chromium can set cookies for any origin without loading a page first
+            driver.execute_cdp_cmd('Network.setCookies', {
+                'cookies': [
+                    {**self._cdp_cookie(cookie), 'url': base_url} for cookie in cookies
+                ]
+            })
+        else:
+            # WebDriver only accepts cookies for the origin currently loaded
+            driver.get(f"{base_url}/favicon.ico")
+            for cookie in cookies:
+                driver.add_cookie({key: value for key, value in cookie.items() if key != 'domain'})
+
+    def _cdp_cookie(self, cookie: Dict[str, Any]) -> Dict[str, Any]:
+        converted = {
+            'name': cookie['name'],
+            'value': cookie['value'],
+            'path': cookie.get('path', '/'),
+            'secure': cookie.get('secure', False),
+            'httpOnly': cookie.get('httpOnly', False)
+        }
+        if 'expiry' in cookie:
+            converted['expires'] = cookie['expiry']
+        return converted
+
+    def apply_to_http_session(self, session, app: str, role: str = 'admin', http_parity=None):
+        """Copy cached cookies into a requests session"""
+        cookies = self.get_cookies(app, role, http_parity=http_parity)
+        host = urlparse(self.base_urls[app]).hostname
+        for cookie in cookies:
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', host), path=cookie.get('path', '/')
+            )
+
+    def report(self) -> Dict[str, Any]:
+        return {**self.stats, 'cached_sessions': len(self._entries)}
+
+
+# One cache per process; each pytest-xdist worker logs in for itself
+_cache = None
+
+
+def get_session_cache() -> SessionCache:
+    """Return this worker's session cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = SessionCache()
+    return _cache
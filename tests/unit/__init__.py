@@ -0,0 +1,3 @@
+"""
+Unit tests for the framework's pure helpers; they need no browser or database
+"""
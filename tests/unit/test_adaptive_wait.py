@@ -0,0 +1,104 @@
+"""
+Tests for route keys, learned route timeouts and the adaptive wait loop
+"""
+import json
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from tests.adaptive_wait import SCRIPT_TIMEOUT_MARGIN, AdaptiveWait, RouteTimeouts, route_key
+
+
+class FakeDriver:
+    def __init__(self, results, current_url='http://django/leads'):
+        self.results = list(results)
+        self.current_url = current_url
+        self.script_timeouts = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        return self.results.pop(0)
+
+
+def page(ready=True, ready_state='complete', complete_after=120, unloading=False):
+    return {'ready': ready, 'elapsed': 100, 'readyState': ready_state, 'completeAfter': complete_after,
+            'pending': 0, 'unloading': unloading}
+
+
+def timeouts(tmp_path, **kwargs):
+    options = {'history': 5, 'factor': 2.0, 'minimum': 1.0, 'maximum': 30.0, **kwargs}
+    return RouteTimeouts(tmp_path / 'route_timeouts.json', **options)
+
+
+def test_route_key_collapses_id_segments():
+    assert route_key('http://django/leads/42/edit?tab=notes') == 'django/leads/{id}/edit'
+    assert route_key('http://django/persons/0f8fad5b-d9cb-469f-a165-70867728950e') == 'django/persons/{id}'
+    assert route_key('http://django/files/507f1f77bcf86cd799439011') == 'django/files/{id}'
+    assert route_key('http://django/leads/v2') == 'django/leads/v2'
+    assert route_key('http://django') == 'django/'
+
+
+def test_route_timeouts_use_the_maximum_until_enough_samples(tmp_path):
+    store = timeouts(tmp_path)
+    store.record('django/leads', 2.0)
+    store.record('django/leads', 3.0)
+
+    assert store.timeout('django/leads') == 30.0
+    assert store.timeout(None) == 30.0
+
+    store.record('django/leads', 4.0)
+    assert store.timeout('django/leads') == 8.0
+
+
+def test_route_timeouts_clamp_to_minimum_and_maximum(tmp_path):
+    store = timeouts(tmp_path)
+    for seconds in (0.1, 0.1, 0.1):
+        store.record('fast', seconds)
+        store.record('slow', seconds * 200)
+
+    assert store.timeout('fast') == 1.0
+    assert store.timeout('slow') == 30.0
+
+
+def test_route_timeouts_save_merges_with_other_workers(tmp_path):
+    other = timeouts(tmp_path)
+    other.record('django/leads', 1.0)
+    other.save()
+    store = timeouts(tmp_path)
+    for seconds in (2.0, 3.0, 4.0, 5.0, 6.0):
+        store.record('django/leads', seconds)
+
+    store.save()
+
+    saved = json.loads((tmp_path / 'route_timeouts.json').read_text())['routes']['django/leads']
+    assert saved['samples'] == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert timeouts(tmp_path).samples['django/leads'] == saved['samples']
+
+
+def test_wait_after_click_records_the_landing_route(tmp_path):
+    engine = AdaptiveWait(timeouts(tmp_path), quiet_period_ms=0, poll_interval_ms=10)
+    driver = FakeDriver([page()], current_url='http://django/leads/7')
+    engine.navigated(driver, 'http://django/leads')
+
+    engine.wait(driver, after_action=True)
+
+    assert list(engine.timeouts.samples) == ['django/leads/{id}']
+    assert engine._routes[driver] == 'django/leads/{id}'
+
+
+def test_wait_restores_a_raised_script_timeout(tmp_path):
+    engine = AdaptiveWait(timeouts(tmp_path), quiet_period_ms=0, poll_interval_ms=10)
+    loading = page(ready=False, ready_state='loading', complete_after=None)
+    # Once for the learned limit, once more for the extended one
+    driver = FakeDriver([loading, loading])
+
+    with pytest.raises(TimeoutException):
+        engine.wait(driver, 'http://django/reports', timeout=60)
+
+    default = 30.0 + SCRIPT_TIMEOUT_MARGIN
+    assert driver.script_timeouts == [default, 60 + SCRIPT_TIMEOUT_MARGIN, default]
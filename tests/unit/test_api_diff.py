@@ -0,0 +1,57 @@
+"""
+Tests for the recursive JSON structure diff
+"""
+from tests.api_diff import JsonStructureDiff, json_type
+
+
+def test_json_type_treats_ints_and_floats_alike():
+    assert json_type(1) == json_type(1.5) == 'number'
+    assert json_type(True) == 'boolean'
+    assert json_type(None) == 'null'
+
+
+def test_diff_reports_paths_and_kinds():
+    differ = JsonStructureDiff(ignore_paths=[])
+    report = differ.diff(
+        {'data': [{'name': 'Ada', 'score': 1}], 'total': 1},
+        {'data': [{'name': 'Ada', 'score': '1'}], 'count': 1}
+    )
+
+    kinds = {difference['path']: difference['kind'] for difference in report['differences']}
+    assert kinds == {'$.data[0].score': 'type', '$.total': 'missing', '$.count': 'extra'}
+
+
+def test_default_ignores_host_specific_pagination_urls():
+    laravel = {
+        'data': [{'id': 1, 'name': 'Ada'}],
+        'links': {'next': 'http://laravel:8000/api/leads?page=2', 'prev': None},
+        'meta': {'path': 'http://laravel:8000/api/leads',
+                 'links': [{'url': 'http://laravel:8000/api/leads?page=1', 'label': '1'}]},
+        'next_page_url': 'http://laravel:8000/api/leads?page=2'
+    }
+    django = {
+        'data': [{'id': 7, 'name': 'Ada'}],
+        'links': {'next': 'http://django:8001/api/leads/?page=2', 'prev': None},
+        'meta': {'path': 'http://django:8001/api/leads/',
+                 'links': [{'url': 'http://django:8001/api/leads/?page=1', 'label': '1'}]},
+        'next_page_url': 'http://django:8001/api/leads/?page=2'
+    }
+
+    assert JsonStructureDiff().diff(laravel, django)['equal']
+
+    django['meta']['links'][0]['label'] = 'one'
+    django['data'][0]['name'] = 'Grace'
+    paths = [difference['path'] for difference in JsonStructureDiff().diff(laravel, django)['differences']]
+    assert paths == ['$.data[0].name', '$.meta.links[0].label']
+
+
+def test_ignore_patterns_match_any_index_with_literal_brackets():
+    differ = JsonStructureDiff(ignore_paths=['$.data[*].email', '$.items[0].id'])
+
+    assert differ.is_ignored('$.data[3].email')
+    assert differ.is_ignored('$.items[0].id')
+    assert not differ.is_ignored('$.items[1].id')
+    assert not differ.is_ignored('$.data3.email')
+
+    report = differ.diff({'data': [{'email': 'a@x', 'name': 'A'}]}, {'data': [{'email': 'b@x', 'name': 'B'}]})
+    assert [difference['path'] for difference in report['differences']] == ['$.data[0].name']
@@ -0,0 +1,66 @@
+"""
+Tests for corpus parsing and response comparison in the API replay harness
+"""
+import asyncio
+import json
+
+from scripts.performance.api_replay import ApiReplayHarness, ReplayResponse, read_ndjson
+
+
+def response(status, body=b'', content_type='application/json'):
+    headers = {'Content-Type': content_type} if content_type else {}
+    return ReplayResponse(status, headers, body, 0.01)
+
+
+def replay(request, laravel_response, django_response):
+    harness = ApiReplayHarness(laravel_url='http://laravel', django_url='http://django')
+    responses = {'laravel': laravel_response, 'django': django_response}
+
+    async def send(session, app, request):
+        return responses[app]
+
+    harness._send = send
+    asyncio.run(harness._replay_one({'laravel': None, 'django': None}, request))
+    return harness
+
+
+def test_read_ndjson_normalizes_records(tmp_path):
+    corpus = tmp_path / 'traffic.ndjson'
+    corpus.write_text(
+        json.dumps({'method': 'post', 'url': 'http://x/api/leads?page=2', 'body': {'a': 1},
+                    'headers': {'Cookie': 'secret', 'Accept': 'application/json'}}) + '\n\n'
+    )
+
+    (request,) = read_ndjson(corpus)
+
+    assert request['method'] == 'POST'
+    assert request['path'] == '/api/leads?page=2'
+    assert request['body'] == '{"a": 1}'
+    assert request['headers'] == {'Accept': 'application/json'}
+
+
+def test_head_with_json_content_type_compares_status_and_headers():
+    harness = replay({'id': '1', 'method': 'HEAD', 'path': '/api/leads'},
+                     response(200), response(200, content_type='application/json; charset=utf-8'))
+    assert harness.stats['matched'] == 1
+
+
+def test_no_content_and_empty_bodies_match():
+    harness = replay({'id': '1', 'method': 'DELETE', 'path': '/api/leads/1'},
+                     response(204), response(204, content_type=None))
+    assert harness.stats['matched'] == 0 and harness.mismatches[0]['message'].startswith('Content-Type')
+
+    harness = replay({'id': '2', 'method': 'GET', 'path': '/api/ping'}, response(200), response(200))
+    assert harness.stats['matched'] == 1
+
+
+def test_bodyless_status_mismatch_is_reported():
+    harness = replay({'id': '1', 'method': 'HEAD', 'path': '/api/leads'}, response(200), response(404))
+    assert harness.stats['mismatched'] == 1
+    assert 'Status codes' in harness.mismatches[0]['message']
+
+
+def test_json_bodies_are_still_diffed():
+    harness = replay({'id': '1', 'method': 'GET', 'path': '/api/leads'},
+                     response(200, b'{"name": "Ada"}'), response(200, b'{"name": "Grace"}'))
+    assert harness.stats['mismatched'] == 1
@@ -0,0 +1,81 @@
+"""
+Tests for the browser comparison helpers of BaseMigrationTest, using fake drivers
+"""
+import pytest
+
+from tests import base_migration_test
+from tests.base_migration_test import BaseMigrationTest
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.visited = []
+        self.quit_called = False
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def set_window_size(self, width, height):
+        pass
+
+    def execute_script(self, script, selectors, attributes):
+        return {name: {'present': True, 'text': self.name, 'attributes': {}} for name in selectors}
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeSessionCache:
+    def __init__(self, accept=(True,)):
+        self.injected = []
+        self.accept = list(accept)
+
+    def inject_into_driver(self, driver, app, role='admin', path=''):
+        self.injected.append((driver.name, app, role, path))
+        driver.get(f'{app}{path}')
+        return self.accept.pop(0) if self.accept else True
+
+
+@pytest.fixture
+def browser_test(monkeypatch):
+    monkeypatch.setattr(base_migration_test, 'wait_for_page_ready', lambda *args, **kwargs: None)
+    test = BaseMigrationTest()
+    test.driver = FakeDriver('laravel-driver')
+    test.driver_pool = None
+    return test
+
+
+def test_concurrent_compare_logs_both_sessions_in(browser_test, monkeypatch):
+    cache = FakeSessionCache()
+    monkeypatch.setattr(base_migration_test, 'get_session_cache', lambda: cache)
+    django_driver = FakeDriver('django-driver')
+    browser_test._create_driver = lambda: django_driver
+
+    result = browser_test.compare_page_elements_concurrent(
+        '/leads', '/leads/', {'title': 'h1'}, role='sales'
+    )
+
+    assert sorted(cache.injected) == [('django-driver', 'django', 'sales', '/leads/'),
+                                      ('laravel-driver', 'laravel', 'sales', '/leads')]
+    assert django_driver.visited == ['django/leads/']
+    assert browser_test.driver.visited == ['laravel/leads']
+    assert result['laravel'] == {'title': 'laravel-driver'}
+    assert django_driver.quit_called
+
+
+def test_login_as_retries_a_rejected_session_once(browser_test, monkeypatch):
+    cache = FakeSessionCache(accept=[False, True])
+    monkeypatch.setattr(base_migration_test, 'get_session_cache', lambda: cache)
+
+    browser_test.login_as('laravel', 'admin', '/leads')
+
+    assert len(cache.injected) == 2
+
+
+def test_login_as_fails_when_the_retry_is_rejected_too(browser_test, monkeypatch):
+    cache = FakeSessionCache(accept=[False, False])
+    monkeypatch.setattr(base_migration_test, 'get_session_cache', lambda: cache)
+
+    with pytest.raises(pytest.fail.Exception, match='login page'):
+        browser_test.login_as('laravel', 'admin', '/leads')
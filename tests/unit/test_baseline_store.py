@@ -0,0 +1,65 @@
+"""
+Tests for the cross-run performance baseline store
+"""
+from types import SimpleNamespace
+
+from scripts.performance.baseline_store import PerformanceBaselineStore, sketch
+from tests.conftest import _baseline_run_id
+
+
+def make_store(tmp_path, run_id):
+    return PerformanceBaselineStore(root=tmp_path, revision='abc', run_id=run_id,
+                                    config_path=tmp_path / 'missing.json', min_runs=3)
+
+
+def test_sketch_keeps_quantiles():
+    summary = sketch(list(range(1, 101)))
+    assert summary['count'] == 100 and summary['p50'] == 50.5
+    assert len(summary['quantiles']) == 21
+
+
+def test_regression_against_earlier_runs_of_the_same_test(tmp_path):
+    for run in range(4):
+        store = make_store(tmp_path, f'run-{run}')
+        store.record('db_query', 'select ?', 'django', [10.0, 11.0, 12.0], test='t::a')
+        store.record('db_query', 'select ?', 'django', [50.0, 51.0], test='t::b')
+        store.flush()
+
+    store = make_store(tmp_path, 'run-4')
+    store.record('db_query', 'select ?', 'django', [30.0, 31.0, 32.0], test='t::a')
+    store.record('db_query', 'select ?', 'django', [50.0, 51.0], test='t::b')
+
+    assert [check['status'] for check in store.check_run()] == ['regression', 'ok']
+    assert store.check_run()[0]['baseline_runs'] == 4
+
+
+def test_records_of_the_shared_run_id_are_not_their_own_baseline(tmp_path):
+    for worker in range(3):
+        store = make_store(tmp_path, 'shared-run')
+        store.record('page_load', '/leads', 'django', [100.0])
+        store.flush()
+
+    assert make_store(tmp_path, 'shared-run').baseline(
+        {'kind': 'page_load', 'key': '/leads', 'side': 'django', 'environment': store.environment,
+         'run_id': 'shared-run'}
+    ) == []
+
+
+def test_query_metrics_are_recorded_with_test_context(tmp_path):
+    store = make_store(tmp_path, 'run')
+    metrics = SimpleNamespace(stats=lambda: [SimpleNamespace(fingerprint='select ?', side='laravel',
+                                                             samples=[0.001, 0.002])])
+
+    store.record_query_metrics(metrics, test='tests/test_leads.py::test_list')
+
+    [record] = store.records
+    assert record['test'] == 'tests/test_leads.py::test_list'
+    assert record['p50'] == 1.5
+
+
+def test_workers_use_the_controllers_run_id():
+    controller = SimpleNamespace()
+    run_id = _baseline_run_id(controller)
+
+    assert _baseline_run_id(controller) == run_id
+    assert _baseline_run_id(SimpleNamespace(workerinput={'baseline_run_id': run_id})) == run_id
@@ -0,0 +1,139 @@
+"""
+Tests for COPY text encoding, copy ordering and restarts in the bulk copy engine
+"""
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from scripts.migration.bulk_copy import (
+    BulkCopyEngine, CopyCheckpointStore, _copy_boolean, _copy_bytea, _copy_text,
+    column_encoders, copy_order, encode_rows, reference_cycles
+)
+
+
+class FakeCursor:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+
+class FakeConnection:
+    def __init__(self, statements):
+        self.statements = statements
+
+    def cursor(self):
+        return FakeCursor(self.statements)
+
+    def commit(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.statements = []
+
+    @contextmanager
+    def django_connection(self):
+        yield FakeConnection(self.statements)
+
+
+class RecordingEngine(BulkCopyEngine):
+    """Copies nothing; records what would run and in which order"""
+
+    def __init__(self, dependencies, tmp_path, **kwargs):
+        super().__init__(database=FakeDatabase(),
+                         checkpoints=CopyCheckpointStore(str(tmp_path / 'checkpoints.json')),
+                         config_path=str(tmp_path / 'missing.json'), **kwargs)
+        self.dependencies = dependencies
+        self.copied = []
+        self._copied_lock = threading.Lock()
+
+    def foreign_key_dependencies(self, table_names):
+        return {table: set(self.dependencies.get(table, set())) for table in table_names}
+
+    def copy_table(self, table_name, resume=True, clear=True):
+        with self._copied_lock:
+            self.copied.append((table_name, resume, clear))
+        return {'status': 'completed', 'rows_copied': 0, 'bytes_copied': 0}
+
+
+def test_copy_text_escapes_copy_delimiters():
+    assert _copy_text('a\tb\nc\\d\re\x00') == 'a\\tb\\nc\\\\d\\re'
+    assert _copy_text(b'caf\xc3\xa9') == 'café'
+
+
+def test_copy_text_formats_temporal_and_numeric_values():
+    assert _copy_text(datetime(2024, 1, 2, 3, 4, 5)) == '2024-01-02 03:04:05'
+    assert _copy_text(date(2024, 1, 2)) == '2024-01-02'
+    assert _copy_text(timedelta(hours=26, minutes=3, seconds=4)) == '26:03:04.000000'
+    assert _copy_text(-timedelta(seconds=90, microseconds=5)) == '-00:01:30.000005'
+    assert _copy_text(Decimal('1E+2')) == '100'
+    assert _copy_text({'a': [1, 'x']}) == '{"a": [1, "x"]}'
+
+
+def test_copy_bytea_and_boolean():
+    assert _copy_bytea(b'\x00\xff') == '\\\\x00ff'
+    assert _copy_bytea('A') == '\\\\x41'
+    assert _copy_boolean(1) == 't'
+    assert _copy_boolean(0) == 'f'
+
+
+def test_encode_rows_writes_nulls_and_a_trailing_newline():
+    encoders = column_encoders(['integer', 'boolean', 'bytea'])
+
+    payload = encode_rows([(1, 1, b'\x01'), (2, None, None)], encoders)
+
+    assert payload == b'1\tt\t\\\\x01\n2\t\\N\t\\N\n'
+
+
+def test_copy_order_levels_parents_first():
+    dependencies = {'leads': {'users'}, 'notes': {'leads', 'users'}, 'users': set()}
+
+    assert copy_order(['notes', 'leads', 'users'], dependencies) == [['users'], ['leads'], ['notes']]
+
+
+def test_copy_order_puts_tables_referencing_a_cycle_after_it():
+    dependencies = {'x': {'y'}, 'y': {'x'}, 'a': {'y'}}
+
+    assert reference_cycles(['a', 'x', 'y'], dependencies) == [['x', 'y']]
+    assert copy_order(['a', 'x', 'y'], dependencies) == [['x', 'y'], ['a']]
+
+
+def test_copy_order_ignores_self_references_and_outside_tables():
+    dependencies = {'categories': {'categories', 'sites'}, 'sites': set()}
+
+    assert reference_cycles(['categories'], dependencies) == []
+    assert copy_order(['categories'], dependencies) == [['categories']]
+
+
+def test_copy_tables_waits_for_cycle_parents(tmp_path):
+    engine = RecordingEngine({'x': {'y'}, 'y': {'x'}, 'a': {'y'}}, tmp_path, workers=1)
+
+    engine.copy_tables(['a', 'x', 'y'])
+
+    assert [table for table, _, _ in engine.copied] == ['x', 'y', 'a']
+
+
+def test_restart_clears_children_before_any_copy(tmp_path):
+    engine = RecordingEngine({'leads': {'users'}, 'notes': {'leads'}}, tmp_path)
+    for table in ('users', 'leads', 'notes'):
+        engine.checkpoints.update(table, {'status': 'completed'})
+
+    engine.copy_tables(['users', 'leads', 'notes'], resume=False)
+
+    assert engine.db.statements == ['DELETE FROM "notes"', 'DELETE FROM "leads"', 'DELETE FROM "users"']
+    assert all(clear is False for _, _, clear in engine.copied)
+
+
+def test_restarting_a_parent_restarts_completed_children(tmp_path):
+    engine = RecordingEngine({'leads': {'users'}}, tmp_path, truncate=True)
+    engine.checkpoints.update('users', {'status': 'in_progress', 'key': None})
+    engine.checkpoints.update('leads', {'status': 'completed'})
+
+    engine.copy_tables(['users', 'leads'])
+
+    assert engine.db.statements == ['TRUNCATE "leads", "users" CASCADE']
+    assert ('leads', False, False) in engine.copied
@@ -0,0 +1,192 @@
+"""
+Tests for the async database interface, using stub connections
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from config.database_config import AsyncConnection, DatabaseConfig
+
+
+class StubCursor:
+    rowcount = 3
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        self.connection.executed.append((query, params, threading.current_thread().name))
+
+    def fetchone(self):
+        return (1,)
+
+    def fetchall(self):
+        return [(1,), (2,)]
+
+    def close(self):
+        self.connection.cursors_closed += 1
+
+
+class StubConnection:
+    def __init__(self):
+        self.executed = []
+        self.cursors_closed = 0
+        self.cursor_kwargs = []
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs.append(kwargs)
+        return StubCursor(self)
+
+
+class StubDatabase(DatabaseConfig):
+    """Blocking connections are stubs; table info comes from a dict or raises"""
+
+    def __init__(self, tables=None, **kwargs):
+        super().__init__(instrument_queries=False, **kwargs)
+        self.tables = tables or {}
+        self.connection = StubConnection()
+        self.events = []
+
+    @contextmanager
+    def laravel_connection(self):
+        self.events.append(('enter', threading.current_thread().name))
+        try:
+            yield self.connection
+        except Exception as e:
+            self.events.append(('error', type(e).__name__))
+            raise
+        finally:
+            self.events.append(('exit', threading.current_thread().name))
+
+    def get_laravel_table_info(self, table_name):
+        return self._info('laravel', table_name)
+
+    def get_django_table_info(self, table_name):
+        return self._info('django', table_name)
+
+    def _info(self, side, table_name):
+        info = self.tables[side][table_name]
+        if isinstance(info, Exception):
+            raise info
+        return info
+
+
+@pytest.fixture
+def database():
+    database = StubDatabase()
+    yield database
+    database.close()
+
+
+def test_run_blocking_offloads_to_the_database_executor(database):
+    thread_name = asyncio.run(database.run_blocking(lambda: threading.current_thread().name))
+
+    assert thread_name.startswith('db-async')
+    assert thread_name != threading.current_thread().name
+
+
+def test_async_connection_runs_queries_in_the_executor_and_closes_cursors(database):
+    async def work():
+        async with database.alaravel_connection() as conn:
+            assert isinstance(conn, AsyncConnection)
+            rows = await conn.fetchall("SELECT id FROM users WHERE id > %s", (0,), dictionary=True)
+            row = await conn.fetchone("SELECT 1")
+            count = await conn.execute("DELETE FROM sessions")
+            return rows, row, count
+
+    rows, row, count = asyncio.run(work())
+
+    assert (rows, row, count) == ([(1,), (2,)], (1,), 3)
+    assert database.connection.cursor_kwargs[0] == {'dictionary': True}
+    assert database.connection.cursors_closed == 3
+    assert all(thread.startswith('db-async') for _, _, thread in database.connection.executed)
+    assert database.connection.executed[1][1] is None
+
+
+def test_async_connection_exits_the_blocking_context_on_error(database):
+    async def work():
+        async with database.alaravel_connection():
+            raise ValueError('check failed')
+
+    with pytest.raises(ValueError):
+        asyncio.run(work())
+
+    assert [event for event, _ in database.events] == ['enter', 'error', 'exit']
+    assert all(thread.startswith('db-async') for event, thread in database.events if event != 'error')
+
+
+def test_async_connection_exits_the_blocking_context_on_success(database):
+    async def work():
+        async with database.alaravel_connection() as conn:
+            return await conn.run(lambda connection: connection is database.connection)
+
+    assert asyncio.run(work()) is True
+    assert [event for event, _ in database.events] == ['enter', 'exit']
+
+
+def test_compare_table_structures_async_reports_a_failing_side():
+    database = StubDatabase({
+        'laravel': {'users': [{'Field': 'id'}]},
+        'django': {'users': RuntimeError('relation "users" does not exist')}
+    })
+
+    result = asyncio.run(database.compare_table_structures_async('users'))
+    database.close()
+
+    assert result == {'error': 'relation "users" does not exist', 'laravel': None, 'django': None,
+                      'comparison': None}
+
+
+def test_compare_tables_keeps_healthy_tables_when_one_side_fails():
+    database = StubDatabase({
+        'laravel': {'users': [{'Field': 'id'}], 'leads': [{'Field': 'id'}, {'Field': 'title'}]},
+        'django': {'users': [{'column_name': 'id'}], 'leads': ConnectionError('server closed the connection')}
+    })
+
+    results = database.compare_tables(['users', 'leads'])
+    database.close()
+
+    assert list(results) == ['users', 'leads']
+    assert results['users']['comparison'] == {'column_count_match': True, 'laravel_columns': 1,
+                                              'django_columns': 1}
+    assert results['leads']['error'] == 'server closed the connection'
+
+
+def test_gather_paired_bounds_concurrency_and_keeps_keys(database):
+    running = {'now': 0, 'peak': 0}
+
+    async def check(value):
+        running['now'] += 1
+        running['peak'] = max(running['peak'], running['now'])
+        await asyncio.sleep(0.01)
+        running['now'] -= 1
+        return value
+
+    results = asyncio.run(database.gather_paired({name: check(name * 2) for name in 'abcd'}, concurrency=2))
+
+    assert results == {'a': 'aa', 'b': 'bb', 'c': 'cc', 'd': 'dd'}
+    assert running['peak'] == 2
+
+
+def test_gather_paired_propagates_a_failing_check(database):
+    async def ok():
+        return 'ok'
+
+    async def failing():
+        raise RuntimeError('laravel side failed')
+
+    with pytest.raises(RuntimeError, match='laravel side failed'):
+        asyncio.run(database.gather_paired({'ok': ok(), 'failing': failing()}))
+
+
+def test_close_shuts_the_executor_down(database):
+    executor = database.executor
+    asyncio.run(database.run_blocking(time.sleep, 0))
+
+    database.close()
+
+    assert database._executor is None
+    assert executor._shutdown
@@ -0,0 +1,138 @@
+"""
+Tests for the per-worker WebDriver session pool, using fake drivers
+"""
+import threading
+
+from config.test_settings import TEST_SETTINGS
+from tests.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    def __init__(self, alive=True, reset_error=None):
+        self.alive = alive
+        self.reset_error = reset_error
+        self.window_handles = ['main']
+        self.current_handle = 'main'
+        self.switch_to = FakeSwitchTo(self)
+        self.visited = []
+        self.cookies_deleted = 0
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError('session deleted')
+        return self.visited[-1] if self.visited else 'about:blank'
+
+    def get(self, url):
+        if self.reset_error:
+            raise self.reset_error
+        self.visited.append(url)
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def delete_all_cookies(self):
+        self.cookies_deleted += 1
+
+    def execute_script(self, script):
+        pass
+
+    def set_window_size(self, width, height):
+        self.size = (width, height)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self, **driver_options):
+        self.created = []
+        self.driver_options = driver_options
+
+    def __call__(self):
+        self.created.append(FakeDriver(**self.driver_options))
+        return self.created[-1]
+
+
+def test_released_sessions_are_reset_and_reused():
+    factory = Factory()
+    pool = DriverPool(factory, reset_origins=['http://laravel/', 'http://django'])
+    driver = pool.acquire()
+    driver.window_handles.append('popup')
+    driver.current_handle = 'popup'
+
+    pool.release(driver)
+
+    assert driver.window_handles == ['main']
+    assert driver.visited == ['http://laravel/favicon.ico', 'http://django/favicon.ico', 'about:blank']
+    assert driver.cookies_deleted == 2
+    assert driver.size == TEST_SETTINGS['SELENIUM']['WINDOW_SIZE']
+    assert pool.acquire() is driver
+    assert pool.stats['created'] == 1 and pool.stats['hits'] == 1
+    assert pool.hit_rate() == 0.5
+
+
+def test_sessions_are_recycled_after_max_uses():
+    factory = Factory()
+    pool = DriverPool(factory, max_uses=2)
+
+    for _ in range(3):
+        pool.release(pool.acquire())
+
+    assert len(factory.created) == 2
+    assert factory.created[0].quit_called
+    assert pool.stats['recycled'] == 1
+    assert pool.report()['idle_sessions'] == 1
+
+
+def test_failed_and_unresettable_sessions_are_discarded():
+    factory = Factory()
+    pool = DriverPool(factory)
+    failed = pool.acquire()
+    pool.release(failed, failed=True)
+
+    broken = DriverPool(Factory(reset_error=RuntimeError('browser crashed')))
+    unresettable = broken.acquire()
+    broken.release(unresettable)
+
+    assert failed.quit_called and pool.stats['discarded_on_failure'] == 1
+    assert unresettable.quit_called and broken.stats['reset_failures'] == 1
+    assert pool.report()['idle_sessions'] == broken.report()['idle_sessions'] == 0
+
+
+def test_dead_idle_sessions_are_replaced():
+    factory = Factory()
+    pool = DriverPool(factory)
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.alive = False
+
+    replacement = pool.acquire()
+
+    assert replacement is not driver
+    assert driver.quit_called
+    assert pool.stats['hits'] == 0 and pool.stats['created'] == 2
+
+
+def test_concurrent_releases_count_every_session():
+    factory = Factory()
+    pool = DriverPool(factory, max_uses=1)
+    drivers = [pool.acquire() for _ in range(20)]
+
+    threads = [threading.Thread(target=pool.release, args=(driver,)) for driver in drivers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.stats['recycled'] == 20
+    assert pool.stats['acquired'] == pool.stats['created'] == 20
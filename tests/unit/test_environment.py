@@ -0,0 +1,107 @@
+"""
+Tests for environment file loading, ${VAR} expansion and lazily resolved settings
+"""
+import pytest
+
+from config import environment, test_settings
+from config.environment import (
+    current_environment, environment_value, expand_vars, lazy_setting, load_environment,
+    reset_settings, resolve_setting
+)
+
+
+@pytest.fixture
+def environments(tmp_path, monkeypatch):
+    monkeypatch.setattr(environment, 'ENVIRONMENTS_DIR', tmp_path)
+    monkeypatch.delenv('TEST_ENVIRONMENT', raising=False)
+    reset_settings()
+    yield tmp_path
+    reset_settings()
+
+
+def test_expand_vars_substitutes_defaults_and_nested_values(monkeypatch):
+    monkeypatch.setenv('DB_HOST', 'db.internal')
+    monkeypatch.delenv('DB_PASSWORD', raising=False)
+    monkeypatch.delenv('DB_PORT', raising=False)
+
+    expanded = expand_vars({
+        'url': 'mysql://${DB_HOST}:${DB_PORT:-3306}/crm',
+        'password': '${DB_PASSWORD}',
+        'replicas': ['${DB_HOST:-unused}', 5],
+        'debug': True
+    })
+
+    assert expanded == {'url': 'mysql://db.internal:3306/crm', 'password': '',
+                        'replicas': ['db.internal', 5], 'debug': True}
+
+
+def test_expand_vars_keeps_an_empty_default_and_plain_dollars(monkeypatch):
+    monkeypatch.delenv('UNSET_VALUE', raising=False)
+
+    assert expand_vars('${UNSET_VALUE:-}') == ''
+    assert expand_vars('cost $5 ${not a var}') == 'cost $5 ${not a var}'
+
+
+def test_current_environment_shares_the_test_settings_default(monkeypatch):
+    assert test_settings.ENVIRONMENT == current_environment()
+
+    monkeypatch.delenv('TEST_ENVIRONMENT', raising=False)
+    assert current_environment() == 'local'
+    monkeypatch.setenv('TEST_ENVIRONMENT', 'staging')
+    assert current_environment() == 'staging'
+
+
+def test_environment_file_is_only_read_when_selected(environments, monkeypatch):
+    (environments / 'local.yml').write_text('applications:\n  laravel:\n    url: http://yml:8000\n')
+
+    assert environment_value('applications.laravel.url') is None
+
+    monkeypatch.setenv('TEST_ENVIRONMENT', 'local')
+    assert environment_value('applications.laravel.url') == 'http://yml:8000'
+    assert environment_value('applications.django.url', 'fallback') == 'fallback'
+    assert load_environment('missing') == {}
+
+
+def test_environment_file_is_parsed_once_and_copied(environments, monkeypatch):
+    path = environments / 'staging.yml'
+    path.write_text('selenium:\n  grid_url: ${GRID_URL:-http://grid:4444}\n')
+    monkeypatch.delenv('GRID_URL', raising=False)
+
+    loaded = load_environment('staging')
+    loaded['selenium']['grid_url'] = 'mutated'
+    path.write_text('selenium:\n  grid_url: http://changed\n')
+
+    assert load_environment('staging') == {'selenium': {'grid_url': 'http://grid:4444'}}
+    reset_settings()
+    assert load_environment('staging') == {'selenium': {'grid_url': 'http://changed'}}
+
+
+def test_resolve_setting_prefers_variable_then_file_then_default(environments, monkeypatch):
+    (environments / 'ci.yml').write_text('selenium:\n  explicit_wait: "45"\n')
+    monkeypatch.setenv('TEST_ENVIRONMENT', 'ci')
+    monkeypatch.delenv('SELENIUM_EXPLICIT_WAIT', raising=False)
+
+    assert resolve_setting('SELENIUM_EXPLICIT_WAIT', 'selenium.explicit_wait', 30, int) == 45
+    monkeypatch.setenv('SELENIUM_EXPLICIT_WAIT', '12')
+    assert resolve_setting('SELENIUM_EXPLICIT_WAIT', 'selenium.explicit_wait', 30, int) == 12
+    assert resolve_setting(None, 'selenium.missing', 30, int) == 30
+    assert resolve_setting(None, 'selenium.missing') is None
+
+
+def test_lazy_setting_resolves_once_until_reset(environments):
+    calls = []
+
+    class Settings:
+        @lazy_setting
+        def URL():
+            """Application URL"""
+            calls.append(1)
+            return f'http://app/{len(calls)}'
+
+    assert Settings.URL == 'http://app/1'
+    assert Settings().URL == 'http://app/1'
+    assert len(calls) == 1
+    assert Settings.__dict__['URL'].__doc__ == 'Application URL'
+
+    reset_settings(Settings)
+    assert Settings.URL == 'http://app/2'
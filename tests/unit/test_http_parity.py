@@ -0,0 +1,113 @@
+"""
+Tests for the HTTP parity helpers: result building, login checks and the browser fallback
+"""
+import pytest
+import requests
+
+from tests import base_migration_test
+from tests.http_parity import HttpParityTest, element_comparison, is_login_page
+
+
+class FakeResponse:
+    def __init__(self, url, text=''):
+        self.url = url
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, final_url=None):
+        self.final_url = final_url
+        self.posted = None
+        self.redirects = {}
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.redirects.get(url, url), '<form><input name="_token" value="abc"></form>')
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.posted = data
+        return FakeResponse(self.final_url)
+
+    def close(self):
+        pass
+
+
+def test_element_comparison_reports_missing_selectors():
+    present = {'title': {'present': True, 'text': 'Leads', 'attributes': {}}}
+    missing = {'title': {'present': False, 'text': None, 'attributes': {}}}
+
+    result = element_comparison(present, missing, {'title': 'h1'})
+
+    assert result['laravel'] == {'title': 'Leads'}
+    assert result['django'] == {'title': "ERROR: no element matches selector 'h1'"}
+    assert result['comparison'] == {'title': False}
+    assert result['details']['django'] is missing
+
+
+def test_is_login_page_ignores_trailing_slash_and_query():
+    assert is_login_page('laravel', 'http://app/login/?next=/leads')
+    assert is_login_page('django', 'http://app/login')
+    assert not is_login_page('django', 'http://app/dashboard/')
+
+
+def test_login_rejected_when_redirected_back_to_the_form():
+    parity = HttpParityTest()
+    parity.sessions['laravel'] = FakeSession(final_url=f"{parity.base_urls['laravel']}/login")
+
+    with pytest.raises(requests.HTTPError, match='redirected back'):
+        parity.login('laravel', 'admin@example.com', 'wrong')
+    assert parity.sessions['laravel'].posted['_token'] == 'abc'
+
+
+def test_login_accepts_redirect_away_from_the_form():
+    parity = HttpParityTest()
+    parity.sessions['laravel'] = FakeSession(final_url=f"{parity.base_urls['laravel']}/dashboard")
+
+    assert parity.login('laravel', 'admin@example.com', 'secret').url.endswith('/dashboard')
+
+
+def test_fetch_page_rejects_a_redirect_to_the_login_page():
+    parity = HttpParityTest()
+    base = parity.base_urls['django']
+    parity.sessions['django'] = FakeSession()
+    parity.sessions['django'].redirects[f"{base}/leads/"] = f"{base}/login/?next=/leads/"
+
+    with pytest.raises(requests.HTTPError, match='not authenticated'):
+        parity.fetch_page('django', '/leads/')
+    assert parity.fetch_page('django', '/login/').find('input')['value'] == 'abc'
+
+
+class FakeBrowserTest:
+    def __init__(self):
+        self.roles = []
+
+    def compare_page_elements_concurrent(self, laravel_path, django_path, elements_to_compare,
+                                         attributes=None, role='admin'):
+        self.roles.append(role)
+        return {'comparison': {}}
+
+
+def test_browser_fallback_compares_as_the_current_role():
+    parity = HttpParityTest(browser_test=FakeBrowserTest())
+    parity.js_dependent_routes = ['/leads']
+
+    parity.compare_page_elements('/leads', '/leads/', {'title': 'h1'})
+    parity.role = 'sales'
+    result = parity.compare_page_elements('/leads', '/leads/', {'title': 'h1'})
+
+    assert parity.browser_test.roles == ['admin', 'sales']
+    assert result['mode'] == 'browser'
+
+
+def test_browser_fallback_starts_one_browser(monkeypatch):
+    started = []
+    monkeypatch.setattr(base_migration_test.BaseMigrationTest, 'setup_method',
+                        lambda self, method: started.append(self))
+    parity = HttpParityTest()
+
+    browser = parity._browser()
+
+    assert parity._browser() is browser
+    assert started == [browser]
@@ -0,0 +1,45 @@
+"""
+Tests for value normalization and row hashing in the incremental validator
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.validators.incremental_validator import hash_rows, normalize_value
+
+
+@pytest.mark.parametrize('value', [None, float('nan'), np.nan, pd.NaT, pd.NA, np.datetime64('NaT')])
+def test_normalize_value_maps_every_null_to_none(value):
+    assert normalize_value(value) is None
+
+
+def test_normalize_value_aligns_driver_representations():
+    aware = datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+    assert normalize_value(aware) == '2024-01-01 10:00:00'
+    assert normalize_value(Decimal('1.500')) == '1.5'
+    assert normalize_value(True) == '1'
+    assert normalize_value({'b': 1, 'a': 2}) == normalize_value(b'{"a": 2, "b": 1}')
+
+
+def test_hash_rows_null_does_not_depend_on_column_dtype():
+    datetimes = pd.DataFrame({'seen_at': pd.to_datetime(['2024-01-01', None])})
+    objects = pd.DataFrame({'seen_at': pd.Series([datetime(2024, 1, 1), None], dtype=object)})
+
+    assert datetimes['seen_at'].dtype != objects['seen_at'].dtype
+    assert (hash_rows(datetimes, ['seen_at']) == hash_rows(objects, ['seen_at'])).all()
+
+
+def test_hash_rows_stable_after_concat():
+    fetched = pd.DataFrame({'id': [1], 'seen_at': pd.to_datetime([None])})
+    filled = pd.concat([pd.DataFrame({'id': [2], 'seen_at': ['x']}), fetched], ignore_index=True)
+
+    assert hash_rows(fetched, ['id', 'seen_at'])[0] == hash_rows(filled, ['id', 'seen_at'])[1]
+
+
+def test_hash_rows_distinguishes_null_from_empty_string():
+    frame = pd.DataFrame({'name': pd.Series([None, ''], dtype=object)})
+    first, second = hash_rows(frame, ['name'])
+    assert first != second
@@ -0,0 +1,71 @@
+"""
+Tests for the key-array operations and side comparison of the integrity checker
+"""
+import numpy as np
+
+from scripts.validators.integrity_checker import (
+    IntegrityChecker, composite_hashes, duplicate_groups, find_orphans, key_array
+)
+
+
+def checker(tmp_path):
+    return IntegrityChecker(database=object(), config_path=str(tmp_path / 'missing.json'))
+
+
+def test_find_orphans_flags_keys_missing_from_parents():
+    parents = np.array([2, 4, 6], dtype=np.int64)
+    children = np.array([1, 2, 5, 6, 7, 4], dtype=np.int64)
+
+    assert find_orphans(children, parents).tolist() == [True, False, True, False, True, False]
+
+
+def test_find_orphans_without_parents_flags_every_child():
+    assert find_orphans(np.array([1, 2], dtype=np.int64), np.array([], dtype=np.int64)).tolist() == [True, True]
+
+
+def test_key_array_hashes_non_integer_keys_consistently():
+    first = key_array(['a1', 'b2'])
+    second = key_array(['b2'])
+
+    assert first.dtype == np.int64
+    assert first[1] == second[0]
+    assert key_array([3, 1]).tolist() == [3, 1]
+
+
+def test_duplicate_groups_counts_repeated_hashes():
+    values, counts = duplicate_groups(np.array([5, 3, 5, 9, 5, 3], dtype=np.uint64))
+
+    assert values.tolist() == [3, 5]
+    assert counts.tolist() == [2, 3]
+
+
+def test_composite_hashes_trim_and_casefold_text():
+    hashes = composite_hashes([('  Ann@Example.com ', 1), ('ann@example.com', 1), ('ann@example.com', 2)], 2)
+
+    assert hashes[0] == hashes[1]
+    assert hashes[1] != hashes[2]
+
+
+def test_compare_sides_reports_regressions(tmp_path):
+    laravel = {'orphans': {'leads.user_id': {'orphaned_rows': 1}}, 'duplicates': {}, 'required': {}}
+    django = {'orphans': {'leads.user_id': {'orphaned_rows': 3}}, 'duplicates': {}, 'required': {}}
+
+    comparison = checker(tmp_path).compare_sides(laravel, django)
+
+    assert comparison['orphans']['leads.user_id'] == {'laravel': 1, 'django': 3, 'delta': 2}
+    assert comparison['regressions'] == ['orphans: leads.user_id']
+    assert comparison['failures'] == []
+
+
+def test_compare_sides_counts_a_one_sided_error_as_a_failure(tmp_path):
+    laravel = {'orphans': {}, 'duplicates': {'persons(email)': {'duplicate_rows': 0}}, 'required': {}}
+    django = {'orphans': {}, 'duplicates': {'persons(email)': {'error': 'relation does not exist'}},
+              'required': {}}
+
+    comparison = checker(tmp_path).compare_sides(laravel, django)
+
+    row = comparison['duplicates']['persons(email)']
+    assert row['delta'] is None
+    assert row['errors'] == {'django': 'relation does not exist'}
+    assert comparison['failures'] == ['duplicates: persons(email) (failed on django)']
+    assert comparison['regressions'] == []
@@ -0,0 +1,52 @@
+"""
+Tests for the vectorized JSON column comparator
+"""
+import numpy as np
+import pandas as pd
+
+from scripts.validators.json_field_comparator import (
+    JsonFieldComparator, canonicalize_json, canonicalize_series, hash_series, _as_text
+)
+
+
+def test_canonicalize_json_sorts_keys_and_strips_whitespace():
+    assert canonicalize_json('{"b": 1, "a": [1, 2]}') == '{"a":[1,2],"b":1}'
+    assert canonicalize_json(b'{"a": 1}') == '{"a":1}'
+    assert canonicalize_json({'b': 2, 'a': 1}) == '{"a":1,"b":2}'
+
+
+def test_canonicalize_json_keeps_invalid_json_and_null():
+    assert canonicalize_json('not json') == 'not json'
+    assert canonicalize_json(None) is None
+
+
+def test_canonicalize_series_keeps_nulls():
+    values = pd.Series(['{"b":1,"a":2}', None, '{"a": 2, "b": 1}'])
+    canonical = canonicalize_series(values)
+    assert canonical[0] == canonical[2] == '{"a":2,"b":1}'
+    assert pd.isna(canonical[1])
+
+
+def test_hash_series_distinguishes_null_from_empty_string():
+    hashes = hash_series(pd.Series([None, '', 'x', 'x'], dtype=object))
+    assert hashes[0] != hashes[1]
+    assert hashes[2] == hashes[3]
+
+
+def test_as_text_encodes_decoded_json_columns():
+    assert _as_text({'a': 1}) == '{"a":1}'
+    assert _as_text(np.nan) is None
+
+
+def test_compare_frames_ignores_formatting_and_counts_missing_rows():
+    comparator = JsonFieldComparator(config_path='config/component_mapping.json')
+    laravel = pd.DataFrame({'id': [1, 2, 3], 'emails': ['[{"v": "a"}]', '{"x": 1}', '[]']})
+    django = pd.DataFrame({'id': [1, 2, 4], 'emails': [[{'v': 'a'}], '{"x": 2}', '[]']})
+
+    stats = comparator.compare_frames(laravel, django, ['emails'])['emails']
+
+    assert stats['rows_compared'] == 2
+    assert stats['mismatches'] == 1
+    assert stats['missing_in_django'] == 1
+    assert stats['missing_in_laravel'] == 1
+    assert stats['examples'][0]['id'] == 2
@@ -0,0 +1,43 @@
+"""
+Tests for the latency percentiles and the Mann-Whitney U test
+"""
+import numpy as np
+import pytest
+
+from scripts.performance.latency_stats import _average_ranks, compare_samples, mann_whitney_u, percentiles
+
+
+def test_average_ranks_share_ties():
+    ranks, ties = _average_ranks(np.array([10.0, 20.0, 10.0, 30.0]))
+    assert ranks.tolist() == [1.5, 3.0, 1.5, 4.0]
+    assert sorted(ties.tolist()) == [1, 1, 2]
+
+
+def test_mann_whitney_matches_the_normal_approximation_by_hand():
+    # U = 9 of 9 pairs; sigma = sqrt(9 / 12 * 7); continuity-corrected z = 4 / sigma
+    result = mann_whitney_u([1, 2, 3], [4, 5, 6])
+    assert result['u'] == 9.0
+    assert result['probability_candidate_slower'] == 1.0
+    assert result['z'] == pytest.approx(1.7457, abs=1e-4)
+    assert result['p_value'] == pytest.approx(0.0809, abs=1e-4)
+
+
+def test_mann_whitney_identical_samples_have_no_shift():
+    result = mann_whitney_u([5, 5, 5], [5, 5, 5])
+    assert result['p_value'] == 1.0 and result['probability_candidate_slower'] == 0.5
+    assert mann_whitney_u([], [1])['p_value'] is None
+
+
+def test_compare_samples_needs_significance_and_effect():
+    rng = np.random.default_rng(0)
+    laravel = rng.lognormal(3.0, 0.3, 500)
+
+    assert compare_samples(laravel, laravel * 1.5)['verdict'] == 'django_slower'
+    assert compare_samples(laravel, laravel * 0.6)['verdict'] == 'django_faster'
+    assert compare_samples(laravel, rng.permutation(laravel))['verdict'] == 'no_significant_difference'
+
+
+def test_percentiles_summary():
+    summary = percentiles(list(range(1, 101)))
+    assert summary['count'] == 100 and summary['p50'] == 50.5 and summary['mean'] == 50.5
+    assert percentiles([]) == {'count': 0}
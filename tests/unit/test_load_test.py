@@ -0,0 +1,44 @@
+"""
+Tests for load test scenario building and the seeded workload
+"""
+import json
+import random
+
+import pytest
+
+from scripts.performance.load_test import build_scenarios, make_user_class
+
+
+def test_build_scenarios_fills_parameters_and_skips_login(tmp_path):
+    config = tmp_path / 'components.json'
+    config.write_text(json.dumps({'components': {
+        'leads': {
+            'priority': 'high',
+            'laravel': {'routes': ['/leads', '/leads/{id}', '/login', '/leads/{slug}']},
+            'django': {'urls': ['/leads/', '/leads/<int:pk>/', '/login/', '/leads/<slug>/']}
+        }
+    }}))
+
+    scenarios = build_scenarios(str(config), route_params={'id': '7', 'pk': '7'})
+
+    assert [(s['laravel'], s['django'], s['weight']) for s in scenarios] == [
+        ('/leads', '/leads/', 3), ('/leads/7', '/leads/7/', 3)
+    ]
+
+
+def test_seeded_users_replay_the_same_sequence():
+    pytest.importorskip('locust')
+    scenarios = [{'name': f'/r{index}', 'component': 'c', 'weight': index + 1,
+                  'laravel': f'/r{index}', 'django': f'/r{index}/'} for index in range(3)]
+
+    def sequence(seed):
+        user_class = make_user_class(scenarios, 'django', login=False, rng=random.Random(seed))
+        user = type('User', (), {'client': type('Client', (), {})()})()
+        requested = []
+        user.client.get = lambda path, name: requested.append(path)
+        for _ in range(20):
+            user_class.tasks[0](user)
+            requested.append(user_class.wait_time(user))
+        return requested
+
+    assert sequence(42) == sequence(42)
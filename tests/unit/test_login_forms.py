@@ -0,0 +1,33 @@
+"""
+Tests for the login form helpers shared by browser, HTTP and load tests
+"""
+import subprocess
+import sys
+
+from tests.login_forms import csrf_token, is_login_page
+
+
+def test_csrf_token_in_either_attribute_order():
+    laravel = '<form><input type="hidden" name="_token" value="abc123"></form>'
+    django = "<input value='xyz' type='hidden' name='csrfmiddlewaretoken'>"
+
+    assert csrf_token('laravel', laravel) == 'abc123'
+    assert csrf_token('django', django) == 'xyz'
+
+
+def test_csrf_token_ignores_other_fields():
+    assert csrf_token('laravel', '<input name="email" value="a@b.c">') is None
+    assert csrf_token('django', None) is None
+
+
+def test_is_login_page():
+    assert is_login_page('laravel', 'http://app/login?redirect=/')
+    assert not is_login_page('laravel', 'http://app/login-help')
+
+
+def test_load_test_does_not_import_network_libraries():
+    # Locust monkey-patches sockets and ssl; anything imported earlier keeps the blocking versions
+    code = ("import sys; import scripts.performance.load_test; "
+            "print(sorted(m for m in ('requests', 'urllib3', 'ssl', 'selenium') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == '[]'
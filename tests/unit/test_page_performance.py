@@ -0,0 +1,110 @@
+"""
+Tests for page timing summaries and cold-cache measurements, using fake drivers
+"""
+from types import SimpleNamespace
+
+from config.test_settings import TEST_SETTINGS
+from tests import page_performance
+from tests.page_performance import PagePerformanceCollector, summarize
+
+TIMING = {
+    'ttfb': 10.0, 'response_end': 20.0, 'dom_interactive': 30.0, 'dom_content_loaded': 40.0,
+    'load': 50.0, 'resource_transfer_size': 100, 'slowest_resources': [{'name': 'app.js', 'duration': 5.0}]
+}
+
+
+class FakeDriver:
+    """WebDriver without CDP, so cold samples need a fresh browser"""
+
+    def __init__(self):
+        self.events = []
+
+    def set_window_size(self, width, height):
+        self.events.append(('size', width, height))
+
+    def get(self, url):
+        self.events.append(('get', url))
+
+    def execute_script(self, script, *args):
+        return TIMING
+
+    def quit(self):
+        self.events.append(('quit',))
+
+
+class FakeCdpDriver(FakeDriver):
+    """Chromium driver whose cache can be cleared in place"""
+
+    def execute_cdp_cmd(self, command, params):
+        self.events.append(('cdp', command))
+
+
+class FakeSessionCache:
+    def __init__(self):
+        self.calls = []
+
+    def add_cookies_to_driver(self, driver, app, role='admin', login_driver=None):
+        driver.events.append(('cookies', app, role))
+        self.calls.append(login_driver)
+
+
+def fake_base_test(driver, create_driver=None):
+    return SimpleNamespace(
+        driver=driver, _create_driver=create_driver,
+        config=SimpleNamespace(LARAVEL_APP_URL='http://laravel', DJANGO_APP_URL='http://django')
+    )
+
+
+def test_summarize_distribution():
+    summary = summarize([1.0, 2.0, 3.0, 4.0])
+    assert summary['median'] == 2.5
+    assert summary['p95'] == 4.0
+    assert summary['min'] == 1.0 and summary['max'] == 4.0
+    assert summarize([]) == {}
+
+
+def test_cold_samples_use_sized_authenticated_drivers(monkeypatch):
+    cache = FakeSessionCache()
+    monkeypatch.setattr(page_performance, 'get_session_cache', lambda: cache)
+    fresh_drivers = []
+
+    def create_driver():
+        fresh_drivers.append(FakeDriver())
+        return fresh_drivers[-1]
+
+    base_test = fake_base_test(FakeDriver(), create_driver)
+    collector = PagePerformanceCollector(base_test, repetitions=2, role='sales')
+
+    result = collector.measure('django', '/leads/', cache_mode='cold')
+
+    width, height = TEST_SETTINGS['SELENIUM']['WINDOW_SIZE']
+    assert len(fresh_drivers) == 2
+    for driver in fresh_drivers:
+        assert driver.events == [
+            ('size', width, height), ('cookies', 'django', 'sales'),
+            ('get', 'http://django/leads/'), ('quit',)
+        ]
+    assert cache.calls == [None, base_test.driver, base_test.driver]
+    assert result['distributions']['load']['median'] == 50.0
+
+
+def test_warm_samples_authenticate_the_test_driver_before_priming(monkeypatch):
+    monkeypatch.setattr(page_performance, 'get_session_cache', FakeSessionCache)
+    driver = FakeDriver()
+    collector = PagePerformanceCollector(fake_base_test(driver), repetitions=1, role='sales')
+
+    collector.measure('laravel', '/leads', cache_mode='warm')
+
+    assert driver.events == [('cookies', 'laravel', 'sales'),
+                             ('get', 'http://laravel/leads'), ('get', 'http://laravel/leads')]
+
+
+def test_cdp_cold_samples_authenticate_the_test_driver(monkeypatch):
+    monkeypatch.setattr(page_performance, 'get_session_cache', FakeSessionCache)
+    driver = FakeCdpDriver()
+    collector = PagePerformanceCollector(fake_base_test(driver), repetitions=1)
+
+    collector.measure('django', '/leads/', cache_mode='cold')
+
+    assert driver.events == [('cookies', 'django', 'admin'), ('cdp', 'Network.clearBrowserCache'),
+                             ('get', 'http://django/leads/')]
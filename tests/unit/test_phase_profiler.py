@@ -0,0 +1,94 @@
+"""
+Tests for phase attribution and aggregation in the phase profiler
+"""
+import time
+
+import pytest
+
+from tests.phase_profiler import PHASES, PhaseProfiler, summarize
+
+
+def record(wall, components, **phases):
+    return {'wall': wall, 'components': components, 'phases': {**dict.fromkeys(PHASES, 0.0), **phases}}
+
+
+def test_phases_are_noops_without_a_current_test():
+    profiler = PhaseProfiler()
+
+    with profiler.phase('login'):
+        pass
+
+    assert profiler.stop() is None
+
+
+def test_nested_phases_are_absorbed_by_the_outermost():
+    profiler = PhaseProfiler()
+    current = profiler.start('test_a')
+
+    with profiler.phase('login'):
+        with profiler.phase('navigation'):
+            time.sleep(0.01)
+        with profiler.phase('wait'):
+            pass
+    with profiler.phase('wait'):
+        pass
+
+    assert current.counts['login'] == 1 and current.counts['wait'] == 1
+    assert current.counts['navigation'] == 0
+    assert current.phases['login'] >= 0.01
+    assert profiler.stop() is current
+
+
+def test_phase_excludes_database_time_spent_inside_it():
+    profiler = PhaseProfiler()
+    db = {'seconds': 0.0}
+    current = profiler.start('test_a', lambda: db['seconds'])
+
+    with profiler.phase('login'):
+        time.sleep(0.02)
+        db['seconds'] += 0.015
+
+    assert 0.0 <= current.phases['login'] < 0.015
+    finished = current.finish()
+    assert set(finished['phases']) == set(PHASES)
+
+
+def test_phase_is_recorded_when_the_block_raises():
+    profiler = PhaseProfiler()
+    current = profiler.start('test_a')
+
+    with pytest.raises(RuntimeError):
+        with profiler.phase('driver'):
+            raise RuntimeError('browser did not start')
+
+    assert current.counts['driver'] == 1
+    with profiler.phase('screenshot'):
+        pass
+    assert current.counts['screenshot'] == 1
+
+
+def test_summarize_aggregates_per_component():
+    records = [
+        {'nodeid': 'a', **record(3.0, ['leads'], wait=2.0, other=1.0)},
+        {'nodeid': 'b', **record(1.0, ['leads', 'contacts'], login=0.5, other=0.5)},
+        {'nodeid': 'c', **record(2.0, [], db=2.0)},
+    ]
+
+    summary = summarize(records, slowest=2)
+
+    overall = summary['overall']
+    assert overall['tests'] == 3 and overall['wall'] == 6.0
+    assert overall['phases']['wait'] == 2.0
+    assert overall['share']['db'] == pytest.approx(2.0 / 6.0, abs=1e-4)
+    assert overall['slowest_phase'] in ('wait', 'db')
+    assert list(summary['components']) == ['leads', 'unassigned', 'contacts']
+    assert summary['components']['leads']['tests'] == 2
+    assert summary['components']['contacts']['slowest_phase'] == 'login'
+    assert [entry['nodeid'] for entry in summary['slowest_tests']] == ['a', 'c']
+
+
+def test_summarize_without_measured_phases():
+    summary = summarize([{'nodeid': 'a', **record(0.0, ['leads'])}])
+
+    assert summary['overall']['slowest_phase'] is None
+    assert summary['overall']['share']['other'] == 0.0
@@ -0,0 +1,100 @@
+"""
+Tests for query fingerprinting and the instrumented connection proxies
+"""
+import time
+
+from config.query_metrics import InstrumentedConnection, QueryMetrics, fingerprint
+
+
+class FakeCursor:
+    rowcount = 2
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+
+    def fetchall(self):
+        return [(1,), (2,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.entered = self.exited = False
+
+    def __enter__(self):
+        self.entered = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.exited = True
+        return False
+
+    def cursor(self):
+        return FakeCursor()
+
+    def commit(self):
+        return 'committed'
+
+
+def test_fingerprint_groups_literals_and_in_lists():
+    assert fingerprint("SELECT * FROM users WHERE id = 5 AND name = 'x'") == \
+        fingerprint("select *  from users where id = %s and name = %s")
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == 'select ? from t where id in (?+)'
+
+
+def test_instrumented_connection_is_a_transaction_context_manager():
+    connection = FakeConnection()
+    instrumented = InstrumentedConnection(connection, 'django', QueryMetrics())
+
+    with instrumented as conn:
+        assert conn is instrumented
+        assert connection.entered
+    assert connection.exited
+
+
+def test_instrumented_connection_passes_isinstance_checks_and_attributes():
+    instrumented = InstrumentedConnection(FakeConnection(), 'django', QueryMetrics())
+
+    assert isinstance(instrumented, FakeConnection)
+    assert isinstance(instrumented, InstrumentedConnection)
+    assert instrumented.commit() == 'committed'
+
+
+def test_instrumented_cursor_records_statements_and_rows():
+    metrics = QueryMetrics()
+    instrumented = InstrumentedConnection(FakeConnection(), 'laravel', metrics)
+
+    cursor = instrumented.cursor()
+    cursor.execute("SELECT id FROM users WHERE id > 10")
+    assert cursor.fetchall() == [(1,), (2,)]
+    instrumented.flush()
+
+    [stats] = metrics.stats('laravel')
+    assert stats.count == 1
+    assert stats.rows == 2
+    assert stats.fingerprint == 'select id from users where id > ?'
+
+
+def test_recording_a_statement_does_not_count_toward_the_next_one():
+    class SlowMetrics(QueryMetrics):
+        def __init__(self):
+            super().__init__()
+            self.durations = []
+
+        def record(self, side, statement, duration, rows=0):
+            self.durations.append(duration)
+            time.sleep(0.05)
+
+    metrics = SlowMetrics()
+    cursor = InstrumentedConnection(FakeConnection(), 'django', metrics).cursor()
+    cursor.execute("SELECT 1")
+    cursor.execute("SELECT 2")
+    cursor.flush()
+
+    assert len(metrics.durations) == 2
+    assert metrics.durations[1] < 0.05
@@ -0,0 +1,74 @@
+"""
+Tests for the report builders behind the report pipeline
+"""
+import json
+import os
+
+from scripts.reporting.report_builders import build_performance_comparison, build_test_results
+
+
+def _write(tmp_path, name, payload):
+    path = tmp_path / name
+    path.write_text(json.dumps(payload))
+    return path
+
+
+def test_query_latency_is_summed_over_worker_files(tmp_path):
+    files = {
+        f'reports/performance-comparison/query_latency_{worker}.json': _write(tmp_path, f'query_latency_{worker}.json', {
+            'sides': {'django': {'queries': queries, 'rows': 10, 'total_time': 0.5}},
+            'slow_queries': [{'side': 'django', 'fingerprint': 'select ?'}]
+        })
+        for worker, queries in (('gw0', 3), ('gw1', 4))
+    }
+
+    summary = build_performance_comparison(files)
+
+    [section] = [section for section in summary['sections'] if section['title'] == 'Database queries']
+    assert section['rows'] == [['django', 7, 20, 1.0]]
+    assert summary['data']['slow_queries'] == 1
+
+
+def test_regression_reports_are_merged_over_worker_files(tmp_path):
+    files = {
+        f'reports/performance-comparison/regression_report_{worker}.json': _write(tmp_path, f'regression_report_{worker}.json', {
+            'summary': {'ok': 1, 'regression': regressions},
+            'checks': [{'kind': 'db_query', 'key': worker, 'side': 'django', 'status': 'regression'}] * regressions
+        })
+        for worker, regressions in (('gw0', 1), ('gw1', 2))
+    }
+
+    summary = build_performance_comparison(files)
+
+    assert summary['data']['regression_summary'] == {'ok': 2, 'regression': 3}
+    assert {'label': 'Regressions', 'value': 3} in summary['cards']
+
+
+def _junit(tmp_path, name, cases, mtime):
+    body = ''.join(
+        f'<testcase classname="tests.{module}" name="{test}" time="1.5">{"<failure/>" if failed else ""}</testcase>'
+        for module, test, failed in cases
+    )
+    path = tmp_path / name
+    path.write_text(f'<testsuites><testsuite name="pytest" time="9">{body}</testsuite></testsuites>')
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_junit_cases_reported_by_several_files_count_once(tmp_path):
+    files = {
+        'reports/test-results/junit.xml': _junit(tmp_path, 'junit.xml', [
+            ('security', 'test_csrf', True), ('leads', 'test_list', False)
+        ], mtime=1000),
+        'reports/test-results/security_tests.xml': _junit(tmp_path, 'security_tests.xml', [
+            ('security', 'test_csrf', False)
+        ], mtime=2000),
+    }
+
+    summary = build_test_results(files)
+
+    assert summary['data']['totals'] == {
+        'tests': 2, 'passed': 2, 'failed': 0, 'error': 0, 'skipped': 0, 'time': 3.0
+    }
+    assert summary['data']['failures'] == []
+    assert [suite['file'] for suite in summary['data']['suites']] == list(sorted(files))
@@ -0,0 +1,80 @@
+"""
+Tests for the migration tracker's response cache and If-None-Match handling
+"""
+import gzip
+import importlib.util
+import json
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).resolve().parents[2] / 'migration-tracker' / 'backend' / 'response_cache.py'
+_spec = importlib.util.spec_from_file_location('response_cache', _MODULE_PATH)
+response_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(response_cache)
+
+ResponseCache = response_cache.ResponseCache
+accepts_gzip = response_cache.accepts_gzip
+etag_matches = response_cache.etag_matches
+
+
+def test_etag_matches_exact_and_weak_tags():
+    assert etag_matches('"v1"', '"v1"')
+    assert etag_matches('W/"v1"', '"v1"')
+    assert etag_matches('"v0", W/"v1"', '"v1"')
+    assert not etag_matches('"v1-gzip"', '"v1"')
+
+
+def test_etag_matches_wildcard_and_missing_header():
+    assert etag_matches('*', '"v1"')
+    assert not etag_matches(None, '"v1"')
+    assert not etag_matches('', '"v1"')
+
+
+def test_cache_hits_only_for_the_stored_version():
+    cache = ResponseCache()
+    entry = cache.put('status', 'v1', {'ok': True})
+
+    assert cache.get('status', 'v1') is entry
+    assert cache.get('status', 'v2') is None
+    assert cache.get('components', 'v1') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_put_serializes_once_and_sets_a_strong_etag():
+    entry = ResponseCache().put('detail', 'abc', {'error': 'not found'}, status=404)
+
+    assert json.loads(entry['body']) == {'error': 'not found'}
+    assert entry['etag'] == '"abc"'
+    assert entry['status'] == 404
+
+
+def test_put_keeps_gzip_variant_only_for_large_bodies():
+    cache = ResponseCache(gzip_min_size=100)
+
+    small = cache.put('small', 'v1', {'a': 1})
+    large = cache.put('large', 'v1', {'items': list(range(100))})
+
+    assert small['gzip'] is None
+    assert gzip.decompress(large['gzip']) == large['body']
+
+
+def test_cache_drops_least_recently_used_routes():
+    cache = ResponseCache(max_entries=2)
+    cache.put('component:a', 'v1', {})
+    cache.put('component:b', 'v1', {})
+    cache.get('component:a', 'v1')
+
+    cache.put('component:c', 'v1', {})
+
+    assert list(cache.entries) == ['component:a', 'component:c']
+
+
+def test_accepts_gzip_honours_quality_values():
+    assert accepts_gzip('gzip, deflate, br')
+    assert accepts_gzip('deflate;q=1.0, GZIP;q=0.5')
+    assert accepts_gzip('*')
+    assert not accepts_gzip('gzip;q=0, deflate')
+    assert not accepts_gzip('gzip; q=0.000')
+    assert not accepts_gzip('*;q=0')
+    assert not accepts_gzip('identity')
+    assert not accepts_gzip(None)
+    assert not accepts_gzip('gzip;q=abc')
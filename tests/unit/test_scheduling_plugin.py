@@ -0,0 +1,81 @@
+"""
+Tests for change-based test selection in the scheduling plugin
+"""
+import subprocess
+
+import pytest
+
+from tests import scheduling_plugin
+from tests.scheduling_plugin import SchedulingPlugin, _singular, _tokens, changed_files_since
+
+
+class FakeConfig:
+    def __init__(self, tmp_path, workerinput=None, **options):
+        self.options = {
+            'durations_file': str(tmp_path / 'durations.json'),
+            'changed_files': None,
+            'changed_since': None,
+            **options
+        }
+        self.warnings = []
+        if workerinput is not None:
+            self.workerinput = workerinput
+
+    def getoption(self, name):
+        return self.options[name]
+
+    def issue_config_time_warning(self, warning, stacklevel):
+        self.warnings.append(warning)
+
+
+def git(repo, *args):
+    subprocess.run(['git', *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    git(repo, 'init', '-q')
+    git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '--allow-empty', '-m', 'base')
+    (repo / '.gitignore').write_text('ignored.txt\n')
+    git(repo, 'add', '.gitignore')
+    git(repo, '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'ignore')
+    monkeypatch.setattr(scheduling_plugin, 'BASE_DIR', repo)
+    return repo
+
+
+def test_tokens_split_camel_case_and_paths():
+    assert _tokens('app/Http/LeadController.php') == {'app', 'http', 'lead', 'controller', 'php'}
+    assert [_singular(token) for token in ('activities', 'leads', 'address')] == ['activity', 'lead', 'address']
+
+
+def test_changed_files_include_untracked(repo):
+    (repo / '.gitignore').write_text('ignored.txt\nother.txt\n')
+    (repo / 'new_view.py').write_text('')
+    (repo / 'ignored.txt').write_text('')
+
+    assert sorted(changed_files_since('HEAD')) == ['.gitignore', 'new_view.py']
+
+
+def test_unknown_ref_warns_and_runs_everything(repo, tmp_path):
+    config = FakeConfig(tmp_path, changed_since='no-such-branch')
+
+    plugin = SchedulingPlugin(config)
+
+    assert plugin.impacted_components is None
+    assert "no-such-branch" in str(config.warnings[0])
+    assert plugin.is_impacted({'leads'})
+
+
+def test_workers_share_impacted_tests_with_the_controller(tmp_path):
+    shared = tmp_path / 'impacted.json'
+    worker = SchedulingPlugin(FakeConfig(
+        tmp_path, workerinput={'workerid': 'gw0', 'impacted_nodeids_file': str(shared)}
+    ))
+    controller = SchedulingPlugin(FakeConfig(tmp_path))
+
+    assert controller.impacted_nodeids() is None
+    worker._write_impacted(['tests/test_leads.py::test_list'])
+    controller.impacted_file = shared
+    assert controller.impacted_nodeids() == {'tests/test_leads.py::test_list'}
@@ -0,0 +1,146 @@
+"""
+Tests for the columnar table snapshot files and their publication
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from mysql.connector import FieldType
+
+from scripts.validators.table_snapshot import (
+    MANIFEST_FILE, STALE_SNAPSHOT_SECONDS, StringColumn, TableSnapshot, TableSnapshotCache, _ColumnWriter
+)
+
+
+class FakeCursor:
+    description = [('id', FieldType.LONG), ('name', FieldType.VAR_STRING)]
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def execute(self, statement, params=None):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+class FakeDatabase:
+    def __init__(self, rows):
+        self.rows = rows
+
+    @contextmanager
+    def laravel_connection(self):
+        rows = self.rows
+
+        class Connection:
+            def cursor(self, buffered=True):
+                return FakeCursor(rows)
+
+        yield Connection()
+
+
+def write_snapshot(path, ids, names):
+    path.mkdir(parents=True)
+    writers = [_ColumnWriter(path, 'id', 'int'), _ColumnWriter(path, 'name', 'text')]
+    writers[0].write(ids)
+    writers[1].write(names)
+    for writer in writers:
+        writer.close()
+    manifest = {
+        'table': 'users', 'key': 'id', 'rows': len(ids), 'source': {},
+        'columns': [{'name': 'id', 'kind': 'int'}, {'name': 'name', 'kind': 'text'}]
+    }
+    (path / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+
+def published(directory):
+    return sorted(entry.name for entry in directory.iterdir() if not entry.name.startswith('.'))
+
+
+def test_snapshot_roundtrip_preserves_nulls(tmp_path):
+    write_snapshot(tmp_path / 'snap', [1, 2, None], ['ada', None, 'zoë'])
+    snapshot = TableSnapshot(tmp_path / 'snap')
+
+    frame = snapshot.to_frame()
+    assert frame['id'].tolist()[:2] == [1, 2]
+    assert frame['id'].isna().tolist() == [False, False, True]
+    assert frame['name'].isna().tolist() == [False, True, False]
+    assert snapshot.column('name')[2] == 'zoë'
+
+
+def test_string_column_decodes_ranges():
+    data = np.frombuffer(b'abcde', dtype=np.uint8)
+    column = StringColumn(data, np.array([0, 2, 2, 5]), np.array([True, False, True]))
+
+    assert column.to_numpy(1).tolist() == [None, 'cde']
+    assert bytes(column.raw(0)) == b'ab'
+
+
+def test_export_publishes_without_leaving_staging(tmp_path):
+    cache = TableSnapshotCache(database=FakeDatabase([(1, 'a'), (2, 'b')]), root=str(tmp_path), chunk_size=1)
+    path = tmp_path / 'users' / 'current'
+    (tmp_path / 'users' / 'superseded').mkdir(parents=True)
+
+    cache._export('users', 'id', {'rows': 2}, path)
+
+    assert published(tmp_path / 'users') == ['current']
+    assert not list((tmp_path / 'users').glob('*.partial'))
+    assert TableSnapshot(path).to_frame()['name'].tolist() == ['a', 'b']
+
+
+def test_publish_keeps_other_workers_in_progress_exports(tmp_path):
+    staging = tmp_path / '.current.abc.partial'
+    other = tmp_path / '.current.def.partial'
+    write_snapshot(staging, [1], ['a'])
+    other.mkdir()
+
+    TableSnapshotCache._publish(staging, tmp_path / 'current')
+
+    assert other.exists()
+    assert (tmp_path / 'current' / MANIFEST_FILE).exists()
+
+
+def test_publish_tolerates_a_concurrent_winner(tmp_path):
+    write_snapshot(tmp_path / 'current', [1], ['winner'])
+    staging = tmp_path / '.current.abc.partial'
+    write_snapshot(staging, [1], ['loser'])
+    (tmp_path / 'current' / MANIFEST_FILE).unlink()  # winner still publishing
+
+    TableSnapshotCache._publish(staging, tmp_path / 'current')
+
+    assert not staging.exists()
+    assert (tmp_path / 'current' / 'name.data').read_bytes() == b'winner'
+
+
+def test_publish_replaces_snapshot_on_refresh(tmp_path):
+    write_snapshot(tmp_path / 'current', [1], ['old'])
+    staging = tmp_path / '.current.abc.partial'
+    write_snapshot(staging, [1], ['new'])
+
+    TableSnapshotCache._publish(staging, tmp_path / 'current')
+
+    assert TableSnapshot(tmp_path / 'current').to_frame()['name'].tolist() == ['new']
+    assert published(tmp_path) == ['current']
+    # A reader of the old snapshot keeps its files until the retired copy expires
+    [retired] = tmp_path.glob('.current.*.stale')
+    assert (retired / 'current' / 'name.data').read_bytes() == b'old'
+
+
+def test_publish_prunes_only_expired_retired_snapshots(tmp_path):
+    expired = tmp_path / '.old.abc.stale'
+    recent = tmp_path / '.older.def.stale'
+    expired.mkdir()
+    recent.mkdir()
+    an_hour_ago = time.time() - STALE_SNAPSHOT_SECONDS - 60
+    os.utime(expired, (an_hour_ago, an_hour_ago))
+    staging = tmp_path / '.current.abc.partial'
+    write_snapshot(staging, [1], ['a'])
+
+    TableSnapshotCache._publish(staging, tmp_path / 'current')
+
+    assert not expired.exists()
+    assert recent.exists()
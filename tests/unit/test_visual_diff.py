@@ -0,0 +1,69 @@
+"""
+Tests for block scoring and ignored regions in the visual diff
+"""
+import json
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from tests.visual_diff import ELEMENT_RECTS_SCRIPT, _ignore_mask, block_scores
+
+
+def test_block_scores_flag_only_changed_blocks():
+    reference = np.tile(np.linspace(0, 1, 8, dtype=np.float32), (8, 1))
+    candidate = reference.copy()
+    candidate[4:, 4:] = candidate[4:, 4:][::-1, ::-1]
+
+    scores = block_scores(reference, candidate, 4)
+
+    assert scores.shape == (2, 2)
+    assert np.allclose([scores[0, 0], scores[0, 1], scores[1, 0]], 0.0, atol=1e-4)
+    assert scores[1, 1] > 0.5
+
+
+def test_ignore_mask_covers_overlapping_blocks():
+    mask = _ignore_mask((40, 40), [(5, 0, 12, 9)], 10)
+    assert mask.tolist() == [
+        [True, True, False, False],
+        [False, False, False, False],
+        [False, False, False, False],
+        [False, False, False, False],
+    ]
+
+
+@pytest.mark.parametrize('region', [
+    (0, -50, 40, -10),   # above the image: a negative bottom used to mask whole bands
+    (-30, 0, -1, 40),    # left of the image
+    (50, 0, 90, 40),     # right of the image
+    (10, 10, 10, 30),    # empty
+])
+def test_ignore_mask_skips_regions_outside_the_image(region):
+    assert not _ignore_mask((40, 40), [region], 10).any()
+
+
+def test_ignore_mask_clamps_partially_visible_regions():
+    mask = _ignore_mask((40, 40), [(-20, 35, 15, 500)], 10)
+    assert mask[3].tolist() == [True, True, False, False]
+    assert not mask[:3].any()
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_element_rects_script_keeps_only_the_visible_part():
+    rects = [
+        {'left': 10, 'top': -40, 'right': 50, 'bottom': -5, 'width': 40, 'height': 35},
+        {'left': 10, 'top': 90, 'right': 50, 'bottom': 150, 'width': 40, 'height': 60},
+        {'left': 0, 'top': 300, 'right': 50, 'bottom': 320, 'width': 50, 'height': 20},
+    ]
+    harness = f"""
+        var rects = {json.dumps(rects)};
+        global.window = {{devicePixelRatio: 2, innerWidth: 200, innerHeight: 100}};
+        global.document = {{querySelectorAll: function () {{
+            return rects.map(function (rect) {{ return {{getBoundingClientRect: function () {{ return rect; }}}}; }});
+        }}}};
+        console.log(JSON.stringify(new Function({json.dumps(ELEMENT_RECTS_SCRIPT)})(['.clock'])));
+    """
+    output = subprocess.run(['node', '-e', harness], capture_output=True, text=True, check=True).stdout
+
+    assert json.loads(output) == [[20, 180, 100, 200]]
@@ -0,0 +1,352 @@
+"""
+Visual parity checks: block-wise perceptual diff of Laravel and Django screenshots
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config.test_settings import TEST_SETTINGS
+from tests.adaptive_wait import wait_for_page_ready
+from tests.phase_profiler import phase
+
+# Device-pixel rectangles of every element matching the selectors
+ELEMENT_RECTS_SCRIPT = """
+var ratio = window.devicePixelRatio || 1, rects = [];
+var width = window.innerWidth, height = window.innerHeight;
+arguments[0].forEach(function (selector) {
+    document.querySelectorAll(selector).forEach(function (element) {
+        var rect = element.getBoundingClientRect();
+        // The screenshot only covers the viewport; scrolled-away elements are not in it
+        var left = Math.max(rect.left, 0), top = Math.max(rect.top, 0);
+        var right = Math.min(rect.right, width), bottom = Math.min(rect.bottom, height);
+        if (right > left && bottom > top) {
+            rects.push([
+                Math.floor(left * ratio), Math.floor(top * ratio),
+                Math.ceil(right * ratio), Math.ceil(bottom * ratio)
+            ]);
+        }
+    });
+});
+return rects;
+"""
+
+# SSIM stabilisers for 8-bit luminance scaled to [0, 1]
+_C1 = 0.01 ** 2
+_C2 = 0.03 ** 2
+
+Region = Tuple[int, int, int, int]
+
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest identifying a screenshot"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _luminance(path: str, size: Tuple[int, int]) -> np.ndarray:
+    """Load an image as [0, 1] luminance, padded with white to a common size"""
+    with Image.open(path) as image:
+        gray = np.asarray(image.convert('L'), dtype=np.float32) / 255.0
+    padded = np.ones((size[1], size[0]), dtype=np.float32)
+    padded[:gray.shape[0], :gray.shape[1]] = gray
+    return padded
+
+
+def _blocks(array: np.ndarray, block_size: int) -> np.ndarray:
+    """View an (H, W) array as (rows, cols, block_size * block_size) blocks"""
+    rows, cols = array.shape[0] // block_size, array.shape[1] // block_size
+    return (
+        array[:rows * block_size, :cols * block_size]
+        .reshape(rows, block_size, cols, block_size)
+        .swapaxes(1, 2)
+        .reshape(rows, cols, block_size * block_size)
+    )
+
+
+def block_scores(reference: np.ndarray, candidate: np.ndarray, block_size: int) -> np.ndarray:
+    """Per-block dissimilarity in [0, 1], 0 for perceptually identical blocks
+
+    Each block is scored 1 - SSIM, which tolerates small uniform shifts in
+    brightness (anti-aliasing, font hinting) but not changes in structure.
+    """
+    x = _blocks(reference, block_size)
+    y = _blocks(candidate, block_size)
+    mean_x = x.mean(axis=2)
+    mean_y = y.mean(axis=2)
+    var_x = x.var(axis=2)
+    var_y = y.var(axis=2)
+    covariance = (x * y).mean(axis=2) - mean_x * mean_y
+
+    ssim = ((2 * mean_x * mean_y + _C1) * (2 * covariance + _C2)) / (
+        (mean_x ** 2 + mean_y ** 2 + _C1) * (var_x + var_y + _C2)
+    )
+    return np.clip(1.0 - ssim, 0.0, 1.0)
+
+
+def _ignore_mask(shape: Tuple[int, int], regions: List[Region], block_size: int) -> np.ndarray:
+    """Mark blocks that overlap any ignored region, clipped to the image"""
+    height, width = shape[:2]
+    rows, cols = height // block_size, width // block_size
+    mask = np.zeros((rows, cols), dtype=bool)
+    for left, top, right, bottom in regions:
+        left, right = min(max(left, 0), width), min(max(right, 0), width)
+        top, bottom = min(max(top, 0), height), min(max(bottom, 0), height)
+        if right <= left or bottom <= top:
+            continue
+        mask[top // block_size:-(-bottom // block_size),
+             left // block_size:-(-right // block_size)] = True
+    return mask
+
+
+def _write_heatmap(path: str, candidate: np.ndarray, scores: np.ndarray,
+                   ignored: np.ndarray, block_size: int):
+    """Overlay block scores in red on a dimmed copy of the candidate screenshot"""
+    heat = np.kron(scores, np.ones((block_size, block_size), dtype=np.float32))
+    skipped = np.kron(ignored, np.ones((block_size, block_size), dtype=bool))
+    base = candidate[:heat.shape[0], :heat.shape[1]] * 0.5 + 0.25
+
+    rgb = np.stack([base, base, base], axis=2)
+    rgb[..., 0] = np.maximum(rgb[..., 0], heat)
+    rgb[..., 1] *= 1.0 - heat
+    rgb[..., 2] *= 1.0 - heat
+    rgb[skipped] = rgb[skipped] * 0.5 + np.array([0.0, 0.0, 0.5], dtype=np.float32)
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray((rgb * 255).astype(np.uint8), 'RGB').save(path, optimize=True)
+
+
+def diff_screenshots(laravel_path: str, django_path: str, block_size: int,
+                     block_threshold: float, ignore_regions: List[Region],
+                     heatmap_path: Optional[str] = None) -> Dict[str, Any]:
+    """Compare two screenshots block by block; runs inside the process pool"""
+    with Image.open(laravel_path) as image:
+        laravel_size = image.size
+    with Image.open(django_path) as image:
+        django_size = image.size
+    size = (max(laravel_size[0], django_size[0]), max(laravel_size[1], django_size[1]))
+
+    reference = _luminance(laravel_path, size)
+    candidate = _luminance(django_path, size)
+    scores = block_scores(reference, candidate, block_size)
+    ignored = _ignore_mask(reference.shape, ignore_regions, block_size)
+    scores[ignored] = 0.0
+
+    compared_blocks = int((~ignored).sum())
+    changed = (scores > block_threshold) & ~ignored
+    changed_blocks = int(changed.sum())
+
+    if heatmap_path is not None and changed_blocks:
+        _write_heatmap(heatmap_path, candidate, scores, ignored, block_size)
+    else:
+        heatmap_path = None
+
+    rows, cols = np.nonzero(changed)
+    return {
+        'laravel_size': list(laravel_size),
+        'django_size': list(django_size),
+        'size_mismatch': laravel_size != django_size,
+        'compared_blocks': compared_blocks,
+        'ignored_blocks': int(ignored.sum()),
+        'changed_blocks': changed_blocks,
+        'diff_ratio': round(changed_blocks / compared_blocks, 6) if compared_blocks else 0.0,
+        'max_block_score': round(float(scores.max()), 4) if scores.size else 0.0,
+        'mean_block_score': round(float(scores[~ignored].mean()), 6) if compared_blocks else 0.0,
+        'changed_bbox': [
+            int(cols.min()) * block_size, int(rows.min()) * block_size,
+            (int(cols.max()) + 1) * block_size, (int(rows.max()) + 1) * block_size
+        ] if changed_blocks else None,
+        'heatmap': heatmap_path
+    }
+
+
+class VisualDiffEngine:
+    """Diffs screenshot pairs in a background process pool, skipping pairs already diffed"""
+
+    def __init__(self, report_dir: Path = None, block_size: int = None,
+                 block_threshold: float = None, max_workers: int = None):
+        settings = TEST_SETTINGS['VISUAL_DIFF']
+        self.report_dir = Path(report_dir or settings['REPORT_PATH'])
+        self.screenshot_dir = self.report_dir / 'screenshots'
+        self.heatmap_dir = self.report_dir / 'heatmaps'
+        self.cache_file = self.report_dir / 'diff_cache.json'
+        self.block_size = block_size or settings['BLOCK_SIZE']
+        self.block_threshold = block_threshold if block_threshold is not None else settings['BLOCK_THRESHOLD']
+        self.max_workers = max_workers or settings['MAX_WORKERS']
+        self._executor = None
+        self._lock = threading.Lock()
+        self._cache = self._load_cache()
+        self.results = {}
+        self.stats = {'submitted': 0, 'cache_hits': 0, 'diffed': 0}
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def store_screenshot(self, png: bytes) -> Tuple[str, Path]:
+        """Write a screenshot under its content hash; identical captures are stored once"""
+        digest = content_hash(png)
+        path = self.screenshot_dir / f"{digest[:2]}" / f"{digest}.png"
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(png)
+        return digest, path
+
+    def _cache_key(self, laravel_hash: str, django_hash: str, regions: List[Region]) -> str:
+        parameters = json.dumps([self.block_size, self.block_threshold, sorted(map(list, regions))])
+        return f"{laravel_hash}:{django_hash}:{content_hash(parameters.encode())[:16]}"
+
+    def submit(self, name: str, laravel_png: bytes, django_png: bytes,
+               ignore_regions: List[Region] = None) -> Future:
+        """Queue a screenshot pair for diffing and return a future for its result"""
+        ignore_regions = [tuple(region) for region in ignore_regions or []]
+        laravel_hash, laravel_path = self.store_screenshot(laravel_png)
+        django_hash, django_path = self.store_screenshot(django_png)
+        key = self._cache_key(laravel_hash, django_hash, ignore_regions)
+        self.stats['submitted'] += 1
+
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and (cached['heatmap'] is None or Path(cached['heatmap']).exists()):
+            self.stats['cache_hits'] += 1
+            future = Future()
+            future.set_result({**cached, 'name': name, 'cached': True})
+            self.results[name] = future
+            return future
+
+        self.stats['diffed'] += 1
+        heatmap_path = self.heatmap_dir / f"{laravel_hash[:16]}_{django_hash[:16]}_{key[-16:]}.png"
+        diff_future = self.executor.submit(
+            diff_screenshots, str(laravel_path), str(django_path), self.block_size,
+            self.block_threshold, ignore_regions, str(heatmap_path)
+        )
+
+        future = Future()
+
+        def finish(completed: Future):
+            try:
+                result = {
+                    **completed.result(),
+                    'laravel_screenshot': str(laravel_path),
+                    'django_screenshot': str(django_path)
+                }
+            except Exception as e:
+                future.set_exception(e)
+                return
+            with self._lock:
+                self._cache[key] = result
+            future.set_result({**result, 'name': name, 'cached': False})
+
+        diff_future.add_done_callback(finish)
+        self.results[name] = future
+        return future
+
+    def wait(self) -> Dict[str, Dict[str, Any]]:
+        """Block until every submitted diff is done and return results by name"""
+        collected = {}
+        for name, future in self.results.items():
+            try:
+                collected[name] = future.result()
+            except Exception as e:
+                collected[name] = {'name': name, 'error': str(e)}
+        return collected
+
+    def save_cache(self):
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        # xdist workers share the cache file, so each writes its own temporary
+        temporary = self.cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with self._lock:
+            with open(temporary, 'w') as f:
+                json.dump(self._cache, f, indent=2)
+        temporary.replace(self.cache_file)
+
+    def export_report(self, output_path: str = None, max_diff_ratio: float = None):
+        """Export all visual diff results of this run"""
+        max_diff_ratio = max_diff_ratio if max_diff_ratio is not None else \
+            TEST_SETTINGS['VISUAL_DIFF']['MAX_DIFF_RATIO']
+        results = self.wait()
+        output_path = Path(output_path or self.report_dir / 'visual_diff_report.json')
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'block_size': self.block_size,
+                'block_threshold': self.block_threshold,
+                'max_diff_ratio': max_diff_ratio,
+                'stats': self.stats,
+                'failing': sorted(
+                    name for name, result in results.items()
+                    if 'error' in result or result['diff_ratio'] > max_diff_ratio
+                ),
+                'results': results
+            }, f, indent=2)
+
+        print(f"Visual diff report exported to: {output_path}")
+
+    def close(self):
+        """Finish pending diffs, persist the diff cache and stop the process pool"""
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.save_cache()
+
+
+class VisualParity:
+    """Screenshots the same route on both apps and hands the pair to the diff engine"""
+
+    def __init__(self, base_test, engine: VisualDiffEngine, ignore_selectors: List[str] = None):
+        self.base_test = base_test
+        self.engine = engine
+        self.ignore_selectors = list(
+            TEST_SETTINGS['VISUAL_DIFF']['IGNORE_SELECTORS'] if ignore_selectors is None
+            else ignore_selectors
+        )
+
+    def capture(self, app: str, path: str, ignore_selectors: List[str]) -> Tuple[bytes, List[Region]]:
+        """Load a page and return its screenshot plus the regions to ignore"""
+        config = self.base_test.config
+        base_url = config.LARAVEL_APP_URL if app == 'laravel' else config.DJANGO_APP_URL
+        driver = self.base_test.driver
+
+        with phase('navigation'):
+            driver.get(f"{base_url}{path}")
+        with phase('wait'):
+            # Settled pages only: late XHR renders would otherwise show up as diffs
+            wait_for_page_ready(driver, f"{base_url}{path}")
+        with phase('screenshot'):
+            regions = driver.execute_script(ELEMENT_RECTS_SCRIPT, ignore_selectors) if ignore_selectors else []
+            return driver.get_screenshot_as_png(), [tuple(region) for region in regions]
+
+    def compare_route(self, laravel_path: str, django_path: str = None,
+                      ignore_selectors: List[str] = None,
+                      ignore_regions: List[Region] = None, name: str = None) -> Future:
+        """Capture both pages and queue the diff; the browser is free again on return
+
+        Regions ignored on either side are ignored on both, since dynamic content
+        can sit at slightly different offsets in the two layouts.
+        """
+        django_path = django_path or laravel_path
+        selectors = self.ignore_selectors + list(ignore_selectors or [])
+        laravel_png, laravel_regions = self.capture('laravel', laravel_path, selectors)
+        django_png, django_regions = self.capture('django', django_path, selectors)
+        return self.engine.submit(
+            name or laravel_path, laravel_png, django_png,
+            laravel_regions + django_regions + [tuple(region) for region in ignore_regions or []]
+        )